@@ -0,0 +1,198 @@
+"""Runs the independent (site, soil) simulation chains in a pool of worker processes."""
+
+import os
+import shutil
+from copy import copy
+from itertools import groupby
+from multiprocessing import Pool
+
+import SIM
+from Subroutines import CROPSIM
+from Files.OutputFiles import OutputFiles
+from Files.RunJournal import ChainCheckpoints, CHAIN_PREFIX
+from Errors.CustomError import CropSimError
+from Profiler import SubroutineProfiler
+
+
+def getChains() -> list:
+    """Returns the (simulation index, soil index) pairs to simulate, in the serial order."""
+    chains = []
+    for simIndex, sim in enumerate(SIM.Simulations):
+        site = SIM.Sites[sim.WSITE]
+        for soilIndex in range(len(SIM.SoilProps)):
+            if site.SOILSIM[soilIndex] == 1:
+                chains.append((simIndex, soilIndex))
+    return chains
+
+
+def getSites() -> list:
+    """Returns the (simulation index, soil indexes) pairs to simulate in lockstep, in the serial order."""
+    sites = []
+    for simIndex, soilIndex in getChains():
+        if sites and sites[-1][0] == simIndex:
+            sites[-1][1].append(soilIndex)
+        else:
+            sites.append((simIndex, [soilIndex]))
+    return sites
+
+
+def getCheckpoint(simIndex: int, soilIndex: int):
+    """Returns the last checkpoint of the chain in the run journal, None if not journaled."""
+    if SIM.Journal is None:
+        return None
+    return SIM.Journal.get(SIM.Simulations[simIndex].WSITE, SIM.SoilProps[soilIndex].ISCODE)
+
+
+def runChains(chains: list, workers: int):
+    """Simulates the chains using the specified number of processes.
+    Every chain writes to its own folder, which is merged into OUTDIR in the serial
+    order of the chains, so the results are identical to those of a serial run."""
+    outDir = SIM.Config.OUTDIR
+    tasks = [(simIndex, soilIndex, os.path.join(outDir, f"{CHAIN_PREFIX}{index:05}"),
+              getCheckpoint(simIndex, soilIndex))
+             for index, (simIndex, soilIndex) in enumerate(chains)]
+
+    with Pool(workers, initializer=__initWorker, initargs=(SIM.Config,)) as pool:
+        for chainDir, error, checkpoints, failures, profile in pool.imap(__runChain, tasks):
+            __mergeChain(chainDir, outDir, checkpoints)
+            SIM.Failures.extend(failures)
+            if profile: SIM.Profile.merge(profile)
+            if error:
+                pool.terminate()
+                raise CropSimError(error)
+
+
+def runSites(sites: list, workers: int):
+    """Simulates the chains of every site in lockstep, the sites using the specified number of processes.
+    Every chain still writes to its own folder, merged into OUTDIR in the serial order of the chains."""
+    outDir = SIM.Config.OUTDIR
+    tasks, index = [], 0
+    for simIndex, soilIndexes in sites:
+        # The soils resumed from different crop-years go through the daily loop apart.
+        chains = [(soilIndex, getCheckpoint(simIndex, soilIndex)) for soilIndex in soilIndexes]
+        for _, group in groupby(chains, lambda chain: chain[1].INDEX if chain[1] else -1):
+            soilIndexes, checkpoints = map(list, zip(*group))
+            chainDirs = [os.path.join(outDir, f"{CHAIN_PREFIX}{index + i:05}") for i in range(len(soilIndexes))]
+            tasks.append((simIndex, soilIndexes, chainDirs, checkpoints))
+            index += len(soilIndexes)
+
+    if workers > 1:
+        with Pool(workers, initializer=__initWorker, initargs=(SIM.Config,)) as pool:
+            __mergeSites(pool.imap(__runSite, tasks), outDir, pool)
+    else:
+        __mergeSites(map(__runSite, tasks), outDir)
+
+
+def __mergeSites(results, outDir: str, pool: Pool = None):
+    """Merges the output of the sites as they are simulated, stopping at the first failure."""
+    for chainDirs, error, checkpoints, failures, profile in results:
+        for i, (chainDir, chainCheckpoints, chainFailures) in enumerate(zip(chainDirs, checkpoints, failures)):
+            # The output files are resumed in the order of the chains, when the site failed only its first
+            # chain is journaled, the next ones are simulated again from the start.
+            __mergeChain(chainDir, outDir, chainCheckpoints if not error or i == 0 else None)
+            SIM.Failures.extend(chainFailures)
+        if profile: SIM.Profile.merge(profile)
+        if error:
+            if pool: pool.terminate()
+            raise CropSimError(error)
+
+
+def __mergeChain(chainDir: str, outDir: str, checkpoints: list):
+    """Merges the output of the chain, then records its checkpoints into the run journal."""
+    offsets = mergeChainOutput(chainDir, outDir)
+    if SIM.Journal is not None and checkpoints:
+        SIM.Journal.merge(checkpoints, offsets)
+
+
+def mergeChainOutput(chainDir: str, outDir: str) -> dict:
+    """Appends the output files written by a chain to the ones in the output folder.
+    Returns the sizes of the output files before appending, by path relative to the folders."""
+    offsets = {}
+    if not os.path.isdir(chainDir):
+        return offsets
+
+    for root, _, files in os.walk(chainDir):
+        folder = os.path.relpath(root, chainDir)
+        targetDir = os.path.normpath(os.path.join(outDir, folder))
+        os.makedirs(targetDir, exist_ok=True)
+        for name in sorted(files):
+            with open(os.path.join(root, name), "rb") as src, \
+                    open(os.path.join(targetDir, name), "ab") as dst:
+                offsets[os.path.normpath(os.path.join(folder, name))] = dst.tell()
+                shutil.copyfileobj(src, dst)
+
+    shutil.rmtree(chainDir)
+    return offsets
+
+
+def __initWorker(config):
+    """Loads the global data on the worker process, when not inherited from the parent."""
+    if SIM.Config is None:
+        SIM.Config = config
+        config.__readGlobalData__()
+        if config.PROFILE:
+            SIM.Profile = SubroutineProfiler()
+            SIM.Profile.install()
+    else:
+        # Don't share the output files nor the journal inherited from the parent process.
+        SIM.OutputFiles = OutputFiles(mode=config.DAILY_REPORT)
+        SIM.Journal = None
+    # The failures and the profile are returned with every task, reported by the parent process.
+    SIM.Failures = None
+
+
+def __runChain(task: tuple):
+    """Simulates a chain into its own output folder, on a new simulation context, from its checkpoint if resumed.
+    Returns the folder, the error message if the chain failed, the checkpoints of the crop-years completed
+    the failures of the crop-years skipped and the subroutine profile of the task."""
+    simIndex, soilIndex, chainDir, checkpoint = task
+    os.makedirs(chainDir, exist_ok=True)
+    SIM.Config.OUTDIR = chainDir
+
+    ctx = SIM.newContext()
+    ctx.Journal = ChainCheckpoints() if SIM.Config.JOURNAL else None
+    error = None
+    try:
+        start = checkpoint.restore(ctx) if checkpoint else 0
+        CROPSIM.simulateChain(ctx, SIM.Simulations[simIndex], soilIndex, start)
+    except CropSimError as err:
+        error = str(err)
+    finally:
+        ctx.closeFiles()
+        # The chain folder is merged once the task returns.
+        SIM.OutputFiles.close()
+
+    return chainDir, error, ctx.Journal.Checkpoints if ctx.Journal else None, ctx.Failures.Failures, \
+        SIM.Profile.pop() if SIM.Profile else None
+
+
+def __runSite(task: tuple):
+    """Simulates the chains of a site in lockstep, every chain on a new simulation context
+    writing into its own output folder, from their checkpoint if resumed. Returns the folders,
+    the error message if the site failed, the checkpoints of the crop-years completed and
+    the failures of the crop-years skipped by every chain, and the subroutine profile of the task."""
+    simIndex, soilIndexes, chainDirs, checkpoints = task
+    contexts, start = [], 0
+    for chainDir, checkpoint in zip(chainDirs, checkpoints):
+        os.makedirs(chainDir, exist_ok=True)
+        ctx = SIM.newContext()
+        ctx.Config = copy(SIM.Config)
+        ctx.Config.OUTDIR = chainDir
+        ctx.Journal = ChainCheckpoints() if SIM.Config.JOURNAL else None
+        # The chains of the task are resumed from the same crop-year.
+        start = checkpoint.restore(ctx) if checkpoint else 0
+        contexts.append(ctx)
+
+    error = None
+    try:
+        CROPSIM.simulateSite(contexts, SIM.Simulations[simIndex], soilIndexes, start)
+    except CropSimError as err:
+        error = str(err)
+    finally:
+        for ctx in contexts:
+            ctx.closeFiles()
+        # The chain folders are merged once the task returns.
+        SIM.OutputFiles.close()
+
+    return chainDirs, error, [ctx.Journal.Checkpoints if ctx.Journal else None for ctx in contexts], \
+        [ctx.Failures.Failures for ctx in contexts], SIM.Profile.pop() if SIM.Profile else None
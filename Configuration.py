@@ -10,11 +10,18 @@ from Files.BlocFile import BlocFile
 from Files.CropFile import CropFile
 from Files.DataFile import OutputFormats
 from Files.InitialFile import InitialFile
+from Files.OutputFiles import OutputFiles
+from Files.DailyReport import INLINE, DAILY_REPORT_MODES
+from Files.ResultsDatabase import ResultsDatabase
+from Files.FailureReport import FailureReport, ABORT, ERROR_POLICIES
 from Files.PrintOutFile import PrintOutFile
 from Files.SimControlFile import SimControlFile
 from Files.SoilFile import SoilFile
 from Files.SoilPropFile import SoilPropFile
 from Files.TillageFile import TillageFile
+from Files.WeatherStore import WeatherStore
+from Data.WeatherData import WeatherCache
+from Subroutines.SOILTEMP import AUTO, OFF, SOIL_TEMP_MODES
 
 DefaultConfigPath: str = "default.cfg"
 
@@ -23,18 +30,49 @@ class Configuration:
     """Configuration class"""
     __slots__ = ("Version", "INPUTDIR", "OUTDIR", "OUTPUT_FORMAT", "BLOCFILE", "TILLFILE",
                  "PRTFILE", "CNTRFILE", "CROPFILE", "SOILFILE", "INITFILE", "SOILPROPFILE", "WEA_DIR",
-                 "ZONES", "ZONES_DIR", "LEGACY", "PRINT_ALL_SOILS", "SINGLE_RUN")
+                 "ZONES", "ZONES_DIR", "LEGACY", "PRINT_ALL_SOILS", "SINGLE_RUN", "WORKERS", "LOCKSTEP",
+                 "FUSED_LAYERS", "WEATHER_CACHE_MB", "WEA_STORE_FILE", "SQLITE_FILE", "JOURNAL", "RESUME_DIR",
+                 "ERROR_POLICY", "PROFILE", "SOIL_TEMP", "YIELD_ONLY", "DAILY_REPORT")
 
-    def __init__(self):
+    def __init__(self, readGlobalData: bool = True, args: list = None):
+        """Loads the configuration from the command-line and the configuration files.
+        When readGlobalData is False, neither the output folder nor the input data are touched.
+        The command-line arguments are taken from args when specified, instead of sys.argv."""
         # Initialize default values.
         self.Version = "9.0"
         self.LEGACY = False
         self.SINGLE_RUN = False
         self.PRINT_ALL_SOILS = False
+        self.WORKERS: int = 1
+        """Number of processes simulating (site, soil) chains in parallel."""
+        self.LOCKSTEP = False
+        """When True, the soils of a site go through the daily loop together, see DEPLT_BATCH."""
+        self.FUSED_LAYERS = False
+        """When True, the lockstep layer kernels are faster but may change the last digits of the results."""
+        self.WEATHER_CACHE_MB: int = 256
+        """Memory cap (in MB) for the weather data cached by every process, 0 disables the cache."""
 
         self.INPUTDIR: str = "."
         self.OUTDIR: str = "./Results"
         self.OUTPUT_FORMAT: OutputFormats = OutputFormats.COHYST
+        self.SQLITE_FILE: str = ""
+        """SQLite database receiving the annual, monthly and weekly results, relative to the output folder.
+        When empty the results are only written to the text files."""
+        self.JOURNAL = False
+        """When True, every crop-year completed is recorded into a journal, so the run can be resumed."""
+        self.RESUME_DIR: str = ""
+        """The output folder of the run to resume, set by --resume."""
+        self.ERROR_POLICY: str = ABORT
+        """What to do when a crop-year fails: abort, skip-chain or skip-year, see FailureReport."""
+        self.PROFILE = False
+        """When True, the time and calls of the main subroutines are recorded, see Profiler."""
+        self.SOIL_TEMP: str = AUTO
+        """When to compute the soil temperatures: auto (when printed), on or off, see IsSoilTemperatureUsed."""
+        self.YIELD_ONLY = False
+        """When True, only the YR file (and the annual results) are written, the daily, monthly and weekly
+        outputs are neither summed nor printed."""
+        self.DAILY_REPORT: str = INLINE
+        """Where the daily OUT and PROFILE rows are rendered: inline, on a thread or on a process, see DailyReport."""
 
         # INPUT FILES
         # Filenames must have a proper casing in order to be found
@@ -50,12 +88,16 @@ class Configuration:
         self.SOILPROPFILE: str = "CSModel/Soil/NESoils.dat"
 
         self.WEA_DIR: str = "CSModel/Wea"
+        self.WEA_STORE_FILE: str = ""
+        """Weather store written by the weather-compile command, when empty the .WEA files are read."""
         self.ZONES: list = [1, 2, 3]
         self.ZONES_DIR: str = "CSModel/Sim/98_2/"
 
         print(f"Cropsim v{self.Version}")
         try:
-            args, _ = getopt.getopt(sys.argv[1:], "hi:o:f:", ["help", "cfg="])
+            args, _ = getopt.getopt(sys.argv[1:] if args is None else args, "hi:o:f:",
+                                    ["help", "cfg=", "workers=", "resume=", "error-policy=", "no-soil-temp",
+                                     "yield-only"])
         except getopt.GetoptError:
             self.PrintUsage()
 
@@ -74,10 +116,20 @@ class Configuration:
                 self.___parseConfigSetting("OUTPUT_FORMAT", value)
             elif arg == "--cfg":
                 self.__read_config_file__(value)
+            elif arg == "--workers":
+                self.___parseConfigSetting("WORKERS", value)
+            elif arg == "--resume":
+                self.___parseConfigSetting("RESUME_DIR", value)
+            elif arg == "--error-policy":
+                self.___parseConfigSetting("ERROR_POLICY", value)
+            elif arg == "--no-soil-temp":
+                self.___parseConfigSetting("SOIL_TEMP", OFF)
+            elif arg == "--yield-only":
+                self.___parseConfigSetting("YIELD_ONLY", "1")
 
-        self.checkOutputPath()
-
-        self.__readGlobalData__()
+        if readGlobalData:
+            self.checkOutputPath()
+            self.__readGlobalData__()
 
     def __setitem__(self, key, item):
         setattr(self, key, item)
@@ -107,11 +159,41 @@ class Configuration:
         print(f"Parsing {name} configuration setting: {value}")
 
         if name in self.__slots__:
-            if name.endswith("FILE") or name.endswith("DIR"):
-                self[name] = os.path.normpath(value)
+            if name == "PROFILE":
+                # Not a path, despite its name ending in FILE.
+                self.PROFILE = int(value) == 1
+            elif name.endswith("FILE") or name.endswith("DIR"):
+                self[name] = os.path.normpath(value) if value else ""
             else:
                 if name == "ZONES":
                     self.ZONES = list(map(int, value.split(",")))
+                elif name == "WORKERS":
+                    try:
+                        self.WORKERS = max(1, int(value))
+                    except ValueError:
+                        print("Invalid number of workers specified: " + value)
+                        self.PrintUsage()
+                elif name == "WEATHER_CACHE_MB":
+                    try:
+                        self.WEATHER_CACHE_MB = max(0, int(value))
+                    except ValueError:
+                        print("Invalid weather cache size specified: " + value)
+                        self.PrintUsage()
+                elif name == "ERROR_POLICY":
+                    if value.lower() not in ERROR_POLICIES:
+                        print("Invalid error policy specified: " + value)
+                        self.PrintUsage()
+                    self.ERROR_POLICY = value.lower()
+                elif name == "SOIL_TEMP":
+                    if value.lower() not in SOIL_TEMP_MODES:
+                        print("Invalid soil temperature mode specified: " + value)
+                        self.PrintUsage()
+                    self.SOIL_TEMP = value.lower()
+                elif name == "DAILY_REPORT":
+                    if value.lower() not in DAILY_REPORT_MODES:
+                        print("Invalid daily report mode specified: " + value)
+                        self.PrintUsage()
+                    self.DAILY_REPORT = value.lower()
                 elif name == "OUTPUT_FORMAT":
                     try:
                         self.OUTPUT_FORMAT = OutputFormats(int(value))
@@ -126,6 +208,12 @@ class Configuration:
         return os.path.join(self.INPUTDIR,
                             os.path.normpath(self.WEA_DIR), f"{site}{year}.WEA")
 
+    def getWeatherStoreFilename(self):
+        """Returns the path to the weather store, written next to the .WEA files unless specified."""
+        if self.WEA_STORE_FILE:
+            return os.path.join(self.INPUTDIR, os.path.normpath(self.WEA_STORE_FILE))
+        return os.path.join(self.INPUTDIR, os.path.normpath(self.WEA_DIR), "weather.store")
+
     def getZonePath(self, zoneIndex: int):
         """Returns the path to the climatic zone specified by it's 1-based index."""
         return os.path.join(self.INPUTDIR, os.path.normpath(f"{self.ZONES_DIR}{zoneIndex}"))
@@ -137,9 +225,9 @@ class Configuration:
     def __readGlobalData__(self):
         """Reads global data for the simulation."""
 
-        # SIM.InitialData = InitialFile(os.path.join(self.INPUTDIR, \
+        # SIM.StartData = InitialFile(os.path.join(self.INPUTDIR, \
         # os.path.normpath(self.INITFILE)))
-        SIM.InitialData = InitialFile()
+        SIM.StartData = InitialFile()
         # Read BlocFile
         SIM.BLOC = BlocFile(os.path.join(self.INPUTDIR, os.path.normpath(self.BLOCFILE)))
         # Read Tillage File
@@ -153,11 +241,30 @@ class Configuration:
                                                   os.path.normpath(self.SOILPROPFILE))).SoilTypes
         # Read Simulation Control file
         SIM.Simulations = SimControlFile(os.path.join(self.INPUTDIR, os.path.normpath(self.CNTRFILE))).Rows
+        # The .WEA files are read on demand
+        SIM.WeatherCache = WeatherCache(self.WEATHER_CACHE_MB)
+        SIM.WeatherStore = WeatherStore(self.getWeatherStoreFilename()) if self.WEA_STORE_FILE else None
+        # The output files are opened on demand
+        SIM.OutputFiles = OutputFiles(mode=self.DAILY_REPORT)
+        SIM.Failures = FailureReport()
+        SIM.ResultsDatabase = None
+        if self.SQLITE_FILE:
+            SIM.ResultsDatabase = ResultsDatabase(os.path.join(self.OUTDIR, self.SQLITE_FILE))
+            SIM.ResultsDatabase.create()
 
         print("Global Data read.")
 
     def checkOutputPath(self):
-        """Creates a timestamped output folder."""
+        """Creates a timestamped output folder, or goes on writing to the one of the run resumed."""
+        if self.RESUME_DIR:
+            if not os.path.isdir(self.RESUME_DIR):
+                print("The output folder of the run to resume was not found at:")
+                print(self.RESUME_DIR)
+                sys.exit()
+            self.OUTDIR = self.RESUME_DIR
+            self.JOURNAL = True
+            return
+
         now = datetime.now()
         self.OUTDIR = os.path.normpath(os.path.join(self.OUTDIR,
                                                     (f"{now.year}{now.month:0>2}{now.day:0>2} "
@@ -168,5 +275,13 @@ class Configuration:
         """Prints information about the accepted command-line parameters."""
         print(f"Cropsim v{self.Version}")
         print("Usage:")
-        print("CropSim.py -i <input_path> -o <output_path> -f <output_format> --cfg <config_file>")
+        print("CropSim.py -i <input_path> -o <output_path> -f <output_format> --cfg <config_file> "
+              "--workers <processes> --resume <output_folder> --error-policy <abort|skip-chain|skip-year> "
+              "--no-soil-temp --yield-only")
+        print("    --resume goes on with the run journaled into the output folder, with the same configuration.")
+        print("    --error-policy sets what to do when a crop-year fails, the run stops by default.")
+        print("    --no-soil-temp skips the soil temperatures, only written to PROFILE.TXT.")
+        print("    --yield-only only writes the YR files, the other outputs are skipped.")
+        print("CropSim.py weather-compile -i <input_path> --cfg <config_file>")
+        print("    Writes the .WEA files in WEA_DIR into the weather store at WEA_STORE_FILE.")
         sys.exit()
@@ -0,0 +1,189 @@
+"""In-process API, simulating a (site, soil) chain without touching the disk.
+
+The inputs of a configuration are read once with load(), then simulate() runs the crop-years of a
+site and soil on a new context and returns the results as NumPy arrays, the output files are never
+written. The .SIM files and the weather not given are read on first use only, then cached, e.g.:
+
+    import CropSimAPI
+    CropSimAPI.load("default.cfg")
+    results = CropSimAPI.simulate("S000", 411, [("CORNIRCT", 2001), ("CORNIRCT", 2002)], daily=True)
+    results.Annual["YIELD"], results.Daily.THETA[0, 180]
+"""
+
+import contextlib
+import os
+from copy import copy
+
+import numpy as np
+
+import SIM
+from Configuration import Configuration
+from SimulationContext import SimulationContext
+from Subroutines import CROPSIM
+from Subroutines.READWEAT import CleanWeatherData
+from Subroutines.SOILTEMP import OFF
+
+from Data.Crop import Crop
+from Data.DailyResults import DailyResults
+from Data.WeatherData import WeatherData
+from Data.WeatherStation import WeatherStation
+from Errors.CustomError import WeatherStationNotFound, SoilNotFound
+from Files.InitialFile import InitialFile
+from Files.OutputFiles import DiscardedOutputFiles, NULL_FILE
+from Files.PrintOutFile import PrintOutFlags
+from Files.ResultsDatabase import ResultsBatch, ANNUAL_COLUMNS, MONTHLY_COLUMNS, WEEKLY_COLUMNS, getColumnType
+from Files.SimFile import SimFile
+from Files.WeatherStore import WeatherStoreReader
+
+PrintOut = None
+"""The PRTFILE settings with the printouts disabled, the output files are discarded anyway."""
+
+
+class SimulationResults:
+    """The results of the crop-years simulated, by column name as in the ResultsDatabase tables."""
+
+    __slots__ = ("Annual", "Monthly", "Weekly", "Daily", "InitialData")
+
+    def __init__(self, ctx: SimulationContext):
+        self.Annual: dict = getColumns(ctx.Results.ANNUAL, ANNUAL_COLUMNS)
+        """A row per crop-year, the values written to the YR file."""
+        self.Monthly: dict = getColumns(ctx.Results.MONTHLY, MONTHLY_COLUMNS)
+        """A row per month of the season of every crop-year, the values written to the MON file."""
+        self.Weekly: dict = getColumns(ctx.Results.WEEKLY, WEEKLY_COLUMNS)
+        """52 rows per crop-year, the values written to the PRECIP file."""
+        self.Daily: DailyResults = ctx.Daily
+        """The daily values of every crop-year, None unless requested."""
+        self.InitialData: InitialFile = ctx.InitialData
+        """The state at the end of the last crop-year, the initial data to go on simulating the chain."""
+
+
+class WeatherOverride:
+    """The weather given to simulate() by year, read by READWEAT instead of the cached weather.
+    The years not given are read from the weather cache of the process."""
+
+    __slots__ = ("Weather", "Cache")
+
+    def __init__(self, weather: dict, cache):
+        self.Weather: dict = weather
+        self.Cache = cache
+
+    def get(self, site: str, year: int):
+        """Returns the weather given for the year, or the cached weather of the site."""
+        data = self.Weather.get(year)
+        if data is None and self.Cache is not None:
+            data = self.Cache.get(site, year)
+        return data
+
+    def put(self, site: str, year: int, data: WeatherData):
+        """Caches the weather read from the disk."""
+        if self.Cache is not None:
+            self.Cache.put(site, year, data)
+
+    def resize(self, site: str, year: int, data: WeatherData):
+        """Accounts again for the cached weather, the weather given is not cached."""
+        if self.Cache is not None:
+            self.Cache.resize(site, year, data)
+
+
+def load(cfg: str = None, inputDir: str = None) -> Configuration:
+    """Reads the configuration and the global input files, once before simulating.
+    Nothing is written, neither the output folder nor the SQLite database are created."""
+    global PrintOut
+    args = []
+    if cfg: args += ["--cfg", cfg]
+    if inputDir: args += ["-i", inputDir]
+
+    config = SIM.Config = Configuration(readGlobalData=False, args=args)
+    config.SQLITE_FILE = ""
+    config.__readGlobalData__()
+    SIM.Context = None
+
+    PrintOut = copy(SIM.PrintOut)
+    PrintOut.IPFLAG = PrintOutFlags.NoDetails
+    return config
+
+
+def makeWeather(TMAX, TMIN, PRECIP, ETR, LAT: float, ELEV: float, IMSTR: int = 1, IDSTR: int = 1,
+                LOCATE: str = "") -> WeatherData:
+    """Returns the weather of a year from its daily values, starting on the month and day specified.
+    The values are cleaned as those read from a .WEA file, and ETR is reduced by the ETRFACT of the BLOCFILE."""
+    values = np.array([TMAX, TMIN, PRECIP, np.zeros(len(ETR)), ETR], dtype=np.float64)
+    NDAYS = values.shape[1]
+    days = np.vstack((np.arange(1, NDAYS + 1), values))
+    station = WeatherStation(LOCATE, IMSTR, IDSTR, NDAYS, LAT, 0.0, ELEV)
+    return CleanWeatherData(WeatherStoreReader(station, days), SIM.BLOC.ETRFACT)
+
+
+def simulate(site: str, soil: int, crops, weather: dict = None, initial: InitialFile = None,
+             simFiles: dict = None, daily: bool = False, verbose: bool = False) -> SimulationResults:
+    """Simulates the crop-years of the chain for the weather site and soil code specified.
+
+    crops: the (SIMFILE, year) pairs to simulate, in order, like the rows of a CROPFILE.
+    weather: the WeatherData by year (see makeWeather), used instead of the .WEA files.
+    initial: the initial conditions, those of the INITFILE when not specified.
+    simFiles: the SimFile by SIMFILE name, used instead of the .SIM files of the zone.
+    daily: when True, the daily THETA, ET, DRAIN and IRR arrays are recorded.
+    verbose: when False, the console output of the simulation is discarded."""
+    control = getSimControl(site)
+    soilIndex = getSoilIndex(soil)
+    rows = [Crop(name, year, index) for index, (name, year) in enumerate(crops)]
+
+    # The .SIM files are read once per process, the ones given are simulated instead.
+    files = SIM.SimFiles
+    for name in {row.SIMFILE for row in rows}:
+        key = (control.IZONE, name)
+        if key not in files and not (simFiles and name in simFiles):
+            with console(verbose):
+                files[key] = SimFile(os.path.join(SIM.Config.getZonePath(control.IZONE), f"{name}.SIM"))
+    if simFiles:
+        files = {**files, **{(control.IZONE, name): file for name, file in simFiles.items()}}
+
+    weatherCache = SIM.WeatherCache if weather is None else WeatherOverride(weather, SIM.WeatherCache)
+    ctx = SimulationContext(SIM.Config, SIM.BLOC, SIM.Tillages, PrintOut,
+                            initial if initial is not None else SIM.StartData,
+                            SIM.Sites, SIM.SoilProps, weatherCache, SIM.WeatherStore, files,
+                            DiscardedOutputFiles())
+    ctx.Results = ResultsBatch()
+    ctx.Daily = DailyResults(len(rows)) if daily else None
+
+    ctx.Control, ctx.IZONE = control, control.IZONE
+    ctx.Site, ctx.Crops = SIM.Sites[control.WSITE], rows
+    with console(verbose):
+        CROPSIM.initSoilSimulation(ctx, soil, soilIndex)
+        # Nothing is printed, but the soil temperatures are returned with the initial data.
+        ctx.SoilTemperature = SIM.Config.SOIL_TEMP != OFF
+        for row in rows:
+            CROPSIM.initCropSimulation(ctx, row)
+            CROPSIM.performSimulation(ctx)
+
+    return SimulationResults(ctx)
+
+
+def console(verbose: bool):
+    """Returns the context discarding the console output of the simulation, unless verbose."""
+    return contextlib.nullcontext() if verbose else contextlib.redirect_stdout(NULL_FILE)
+
+
+def getSimControl(site: str):
+    """Returns the simulation control row of the weather site, raising WeatherStationNotFound if missing."""
+    if SIM.Config is None:
+        raise RuntimeError("The inputs are not loaded, call CropSimAPI.load() first.")
+    for sim in SIM.Simulations:
+        if sim.WSITE == site and site in SIM.Sites:
+            return sim
+    raise WeatherStationNotFound(site)
+
+
+def getSoilIndex(soil: int) -> int:
+    """Returns the index of the soil code in the SOILPROPFILE, raising SoilNotFound if missing."""
+    for index, soilType in enumerate(SIM.SoilProps):
+        if soilType.ISCODE == soil:
+            return index
+    raise SoilNotFound(soil)
+
+
+def getColumns(rows: list, columns: tuple) -> dict:
+    """Returns the values of the rows by column name, as arrays of the column type."""
+    values = list(zip(*rows)) if rows else [()] * len(columns)
+    types = {"TEXT": str, "INTEGER": np.int64, "REAL": np.float64}
+    return {name: np.array(column, dtype=types[getColumnType(name)]) for name, column in zip(columns, values)}
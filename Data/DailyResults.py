@@ -0,0 +1,31 @@
+"""Daily results module."""
+
+import numpy as np
+
+LAYER_COUNT: int = 10
+
+
+class DailyResults:
+    """The daily values of every crop-year of a chain, as recorded by DEPLT at the end of every day.
+    The rows are the crop-years, in the order simulated, the columns the days of the year (JDAY - 1).
+    The days outside the simulated season are NaN."""
+
+    __slots__ = ("THETA", "ET", "DRAIN", "IRR")
+
+    def __init__(self, years: int):
+        self.THETA: np.ndarray = np.full((years, 366, LAYER_COUNT), np.nan)
+        """Volumetric water content of every soil layer."""
+        self.ET: np.ndarray = np.full((years, 366), np.nan)
+        """Evapotranspiration (in inches)."""
+        self.DRAIN: np.ndarray = np.full((years, 366), np.nan)
+        """Drainage below the soil profile (in inches)."""
+        self.IRR: np.ndarray = np.full((years, 366), np.nan)
+        """Net irrigation (in inches)."""
+
+    def record(self, ctx, D):
+        """Records the values of the day simulated, once the daily summaries are computed."""
+        year, day = ctx.ISIM, ctx.JDAY - 1
+        self.THETA[year, day] = ctx.THETA
+        self.ET[year, day] = D.DET
+        self.DRAIN[year, day] = D.DRAIN
+        self.IRR[year, day] = D.DNETI
@@ -33,6 +33,8 @@ class IrrigationSchedulingMethods(IntEnum):
     """
     SimulationForKnownFutureWeatherForNOAAProject = 4
     """Simulation for known future weather for NOAA project"""
+    SimulationForKnownFutureWeatherAndCropET = 5
+    """Simulation for known future weather, irrigating when the forecast rain is not over an inch"""
 
 
 class IrrigationData:
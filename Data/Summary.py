@@ -1,6 +1,9 @@
 """Summary module."""
 
+import numpy as np
+
 from Files.DataFile import DataRow
+from Subroutines.DAYS import CALDAY
 
 
 class WeeklyData(DataRow):
@@ -168,3 +171,112 @@ class MonthlyData(WeeklyData):
         res.DRA = self.DRA - other.DRA
         res.DPL = self.DPL - other.DPL
         return res
+
+
+FLUXES = ("E", "T", "ET", "DET", "ER", "ETR", "RA", "RON", "ROF", "DRA", "IRG", "IRN", "INF")
+"""The daily fluxes summed into the weekly and monthly summaries."""
+
+DAYS: int = 366
+
+
+def getPeriodDays(periods: list) -> np.ndarray:
+    """Returns the table of the 0-based days of every period, in order,
+    padded with the index of the zero column of the fluxes (DAYS)."""
+    days = [[day for day in range(DAYS) if periods[day] == i] for i in range(max(periods) + 1)]
+    width = max(len(period) for period in days)
+    return np.array([period + [DAYS] * (width - len(period)) for period in days])
+
+
+MONTH_DAYS: np.ndarray = getPeriodDays([CALDAY(day + 1)[0] - 1 for day in range(DAYS)])
+"""The days of every month, as given by CALDAY (day 366 is December 32)."""
+WEEK_DAYS: np.ndarray = getPeriodDays([day // 7 for day in range(DAYS)])
+"""The days of every week, the 53rd one holding the last days of the year."""
+MONTH_STARTS: frozenset = frozenset(int(days[0]) for days in MONTH_DAYS)
+"""The first day of every month, the depletion of the month is taken on it."""
+
+
+class DailyFluxes:
+    """The daily fluxes of a crop-year as recorded by DEPLT, in 366-day arrays allocated once per context.
+    They are summed into the monthly and weekly summaries at the end of the season, see getMonths."""
+
+    __slots__ = ("Values", "IRIGNO", "DPLN", "First", "Last") + FLUXES
+
+    def __init__(self):
+        self.Values: np.ndarray = np.zeros((len(FLUXES), DAYS + 1))
+        """The fluxes by day, a row per flux, the last column stays at zero to pad the periods."""
+        for i, name in enumerate(FLUXES):
+            setattr(self, name, self.Values[i])
+        self.IRIGNO: np.ndarray = np.zeros(DAYS, dtype=np.int64)
+        """The number of irrigations at the end of every day."""
+        self.DPLN: np.ndarray = np.zeros(DAYS)
+        """The depletion on the first day of every month."""
+        self.First: int = 0
+        """The first (0-based) day recorded."""
+        self.Last: int = -1
+        """The last (0-based) day recorded, the days are recorded one after another."""
+
+    def clear(self):
+        """Resets every flux to zero, at the start of a crop-year."""
+        self.Values.fill(0.0)
+        self.IRIGNO.fill(0)
+        self.DPLN.fill(0.0)
+        self.First, self.Last = 0, -1
+
+    def record(self, day: int):
+        """Marks the 0-based day as recorded, once its fluxes are stored."""
+        if self.Last < 0:
+            self.First = day
+        self.Last = day
+
+    def getMonthToDate(self, name: str, day: int) -> float:
+        """Returns the flux summed from the start of the month to the (0-based) day, as the monthly summary does."""
+        total = 0.0
+        for i in MONTH_DAYS[CALDAY(day + 1)[0] - 1]:
+            if i > day:
+                break
+            total += float(self.Values[FLUXES.index(name), i])
+        return total
+
+    def getMonthTotals(self, name: str) -> list:
+        """Returns the flux summed over each of the 12 months, as in the MonthlyData of getMonths."""
+        i = FLUXES.index(name)
+        return sumPeriods(self.Values[i:i + 1], MONTH_DAYS)[0].tolist()
+
+    def getMonths(self, naturalCrop: bool) -> list:
+        """Returns the MonthlyData of the 12 months, summed day by day in order as the Fortran loop does."""
+        totals = sumPeriods(self.Values, MONTH_DAYS)
+        months = [MonthlyData() for _ in range(len(MONTH_DAYS))]
+        for name, values in zip(FLUXES, totals.tolist()):
+            if name != "DET":
+                for month, value in zip(months, values):
+                    setattr(month, name, value)
+
+        for i, (month, days) in enumerate(zip(months, MONTH_DAYS)):
+            if not naturalCrop:
+                month.ET = month.E + month.T
+            last = min(self.Last, int(days[days < DAYS][-1]))
+            if last >= max(self.First, int(days[0])):
+                month.NUMIRR = int(self.IRIGNO[last])
+            month.DPL = float(self.DPLN[days[0]])
+        return months
+
+    def getWeeks(self) -> list:
+        """Returns the WeeklyData of the 53 weeks, summed day by day in order."""
+        totals = sumPeriods(self.Values, WEEK_DAYS)
+        weeks = [WeeklyData() for _ in range(len(WEEK_DAYS))]
+        for name, values in zip(FLUXES, totals.tolist()):
+            # The weekly ET is the evaporation plus the transpiration of every day.
+            if name in ("DET", "ER", "ETR", "RA", "IRG", "IRN"):
+                for week, value in zip(weeks, values):
+                    setattr(week, "ET" if name == "DET" else name, value)
+        return weeks
+
+
+def sumPeriods(values: np.ndarray, periods: np.ndarray) -> np.ndarray:
+    """Returns the sums of the rows over every period, a column per period.
+    TONOTE: np.add.reduceat sums pairwise, which may change the last digits, so the days are
+    added one at a time from the first of every period, as the daily loop did, the padding adds zeros."""
+    totals = np.zeros((values.shape[0], periods.shape[0]))
+    for k in range(periods.shape[1]):
+        totals += values[:, periods[:, k]]
+    return totals
@@ -0,0 +1,213 @@
+"""Weather data module."""
+
+import sys
+from collections import OrderedDict
+
+import numpy as np
+
+from Data.WeatherStation import WeatherStation
+
+
+class WeatherData:
+    """The cleaned daily weather of a site for a whole year, as computed by READWEAT.
+    It doesn't depend on the crop or the soil, so it is shared by every simulation
+    reading the same .WEA file and must be treated as read-only."""
+
+    __slots__ = ("Station", "JDYSTR", "ETR", "TMIN", "TMAX", "PRECIP", "SOLAR", "TANUAL", "Degrees")
+
+    def __init__(self, station: WeatherStation, jdystr: int):
+        self.Station = station
+        self.JDYSTR = jdystr
+        """First day of the year with weather data."""
+
+        temp = [0.0] * 366
+        self.ETR = temp[:]
+        """Reference ET, already reduced by ETRFACT."""
+        self.TMIN = temp[:]
+        self.TMAX = temp[:]
+        self.PRECIP = temp[:]
+        self.SOLAR: list = None
+        """Estimated solar radiation, computed by READWEAT for the soil temperatures only."""
+        self.TANUAL = 0.0
+        """Mean annual air temperature, computed along with SOLAR."""
+        self.Degrees: dict = {}
+        """The GrowingDegreeDays computed by READWEAT, by (TBASE, TCEIL, JDYPLT, JDYEND).
+        Counted by nbytes, the cache is told when more are added, see WeatherCache.resize."""
+
+    def nbytes(self) -> int:
+        """Returns the approximate memory used by the daily arrays and the growing degree days computed from them."""
+        total = 0
+        # SOLAR is counted as an array like ETR before computed, so the size never changes once cached.
+        for values in (self.ETR, self.TMIN, self.TMAX, self.PRECIP, self.ETR if self.SOLAR is None else self.SOLAR):
+            total += getArrayBytes(values)
+        for degrees in self.Degrees.values():
+            total += degrees.nbytes()
+        return total
+
+
+def getArrayBytes(values) -> int:
+    """Returns the approximate memory used by an array or a list of floats."""
+    if hasattr(values, "nbytes"):
+        return values.nbytes
+    # A list holds a pointer to a float object for every item.
+    return sys.getsizeof(values) + len(values) * sys.getsizeof(0.0)
+
+
+class GrowingDegreeDays:
+    """The growing degree days accumulated from the planting day to the end day of a season, and the
+    first killing freeze. They only depend on the weather, the crop base and ceiling temperatures and
+    the planting and end days, so the .SIM files sharing those share them, see READWEAT."""
+
+    __slots__ = ("GDDS", "GDD", "JDYFRZ", "JDYEND", "START", "SEASON", "Days", "Coefficients")
+
+    def __init__(self, weather: WeatherData, BASE: float, CEIL: float, JDYPLT: int, JDYEND: int):
+        self.START: int = JDYPLT - 1
+        """The 0-based index of the planting day."""
+        self.JDYEND: int = JDYEND
+        TMAX = np.asarray(weather.TMAX[self.START:JDYEND], dtype=np.float64)
+        TMIN = np.asarray(weather.TMIN[self.START:JDYEND], dtype=np.float64)
+
+        # The maximum temperature is capped by the ceiling first, the minimum raised to the base first.
+        T1 = np.maximum(np.minimum(TMAX, CEIL), BASE)
+        T2 = np.minimum(np.maximum(TMIN, BASE), CEIL)
+        GDD = np.maximum((T1 + T2) / 2.0 - BASE, 0.0)
+        # The sum is accumulated day by day, in the same order as the Fortran loop.
+        self.SEASON: np.ndarray = np.cumsum(GDD)
+        """The accumulated GDD of the season days, from the planting day."""
+        self.GDDS: list = [0.0] * 366
+        """The accumulated GDD by day of the year, zero outside the season. Shared, must be treated as read-only."""
+        self.GDDS[self.START:JDYEND] = self.SEASON.tolist()
+        self.GDD: float = float(GDD[-1]) if len(GDD) else None
+        """The GDD of the last day of the season, None if the season is empty."""
+
+        # Determine First Killing Freeze Date, the first day from July 19 (day 200) under 26 F.
+        freeze = (np.arange(self.START + 1, self.START + 1 + len(TMIN)) >= 200) & (TMIN < 26.0)
+        self.JDYFRZ: int = self.START + 1 + int(np.argmax(freeze)) if freeze.any() else JDYEND
+        self.Days: dict = {}
+        self.Coefficients: dict = {}
+        """The (CROPKC array, context state left) of the seasons computed from the GDDS, see READWEAT."""
+
+    def nbytes(self) -> int:
+        """Returns the approximate memory used by the accumulated GDD and the days and seasons computed from them."""
+        total = getArrayBytes(self.SEASON) + getArrayBytes(self.GDDS)
+        for values, days in self.Days.items():
+            total += sys.getsizeof(values) + sys.getsizeof(days)
+        for CROPKC, state in self.Coefficients.values():
+            total += getArrayBytes(CROPKC) + sys.getsizeof(state)
+        return total
+
+    def findDays(self, values: tuple) -> tuple:
+        """Returns the 1-based day the accumulated GDD reaches every value,
+        or the day after JDYEND when not reached during the season."""
+        days = self.Days.get(values)
+        if days is None:
+            # The accumulated GDD never decreases, so the first day reaching a value is a sorted search.
+            indices = np.searchsorted(self.SEASON, values, side="left")
+            days = self.Days[values] = tuple(
+                self.START + int(i) + 1 if i < len(self.SEASON) else self.JDYEND + 1 for i in indices)
+        return days
+
+
+class ForecastWindows:
+    """The rain and crop ET of the forecast periods of a crop-year, the NFDAY days from every day, read by
+    IRRIGA when scheduling with known future weather. They are summed once per crop-year and forecast
+    length, so several lengths can be looked up in the same run."""
+
+    __slots__ = ("PRECIP", "CROPET", "Windows")
+
+    def __init__(self, PRECIP: list, ETR: list, CROPKC: list):
+        self.PRECIP: np.ndarray = np.asarray(PRECIP, dtype=np.float64)
+        self.CROPET: np.ndarray = np.asarray(ETR, dtype=np.float64) * np.asarray(CROPKC, dtype=np.float64)
+        """The crop ET of every day, ETR * CROPKC."""
+        self.Windows: dict = {}
+        """The sums of every forecast period, by (values name, NFDAY)."""
+
+    def getRain(self, JDAY: int, NFDAY: int) -> float:
+        """Returns the rain of the NFDAY days after JDAY, raising IndexError past the end of the year."""
+        return self.__getWindows("PRECIP", NFDAY)[JDAY]
+
+    def getCropET(self, JDAY: int, NFDAY: int) -> float:
+        """Returns the crop ET of the NFDAY days after JDAY, raising IndexError past the end of the year."""
+        return self.__getWindows("CROPET", NFDAY)[JDAY]
+
+    def __getWindows(self, name: str, NFDAY: int) -> list:
+        windows = self.Windows.get((name, NFDAY))
+        if windows is None:
+            values = getattr(self, name)
+            # TONOTE: The differences of a cumulative sum would change the last digits of the sums,
+            # so every period is summed from its first day on, as IRRIGA did, a day of all the periods at a time.
+            sums = np.zeros(max(0, len(values) - max(0, NFDAY) + 1))
+            for k in range(max(0, NFDAY)):
+                sums += values[k:k + len(sums)]
+            windows = self.Windows[(name, NFDAY)] = sums.tolist()
+        return windows
+
+
+class WeatherCache:
+    """Least recently used cache of the weather data, keyed by (site, year).
+    TONOTE: The same .WEA file is read for every soil and crop simulated on a site,
+    the cache parses it only once per process."""
+
+    __slots__ = ("MaxBytes", "Bytes", "Hits", "Misses", "__entries", "__sizes")
+
+    def __init__(self, maxMegabytes: int = 256):
+        self.MaxBytes: int = max(0, maxMegabytes) * 1024 * 1024
+        """Memory cap for the cached data, zero disables the cache."""
+        self.Bytes: int = 0
+        """Approximate memory used by the cached data."""
+        self.Hits: int = 0
+        self.Misses: int = 0
+        self.__entries: OrderedDict = OrderedDict()
+        self.__sizes: dict = {}
+        """The size every entry is accounted for in Bytes, by (site, year)."""
+
+    def get(self, site: str, year: int):
+        """Returns the cached weather data for the site and year, or None when not cached."""
+        data = self.__entries.get((site, year))
+        if data is None:
+            self.Misses += 1
+            return None
+
+        self.__entries.move_to_end((site, year))
+        self.Hits += 1
+        return data
+
+    def put(self, site: str, year: int, data: WeatherData):
+        """Caches the weather data, evicting the least recently used entries to stay under the cap."""
+        self.__remove((site, year))
+        self.__add((site, year), data, data.nbytes())
+
+    def resize(self, site: str, year: int, data: WeatherData):
+        """Accounts again for the cached weather data once more growing degree days are computed from it,
+        evicting the least recently used entries to stay under the cap, or the data itself when over the cap."""
+        key = (site, year)
+        if self.__entries.get(key) is not data:
+            return
+        size = data.nbytes()
+        if size != self.__sizes[key]:
+            self.__remove(key)
+            self.__add(key, data, size)
+
+    def __add(self, key: tuple, data: WeatherData, size: int):
+        if size > self.MaxBytes:
+            return
+
+        while self.__entries and self.Bytes + size > self.MaxBytes:
+            self.__remove(next(iter(self.__entries)))
+
+        self.__entries[key] = data
+        self.__sizes[key] = size
+        self.Bytes += size
+
+    def __remove(self, key: tuple):
+        if self.__entries.pop(key, None) is not None:
+            self.Bytes -= self.__sizes.pop(key)
+
+    def clear(self):
+        """Removes every cached entry."""
+        self.__entries.clear()
+        self.__sizes.clear()
+        self.Bytes = 0
+
+    def __len__(self):
+        return len(self.__entries)
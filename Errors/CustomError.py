@@ -5,24 +5,91 @@ class CropSimError(Exception):
     """An application specific error."""
 
 
-class ConvergenceError(CropSimError):
+class SimulationError(CropSimError):
+    """An error simulating a crop-year, with the site, soil, year and day it ocurred on."""
+
+    SITE = ""
+    SOIL = 0
+    YEAR = 0
+    JDAY = 0
+
+    def __init__(self, ctx, message: str):
+        super().__init__(message)
+        if ctx is not None:
+            self.SITE = ctx.Control.WSITE if ctx.Control is not None else ""
+            self.SOIL = ctx.SOIL
+            self.YEAR = ctx.IYEAR
+            self.JDAY = ctx.JDAY
+
+    def __str__(self):
+        return f"{self.args[0]} (Site={self.SITE} Soil={self.SOIL} Year={self.YEAR} Day={self.JDAY})"
+
+    @classmethod
+    def fromError(cls, ctx, err: Exception):
+        """Returns the error raised simulating the crop-year of the context as a SimulationError on the
+        current day, caused by the error. A SimulationError is returned as it is."""
+        if isinstance(err, SimulationError):
+            return err
+        error = cls(ctx, f"{type(err).__name__}: {err}")
+        error.__cause__ = err
+        return error
+
+
+class ConvergenceError(SimulationError):
     """A Convergence error."""
 
 
 class TransLoopConvergenceError(ConvergenceError):
     """A Convergence error ocurring in the transpiration loop."""
 
-    JDAY = 0
     TRANS = 0.0
 
-    def __init__(self, jday: int, trans: float):
-        super().__init__()
+    def __init__(self, ctx, trans: float):
+        super().__init__(ctx, f"Convergence error in trans loop, Trans={trans:.2f}")
 
-        self.JDAY = jday
         self.TRANS = trans
 
-    def __str__(self):
-        return f"Convergence error in trans loop, Day={self.JDAY} Trans={self.TRANS:.2f}"
+
+class EffectivePrecipitationError(SimulationError):
+    """Raises when the effective precipitation exceeds the rain on non terraced fields, or the runoff
+    is negative. The Fortran code prints the values and stops @ 1487 and @ 1729."""
+
+    RAIN = 0.0
+    EPRECIP = 0.0
+    RUNOFF = 0.0
+
+    def __init__(self, ctx, line: int):
+        super().__init__(ctx, (f"Effective precipitation error @ {line}, RAIN={ctx.RAIN:.2f} "
+                               f"EPRECIP={ctx.EPRECIP:.2f} RUNOFF={ctx.RUNOFF:.2f} "
+                               f"SIMFILE={ctx.CurrentCrop.SIMFILE}"))
+
+        self.RAIN = ctx.RAIN
+        self.EPRECIP = ctx.EPRECIP
+        self.RUNOFF = ctx.RUNOFF
+
+
+class NegativeRunoffError(SimulationError):
+    """Raises when the runoff accumulated for a month is negative."""
+
+    MONTH = 0
+    ROF = 0.0
+
+    def __init__(self, ctx, month: int, rof: float):
+        super().__init__(ctx, f"Negative monthly runoff, Month={month} ROF={rof:.2f}")
+
+        self.MONTH = month
+        self.ROF = rof
+
+
+class CropNameError(SimulationError):
+    """Raises when the crop of the .SIM file has no name to write to the YR file."""
+
+    CROP = 0
+
+    def __init__(self, ctx, crop):
+        super().__init__(ctx, f"Problem with Crop Name, Crop Number is: {crop}")
+
+        self.CROP = crop
 
 
 class WeatherStationNotFound(CropSimError):
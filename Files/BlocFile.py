@@ -1,5 +1,6 @@
 """Holds the data contained in the file BLOCK.DAT"""
 
+from HelperIO import OpenTextFile
 from HelperIO import ReadFloats
 from HelperIO import ReadNextFloat
 from HelperIO import ReadNextInteger
@@ -18,7 +19,7 @@ class BlocFile:
 
     def __init__(self, filename):
         print("Reading BLOC file at: " + filename)
-        file = open(filename, "r")
+        file = OpenTextFile(filename)
 
         self.ETRFACT = ReadNextFloat(file)
         """ETR Adjusment Factor used to reduce Penman-Monteith 
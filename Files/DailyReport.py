@@ -0,0 +1,92 @@
+"""Daily Report module.
+
+The daily rows of the _OUT and PROFILE.TXT files are not formatted on the days printed: DEPLT records
+the values of the day into a row of an array, and the rows of the season are rendered at its end,
+a row template applied to every row. As set by the DAILY_REPORT setting the rows are rendered:
+
+    inline:  on the simulation thread, at the end of the season (the default).
+    thread:  on a writer thread of the process, while the next crop-year is simulated.
+    process: on a renderer process, then written by the writer thread. A worker process of a parallel
+             run can't start processes of its own, so its rows are rendered on its writer thread.
+
+The rendered text is identical in every mode, the values are recorded as float64 since the columns are
+rounded as printed.
+"""
+
+import numpy as np
+
+from Subroutines.DAYS import CALDAY
+
+INLINE: str = "inline"
+THREAD: str = "thread"
+PROCESS: str = "process"
+DAILY_REPORT_MODES = (INLINE, THREAD, PROCESS)
+
+LAYER_COUNT: int = 10
+"""The soil layers printed to PROFILE.TXT."""
+
+OUT_COLUMNS = slice(1, 24)
+"""The columns of the _OUT rows, after the day of the year."""
+PROFILE_COLUMNS = slice(24, 34 + 2 * LAYER_COUNT)
+"""The columns of the PROFILE.TXT rows, after the day of the year."""
+
+OUT_ROW: str = "%3d%3d" + "%7.2f" * 11 + "%8.1f%8.0f %6.0f%6.2f%5.2f" + "%6.2f%6.2f%6.1f" + "%6.2f" * 4 + "\n"
+"""The template of an _OUT row: the month and day, then the OUT_COLUMNS."""
+PROFILE_ROW: str = ("%3d%3d  %4.2f  %4.2f  %4.2f %4.2f  %4.2f  %4.2f  %4.2f  %4.2f %4.2f %4.2f  "
+                    + " %4.3f" * LAYER_COUNT + "   " + " %4.1f" * LAYER_COUNT + "\n")
+"""The template of a PROFILE.TXT row: the month and day, then the PROFILE_COLUMNS."""
+
+CALENDAR: list = [(0, 0)] + [CALDAY(JDAY) for JDAY in range(1, 367)]
+"""The (month, day) of every day of the year, by JDAY."""
+
+
+class DailyReport:
+    """The values printed on the days of a crop-year, a row per day printed, rendered at the end of the season."""
+
+    __slots__ = ("Values", "Count")
+
+    def __init__(self):
+        self.Values: np.ndarray = np.zeros((366, PROFILE_COLUMNS.stop))
+        """The day of the year, then the OUT_COLUMNS and PROFILE_COLUMNS of every day printed."""
+        self.Count: int = 0
+        """The days recorded."""
+
+    def clear(self):
+        """Drops the days recorded, at the start of the crop-year."""
+        self.Count = 0
+
+    def record(self, ctx, D):
+        """Records the values printed on the day, once the amount of water stored in the soil profile is updated."""
+        row = self.Values[self.Count]
+        row[:34] = (
+            ctx.JDAY,
+            ctx.ETR[ctx.JDAY], D.ETRS, D.ES, D.TS, ctx.ETS, ctx.SNIRR, ctx.SGRIRR, ctx.PRECIPS, ctx.EPRECIPS,
+            ctx.SNOH2O, D.RUNONS, ctx.CURVNO, ctx.RESIDUE, ctx.GDD, ctx.DRAINS, ctx.KC, ctx.DPLN, ctx.AWDPLN,
+            D.DPLPER, ctx.RZD, ctx.PAW, ctx.AWATER, ctx.TOTWAT,
+            D.DFRACT, D.EXTRA, D.DIST, D.DET, D.DRAIN, D.DNETI, D.DDINF, ctx.RUNON, ctx.AWDPLN, ctx.DPLA)
+        row[34:34 + LAYER_COUNT] = ctx.THETA[:LAYER_COUNT]
+        row[34 + LAYER_COUNT:] = ctx.SOILT[:LAYER_COUNT]
+        self.Count += 1
+
+    def pop(self) -> np.ndarray:
+        """Returns the rows recorded so far, then drops them."""
+        values = self.Values[:self.Count].copy()
+        self.Count = 0
+        return values
+
+
+def renderOutRows(values: np.ndarray) -> str:
+    """Returns the _OUT rows of the days recorded."""
+    return renderRows(OUT_ROW, values, OUT_COLUMNS)
+
+
+def renderProfileRows(values: np.ndarray) -> str:
+    """Returns the PROFILE.TXT rows of the days recorded."""
+    return renderRows(PROFILE_ROW, values, PROFILE_COLUMNS)
+
+
+def renderRows(template: str, values: np.ndarray, columns: slice) -> str:
+    """Returns the rows of the template for the columns of the days recorded, each starting with its month and day.
+    TONOTE: The %-format of a float gives the same text as its format spec, e.g. %7.2f and >7.2f."""
+    days = values[:, 0].astype(np.int64).tolist()
+    return "".join([template % (*CALENDAR[JDAY], *row) for JDAY, row in zip(days, values[:, columns].tolist())])
@@ -0,0 +1,92 @@
+"""Failure Report module.
+
+A crop-year failing with an error, e.g. a TransLoopConvergenceError, is handled as set by the
+ERROR_POLICY setting:
+
+    abort:      the run stops, as the Fortran code does (the default).
+    skip-chain: the rest of the (site, soil) chain is skipped, the run goes on with the next chain.
+    skip-year:  the crop-year is skipped, the chain goes on with the next crop-year from the state
+                at the end of the last crop-year completed.
+
+Every failure is recorded with its site, soil, year and day, and written at the end of the run to
+the failures.json file in the output folder. An error other than a SimulationError, e.g. a
+ZeroDivisionError, is recorded as a SimulationError on the day it was raised, with its traceback.
+
+TONOTE: The _OUT and PROFILE.TXT rows of a failed crop-year stop at the day it failed, or include its
+whole season when it failed once the daily loop was done (e.g. on the yield). Its _MON and _PRECIP rows
+are held until its _YR row is written, and dropped when it fails, so a failed crop-year has no _YR, _MON
+or _PRECIP rows, nor rows in the SQLite database.
+"""
+
+import json
+import os
+
+ABORT: str = "abort"
+SKIP_CHAIN: str = "skip-chain"
+SKIP_YEAR: str = "skip-year"
+ERROR_POLICIES = (ABORT, SKIP_CHAIN, SKIP_YEAR)
+
+FAILURE_FILE: str = "failures.json"
+"""The failure report filename, in the output folder."""
+
+
+class Failure:
+    """A crop-year failed, and the error policy applied."""
+
+    __slots__ = ("SITE", "SOIL", "YEAR", "JDAY", "ERROR", "MESSAGE", "POLICY", "TRACEBACK")
+
+    def __init__(self, site: str, soil: int, year: int, jday: int, error: str, message: str, policy: str,
+                 trace: str = ""):
+        self.SITE: str = site
+        self.SOIL: int = soil
+        self.YEAR: int = year
+        self.JDAY: int = jday
+        """The day of the year the crop-year failed on, 0 when failed before the daily loop."""
+        self.ERROR: str = error
+        """The name of the error class."""
+        self.MESSAGE: str = message
+        self.POLICY: str = policy
+        self.TRACEBACK: str = trace
+        """The traceback of the error raised, when not a SimulationError."""
+
+    @classmethod
+    def fromError(cls, err, policy: str, trace: str = ""):
+        """Returns the failure of the SimulationError."""
+        return cls(err.SITE, err.SOIL, err.YEAR, err.JDAY, type(err).__name__, err.args[0], policy, trace)
+
+    def toDict(self) -> dict:
+        """Returns the failure as plain data for the report."""
+        values = {"SITE": self.SITE, "SOIL": self.SOIL, "YEAR": self.YEAR, "JDAY": self.JDAY,
+                  "ERROR": self.ERROR, "MESSAGE": self.MESSAGE, "POLICY": self.POLICY}
+        if self.TRACEBACK:
+            values["TRACEBACK"] = self.TRACEBACK
+        return values
+
+
+class FailureReport:
+    """The crop-years failed during a run, in the order simulated."""
+
+    __slots__ = ("Failures",)
+
+    def __init__(self):
+        self.Failures: list = []
+
+    def __len__(self):
+        return len(self.Failures)
+
+    def record(self, failure: Failure):
+        """Records the failure of a crop-year."""
+        self.Failures.append(failure)
+
+    def extend(self, failures: list):
+        """Records the failures of a chain simulated on a worker process."""
+        self.Failures.extend(failures)
+
+    def write(self, folder: str):
+        """Writes the report into the output folder, if any crop-year failed."""
+        if not self.Failures:
+            return
+        filename = os.path.join(folder, FAILURE_FILE)
+        with open(filename, "wt") as file:
+            json.dump([failure.toDict() for failure in self.Failures], file, indent=1)
+        print(f"{len(self.Failures)} crop-years failed, see the report at: {filename}")
@@ -2,6 +2,7 @@
 
 from Data.Crop import CropId
 
+from HelperIO import OpenTextFile
 from HelperIO import ReadFloats
 from HelperIO import ReadNextFloat
 from HelperIO import ReadNextInteger
@@ -31,7 +32,7 @@ class InitialFile:
 
         if filename:
             print("Reading INITFILE file at: " + filename)
-            file = open(filename, "r")
+            file = OpenTextFile(filename)
 
             self.THETA = ReadFloats(file, 10)
             self.CROP = ReadNextInteger(file)
@@ -0,0 +1,246 @@
+"""Output Files module.
+
+The output files (_MON, _YR, _PRECIP, _OUT and PROFILE.TXT) are appended to on every crop-year
+of every soil. Instead of opening and closing them every time, a process keeps one handle per
+file with a large write buffer, flushed at the end of every chain and closed at the end of
+every site.
+
+With DAILY_REPORT set to thread or process (see DailyReport), the _OUT and PROFILE.TXT files are
+written to by a writer thread: everything written to them is queued, in order, with the daily rows
+rendered at the end of the season, and the queue is drained before their buffered output is flushed.
+The writer thread and the renderer process are stopped at the end of the run, see OutputFiles.shutdown.
+
+The _MON and _PRECIP rows of a crop-year are held until its _YR row is written (see HeldFile), so a
+crop-year failing on its yield leaves no rows in them.
+
+When simulated in-process (see CropSimAPI) the output is discarded, nothing is written to disk.
+"""
+
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from Files.DailyReport import INLINE, THREAD, PROCESS
+
+BUFFER_SIZE: int = 1 << 20
+"""Write buffer size (in bytes) of every output file."""
+
+
+class OutputFiles:
+    """The output files open on a process, one handle per file, opened for appending."""
+
+    __slots__ = ("BufferSize", "__files", "__queue")
+
+    def __init__(self, bufferSize: int = BUFFER_SIZE, mode: str = INLINE):
+        self.BufferSize: int = bufferSize
+        self.__files: dict = {}
+        self.__queue: WriteQueue = WriteQueue(mode) if mode != INLINE else None
+
+    def __len__(self):
+        return len(self.__files)
+
+    def open(self, filename: str, queued: bool = False):
+        """Returns the file opened for appending, opening it and its folder on first use.
+        When queued, and the rows are not rendered inline, the file is written to by the writer thread."""
+        file = self.__files.get(filename)
+        if file is None:
+            folder = os.path.dirname(filename)
+            if folder and not os.path.isdir(folder): os.makedirs(folder, exist_ok=True)
+            file = open(filename, "at", buffering=self.BufferSize)
+            if queued and self.__queue is not None: file = QueuedFile(file, self.__queue)
+            self.__files[filename] = file
+        return file
+
+    def render(self, file, function, values):
+        """Writes the text returned by the function for the values to the file,
+        rendered on the writer thread (or the renderer process) when the file is queued."""
+        if type(file) is QueuedFile:
+            file.render(function, values)
+        else:
+            file.write(function(values))
+
+    def flush(self):
+        """Writes the buffered output of every file, at the end of a chain."""
+        for file in self.__files.values():
+            file.flush()
+
+    def sizes(self, folder: str) -> dict:
+        """Writes the buffered output of the files open in the folder, returns their sizes by relative path."""
+        sizes = {}
+        for filename, file in self.__files.items():
+            path = os.path.relpath(filename, folder)
+            if not path.startswith(os.pardir):
+                file.flush()
+                sizes[path] = os.fstat(file.fileno()).st_size
+        return sizes
+
+    def close(self):
+        """Closes every file, writing their buffered output."""
+        files, self.__files = self.__files, {}
+        for file in files.values():
+            file.close()
+
+    def shutdown(self):
+        """Closes every file, then stops the writer thread and the renderer process, at the end of the run."""
+        try:
+            self.close()
+        finally:
+            if self.__queue is not None:
+                self.__queue.close()
+
+
+class WriteQueue:
+    """Writes to the queued files on a single writer thread, in the order queued.
+    The writer thread, and the renderer process, are started on first use."""
+
+    __slots__ = ("Mode", "__writer", "__renderer", "__pending")
+
+    def __init__(self, mode: str):
+        self.Mode: str = mode
+        if mode == PROCESS and multiprocessing.current_process().daemon:
+            # TONOTE: The worker processes of a Pool are daemons, which can't have child processes.
+            self.Mode = THREAD
+        self.__writer: ThreadPoolExecutor = None
+        self.__renderer: ProcessPoolExecutor = None
+        self.__pending: deque = deque()
+
+    def write(self, file, text: str):
+        """Queues the text to write to the file."""
+        self.__add(self.__getWriter().submit(file.write, text))
+
+    def render(self, file, function, values):
+        """Queues the text returned by the function for the values, to write to the file."""
+        if self.Mode == PROCESS:
+            if self.__renderer is None: self.__renderer = ProcessPoolExecutor(max_workers=1)
+            rendered = self.__renderer.submit(function, values)
+            self.__add(self.__getWriter().submit(writeRendered, file, rendered))
+        else:
+            self.__add(self.__getWriter().submit(writeRendering, file, function, values))
+
+    def drain(self):
+        """Waits for everything queued to be written, raising the first error of the writer thread."""
+        pending = self.__pending
+        while pending:
+            pending.popleft().result()
+
+    def close(self):
+        """Waits for everything queued to be written, then stops the writer thread and the renderer process.
+        They are started again if anything else is queued."""
+        try:
+            self.drain()
+        finally:
+            # Whatever failed to be written, nothing is left running.
+            self.__pending.clear()
+            writer, renderer = self.__writer, self.__renderer
+            self.__writer = self.__renderer = None
+            if writer is not None: writer.shutdown(wait=True)
+            if renderer is not None: renderer.shutdown(wait=True)
+
+    def __getWriter(self) -> ThreadPoolExecutor:
+        if self.__writer is None: self.__writer = ThreadPoolExecutor(max_workers=1)
+        return self.__writer
+
+    def __add(self, future):
+        pending = self.__pending
+        pending.append(future)
+        # What is already written is dropped, its error raised now rather than at the end of the chain.
+        while pending and pending[0].done():
+            pending.popleft().result()
+
+
+def writeRendered(file, rendered):
+    """Writes the text rendered on the renderer process to the file, on the writer thread."""
+    file.write(rendered.result())
+
+
+def writeRendering(file, function, values):
+    """Writes the text returned by the function for the values to the file, on the writer thread."""
+    file.write(function(values))
+
+
+class QueuedFile:
+    """A file written to by the writer thread of a WriteQueue, everything written being queued in order."""
+
+    __slots__ = ("File", "Queue")
+
+    def __init__(self, file, queue: WriteQueue):
+        self.File = file
+        self.Queue: WriteQueue = queue
+
+    def write(self, text: str) -> int:
+        """Queues the text."""
+        self.Queue.write(self.File, text)
+        return len(text)
+
+    def render(self, function, values):
+        """Queues the text returned by the function for the values."""
+        self.Queue.render(self.File, function, values)
+
+    def flush(self):
+        """Writes everything queued, then the buffered output."""
+        self.Queue.drain()
+        self.File.flush()
+
+    def fileno(self) -> int:
+        return self.File.fileno()
+
+    def close(self):
+        """Writes everything queued, then closes the file."""
+        self.Queue.drain()
+        self.File.close()
+
+
+class HeldFile:
+    """The rows written to an output file during a crop-year, held until the crop-year is completed.
+    Written to the file by release, dropped with the HeldFile when the crop-year fails."""
+
+    __slots__ = ("File", "__rows")
+
+    def __init__(self, file):
+        self.File = file
+        self.__rows: list = []
+
+    def write(self, text: str) -> int:
+        """Holds the text."""
+        self.__rows.append(text)
+        return len(text)
+
+    def release(self):
+        """Writes the rows held to the file."""
+        if self.__rows:
+            self.File.write("".join(self.__rows))
+            self.__rows.clear()
+
+
+class NullFile:
+    """A file discarding everything written to it."""
+
+    __slots__ = ()
+
+    def write(self, text: str) -> int:
+        """Discards the text."""
+        return len(text)
+
+    def flush(self):
+        """Nothing to write."""
+
+    def close(self):
+        """Nothing to close."""
+
+
+class DiscardedOutputFiles(OutputFiles):
+    """Output files discarding everything written to them, without touching the disk."""
+
+    __slots__ = ()
+
+    def open(self, filename: str, queued: bool = False):
+        """Returns a file discarding the output."""
+        return NULL_FILE
+
+    def render(self, file, function, values):
+        """Discards the rows, without rendering them."""
+
+
+NULL_FILE = NullFile()
+"""The file shared by the discarded output files."""
@@ -2,6 +2,7 @@
 
 from aenum import IntEnum
 
+from HelperIO import OpenTextFile
 from HelperIO import ReadNextSequenceAsInteger
 
 
@@ -20,7 +21,7 @@ class PrintOutFile:
 
     def __init__(self, filename):
         print("Reading PRTFILE file at: " + filename)
-        file = open(filename, "r")
+        file = OpenTextFile(filename)
         values = ReadNextSequenceAsInteger(file)
 
         self.IPFLAG = PrintOutFlags(values[0])
@@ -36,9 +37,42 @@ class PrintOutFile:
         # TONOTE: The code limits the number of sites for printing daily summaries to 8.
         self.NPRSITE = min(8, values[5])
         """The number of sites for printing daily summaries."""
-        self.PRSITE = []
+        self.PRSITE = set()
         """The sites to print daily results for."""
         for _ in range(self.NPRSITE):
-            self.PRSITE.append(file.readline().strip())
+            self.PRSITE.add(file.readline().strip())
 
         file.close()
+
+    def isSitePrinted(self, config, site: str, soil: int) -> bool:
+        """Returns True when the daily results of the site and soil are printed, in any year."""
+        return self.IPFLAG > 1 and (self.IPSOIL == soil or config.PRINT_ALL_SOILS) and site in self.PRSITE
+
+
+class PrintPlan:
+    """The outputs printed for a crop-year, decided once from the PRTFILE settings before the daily loop.
+    TONOTE: The checks of the Fortran code are kept as they were: the headers are printed from
+    IPFLAG = 1 for the WSITE in PRSITE, the daily rows of the sites printed are printed in every year."""
+
+    __slots__ = ("Summaries", "Headers", "Title", "Daily", "Monthly", "MonthRows", "InputSummary")
+
+    def __init__(self, pout: PrintOutFile, config, WSITE: str, NWSITE: str, SOIL: int, IYEAR: int):
+        soil = pout.IPSOIL == SOIL or config.PRINT_ALL_SOILS
+        year = pout.JPRSTR <= IYEAR <= pout.JPRSTP
+        full = not config.YIELD_ONLY
+        printed = full and pout.isSitePrinted(config, NWSITE, SOIL)
+
+        self.Summaries: bool = full
+        """The monthly and weekly summaries are summed and written to the MON and PRECIP files."""
+        self.Headers: bool = full and pout.IPFLAG > 0 and soil and year and WSITE in pout.PRSITE
+        """The column headers of the OUT and PROFILE files are printed."""
+        self.Title: bool = printed and year
+        """The crop-year title of the OUT file is printed."""
+        self.Daily: bool = printed
+        """The daily rows of the OUT and PROFILE files are printed."""
+        self.Monthly: bool = printed and year
+        """The monthly water balance summaries of the OUT file are printed."""
+        self.MonthRows: bool = full and (config.OUTPUT_FORMAT != 2 or pout.IPFLAG > 1)
+        """The row of the crop-year is written to the MON file."""
+        self.InputSummary: bool = full and pout.IPFLAG > 3
+        """The input summary is printed."""
@@ -0,0 +1,159 @@
+"""Results Database module.
+
+Writes the annual, monthly and weekly results, also written to the YR, MON and PRECIP text files,
+into a SQLite database with a table for each, indexed by (SITE, SOIL, YEAR, CROP), so they can be
+queried without parsing the text files, e.g. the mean ET for corn on soil 621 in 2012:
+
+    SELECT AVG(ETS) FROM ANNUAL WHERE CROP = 8 AND SOIL = 621 AND YEAR = 2012
+
+The results of a (site, soil) chain are kept in a ResultsBatch and inserted at the end of the
+chain, in a single transaction. The database is in WAL mode, so the processes of a parallel run
+insert their chains in turns while the database can be read.
+"""
+
+import sqlite3
+
+TIMEOUT: float = 60.0
+"""Seconds to wait for another process inserting its chain."""
+
+KEY_COLUMNS = ("SITE", "SOIL", "YEAR", "CROP")
+BASIN_COLUMNS = ("SOIL", "YEAR", "CROP")
+"""Second index, for the queries over every site."""
+
+ANNUAL_COLUMNS = KEY_COLUMNS + (
+    "SIMFILE", "CROPNAME", "ITFLAG", "IRRTYP", "JDYPLT", "JFIRST", "JDYEFC", "JDYMAT", "JDYFRZ",
+    "YIELD", "ETS", "ETYLD", "BVALUE", "YLDRATIO", "SGRIRR", "SNIRR", "IRIGNO",
+    "PRECIPS", "EPRECIPS", "DRAINS", "DPLBG", "TOTROF")
+"""Columns of the ANNUAL table, the values written to the YR file."""
+
+MONTHLY_COLUMNS = KEY_COLUMNS + (
+    "ITFLAG", "IRRTYP", "ITERRC", "MONTH",
+    "ET", "ER", "ETR", "IRN", "IRG", "RA", "E", "T", "RON", "ROF", "INF", "DRA", "DPL", "NUMIRR")
+"""Columns of the MONTHLY table, the values of the MonthlyData of every month of the season."""
+
+WEEKLY_COLUMNS = KEY_COLUMNS + (
+    "ITFLAG", "IRRTYP", "ITERRC", "WEEK", "ETR", "ET", "ER", "RA", "IRN", "IRG")
+"""Columns of the WEEKLY table, the values written to the PRECIP file."""
+
+TABLES = {"ANNUAL": ANNUAL_COLUMNS, "MONTHLY": MONTHLY_COLUMNS, "WEEKLY": WEEKLY_COLUMNS}
+
+TEXT_COLUMNS = ("SITE", "SIMFILE", "CROPNAME")
+INTEGER_COLUMNS = ("SOIL", "YEAR", "CROP", "ITFLAG", "IRRTYP", "ITERRC", "MONTH", "WEEK", "JDYPLT", "JFIRST",
+                   "JDYEFC", "JDYMAT", "JDYFRZ", "IRIGNO", "NUMIRR")
+
+
+class ResultsBatch:
+    """The rows of the results of a chain, waiting to be inserted into the database."""
+
+    __slots__ = ("ANNUAL", "MONTHLY", "WEEKLY", "__kept")
+
+    def __init__(self):
+        self.ANNUAL: list = []
+        self.MONTHLY: list = []
+        self.WEEKLY: list = []
+        self.__kept: tuple = (0, 0, 0)
+        """The number of rows of every table for the crop-years completed."""
+
+    def __len__(self):
+        return len(self.ANNUAL) + len(self.MONTHLY) + len(self.WEEKLY)
+
+    def clear(self):
+        """Drops the rows, once inserted."""
+        self.ANNUAL.clear()
+        self.MONTHLY.clear()
+        self.WEEKLY.clear()
+        self.__kept = (0, 0, 0)
+
+    def keep(self):
+        """Keeps the rows added, once the crop-year is completed."""
+        self.__kept = (len(self.ANNUAL), len(self.MONTHLY), len(self.WEEKLY))
+
+    def drop(self):
+        """Drops the rows added since the last crop-year completed, when the crop-year fails."""
+        del self.ANNUAL[self.__kept[0]:]
+        del self.MONTHLY[self.__kept[1]:]
+        del self.WEEKLY[self.__kept[2]:]
+
+    def addYear(self, ctx, crop: int, cropName: str, TOTROF: float):
+        """Adds the row of the crop-year, for the crop written to the YR file."""
+        Sim = ctx.Sim
+        self.ANNUAL.append((
+            ctx.Control.WSITE, ctx.SOIL, ctx.IYEAR, int(crop),
+            ctx.CurrentCrop.SIMFILE, cropName, Sim.ITFLAG, int(Sim.Irrigation.IRRTYP),
+            ctx.JDYPLT, Sim.Irrigation.JFIRST, ctx.JDYEFC, ctx.JDYMAT, ctx.JDYFRZ,
+            ctx.YIELD, ctx.ETS, ctx.ETYLD, ctx.BVALUE, ctx.YLDRATIO, ctx.SGRIRR, ctx.SNIRR, ctx.IRIGNO,
+            ctx.PRECIPS, ctx.EPRECIPS, ctx.DRAINS, ctx.DPLBG, TOTROF))
+
+    def addMonths(self, ctx, crop: int):
+        """Adds the rows of the months of the season, for the crop written to the MON file."""
+        Sim = ctx.Sim
+        key = (ctx.Control.WSITE, ctx.SOIL, ctx.IYEAR, int(crop), Sim.ITFLAG, int(Sim.Irrigation.IRRTYP), Sim.ITERRC)
+        for i in range(Sim.IMBG - 1, Sim.IMEND):
+            MON = ctx.MON[i]
+            self.MONTHLY.append(key + (
+                i + 1, MON.ET, MON.ER, MON.ETR, MON.IRN, MON.IRG, MON.RA, MON.E, MON.T,
+                MON.RON, MON.ROF, MON.INF, MON.DRA, MON.DPL, MON.NUMIRR))
+
+    def addWeeks(self, ctx):
+        """Adds the rows of the 52 weeks of the year, as written to the PRECIP file."""
+        Sim = ctx.Sim
+        key = (ctx.Control.WSITE, ctx.SOIL, ctx.IYEAR, int(Sim.CROP), Sim.ITFLAG, int(Sim.Irrigation.IRRTYP),
+               Sim.ITERRC)
+        for i in range(52):
+            WEEK = ctx.WEEK[i]
+            self.WEEKLY.append(key + (i + 1, WEEK.ETR, WEEK.ET, WEEK.ER, WEEK.RA, WEEK.IRN, WEEK.IRG))
+
+
+class ResultsDatabase:
+    """The SQLite database receiving the results, a connection is opened for every chain inserted."""
+
+    __slots__ = ("Filename",)
+
+    def __init__(self, filename: str):
+        self.Filename: str = filename
+        """The path to the database file, created with its tables if not found."""
+
+    def create(self):
+        """Creates the tables and the indexes, if not there yet, and sets the database in WAL mode."""
+        connection = self.__connect()
+        try:
+            connection.execute("PRAGMA journal_mode=WAL")
+            with connection:
+                for table, columns in TABLES.items():
+                    connection.execute(f"CREATE TABLE IF NOT EXISTS {table} "
+                                       f"({', '.join(f'{name} {getColumnType(name)}' for name in columns)})")
+                    connection.execute(f"CREATE INDEX IF NOT EXISTS {table}_KEY ON {table} "
+                                       f"({', '.join(KEY_COLUMNS)})")
+                    connection.execute(f"CREATE INDEX IF NOT EXISTS {table}_BASIN ON {table} "
+                                       f"({', '.join(BASIN_COLUMNS)})")
+        finally:
+            connection.close()
+
+    def insert(self, batch: ResultsBatch):
+        """Inserts the rows of the batch in a single transaction, then clears it."""
+        if not len(batch):
+            return
+        connection = self.__connect()
+        try:
+            with connection:
+                for table, columns in TABLES.items():
+                    rows = getattr(batch, table)
+                    if rows:
+                        connection.executemany(f"INSERT INTO {table} VALUES ({', '.join('?' * len(columns))})",
+                                               rows)
+        finally:
+            connection.close()
+        batch.clear()
+
+    def __connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.Filename, timeout=TIMEOUT)
+        # In WAL mode, the database is still consistent after a crash without syncing every transaction.
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+
+def getColumnType(name: str) -> str:
+    """Returns the SQLite type of the column."""
+    if name in TEXT_COLUMNS:
+        return "TEXT"
+    return "INTEGER" if name in INTEGER_COLUMNS else "REAL"
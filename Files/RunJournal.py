@@ -0,0 +1,174 @@
+"""Run Journal module.
+
+With JOURNAL set, every crop-year completed is recorded into a journal in the output folder, a JSON
+line holding the state carried to the next crop-year (the in-memory INITFILE data) and the sizes of
+the output files once its output is written. A run stopped by an error can then be resumed with
+--resume <output folder>: the output files are cut back to their sizes at the last checkpoint and
+every (site, soil) chain restarts after its last crop-year completed.
+
+TONOTE: The SQLite rows of a crop-year are inserted before it is recorded, when the process is killed
+in between the rows of that crop-year are inserted twice once resumed.
+"""
+
+import json
+import os
+import shutil
+
+from Data.Crop import CropId
+
+JOURNAL_FILE: str = "journal.jsonl"
+"""The journal filename, in the output folder."""
+
+CHAIN_PREFIX: str = ".chain"
+"""The prefix of the folders written by the chains of a parallel run, see ChainPool."""
+
+
+class Checkpoint:
+    """The state of a (site, soil) chain at the end of a crop-year."""
+
+    __slots__ = ("SITE", "SOIL", "INDEX", "YEAR", "State", "Sizes")
+
+    def __init__(self, site: str, soil: int, index: int, year: int, state: dict, sizes: dict):
+        self.SITE: str = site
+        self.SOIL: int = soil
+        self.INDEX: int = index
+        """The 0-based index of the crop-year in the CROPFILE."""
+        self.YEAR: int = year
+        self.State: dict = state
+        """The initial data of the next crop-year, the last curve number (printed until the next rain),
+        and the last .SIM file and year simulated."""
+        self.Sizes: dict = sizes
+        """The sizes of the output files written by the crop-year, by path relative to the output folder."""
+
+    @classmethod
+    def fromContext(cls, ctx, sizes: dict):
+        """Returns the checkpoint of the crop-year just completed on the context."""
+        data = ctx.InitialData
+        state = {"THETA": [float(theta) for theta in data.THETA], "CROP": int(data.CROP),
+                 "RESIDUE": float(data.RESIDUE), "LIVECROP": bool(data.LIVECROP),
+                 "SNOTMP": float(data.SNOTMP), "SNOH2O": float(data.SNOH2O),
+                 "SOILT": [float(soilt) for soilt in data.SOILT],
+                 "CURVNO": ctx.CURVNO, "LASTSIMF": ctx.LASTSIMF, "LASTYR": ctx.LASTYR}
+        return cls(ctx.Control.WSITE, ctx.SOIL, ctx.CurrentCrop.Index, ctx.IYEAR, state, sizes)
+
+    @classmethod
+    def fromDict(cls, values: dict):
+        """Returns the checkpoint read from a journal line."""
+        return cls(values["SITE"], values["SOIL"], values["INDEX"], values["YEAR"], values["State"],
+                   values["Sizes"])
+
+    def toDict(self) -> dict:
+        """Returns the checkpoint as plain data for the journal."""
+        return {"SITE": self.SITE, "SOIL": self.SOIL, "INDEX": self.INDEX, "YEAR": self.YEAR,
+                "State": self.State, "Sizes": self.Sizes}
+
+    def restore(self, ctx) -> int:
+        """Restores the state of the chain on the context, returns the index of the next crop-year to simulate."""
+        state, data = self.State, ctx.InitialData
+        data.THETA = state["THETA"][:]
+        data.CROP = CropId(state["CROP"])
+        data.RESIDUE = state["RESIDUE"]
+        data.LIVECROP = state["LIVECROP"]
+        data.SNOTMP = state["SNOTMP"]
+        data.SNOH2O = state["SNOH2O"]
+        data.SOILT = state["SOILT"][:]
+        ctx.CURVNO = state["CURVNO"]
+        ctx.LASTSIMF, ctx.LASTYR = state["LASTSIMF"], state["LASTYR"]
+        return self.INDEX + 1
+
+
+class ChainCheckpoints:
+    """The checkpoints of a chain simulated into its own folder, recorded by the parent process
+    into the run journal once the folder is merged."""
+
+    __slots__ = ("Checkpoints",)
+
+    def __init__(self):
+        self.Checkpoints: list = []
+
+    def record(self, ctx):
+        """Records the crop-year just completed on the context."""
+        self.Checkpoints.append(Checkpoint.fromContext(ctx, ctx.OutputFiles.sizes(ctx.Config.OUTDIR)))
+
+
+class RunJournal:
+    """The journal of the crop-years completed by a run, appended to as they are completed."""
+
+    __slots__ = ("Filename", "Checkpoints", "Sizes", "__file")
+
+    def __init__(self, filename: str):
+        self.Filename: str = filename
+        self.Checkpoints: dict = {}
+        """The last checkpoint of every chain, by (site, soil)."""
+        self.Sizes: dict = {}
+        """The size of every output file at its last checkpoint."""
+        self.__file = None
+
+    def get(self, site: str, soil: int) -> Checkpoint:
+        """Returns the last checkpoint of the chain, None if none of its crop-years was completed."""
+        return self.Checkpoints.get((site, soil))
+
+    def record(self, ctx):
+        """Records the crop-year just completed on the context, once its output is written."""
+        self.append(Checkpoint.fromContext(ctx, ctx.OutputFiles.sizes(ctx.Config.OUTDIR)))
+
+    def merge(self, checkpoints: list, offsets: dict):
+        """Records the checkpoints of a chain merged into the output folder,
+        its files appended to the output files of the specified sizes."""
+        for checkpoint in checkpoints:
+            checkpoint.Sizes = {path: offsets.get(path, 0) + size for path, size in checkpoint.Sizes.items()}
+            self.append(checkpoint)
+
+    def append(self, checkpoint: Checkpoint):
+        """Writes the checkpoint to the journal."""
+        if self.__file is None:
+            self.__file = open(self.Filename, "at")
+        self.__file.write(json.dumps(checkpoint.toDict()) + "\n")
+        # Written before the next crop-year starts, so it's there if the process dies.
+        self.__file.flush()
+        self.__add(checkpoint)
+
+    def close(self):
+        """Closes the journal file."""
+        if self.__file is not None:
+            self.__file.close()
+            self.__file = None
+
+    def resume(self, keep: tuple = ()):
+        """Reads the journal of the run and cuts the output folder back to its last checkpoint:
+        the output files are truncated to their recorded sizes, the ones never recorded and the
+        folders of the unmerged chains are removed. The files starting with the paths to keep are left as they are."""
+        if os.path.isfile(self.Filename):
+            size = 0
+            with open(self.Filename, "rb") as file:
+                for line in file:
+                    # The last line may be incomplete if the process died while writing it.
+                    try:
+                        self.__add(Checkpoint.fromDict(json.loads(line)))
+                    except ValueError:
+                        break
+                    size += len(line)
+            os.truncate(self.Filename, size)
+
+        outDir = os.path.dirname(self.Filename)
+        keep = tuple(os.path.normpath(path) for path in keep if path) + (JOURNAL_FILE,)
+        for root, folders, files in os.walk(outDir):
+            for folder in [folder for folder in folders if folder.startswith(CHAIN_PREFIX)]:
+                shutil.rmtree(os.path.join(root, folder))
+                folders.remove(folder)
+            for name in files:
+                filename = os.path.join(root, name)
+                path = os.path.relpath(filename, outDir)
+                if path.startswith(keep):
+                    continue
+                size = self.Sizes.get(path)
+                if size is None:
+                    os.remove(filename)
+                elif os.path.getsize(filename) > size:
+                    os.truncate(filename, size)
+
+        print(f"{len(self.Checkpoints)} chains resumed from the journal at: {self.Filename}")
+
+    def __add(self, checkpoint: Checkpoint):
+        self.Checkpoints[(checkpoint.SITE, checkpoint.SOIL)] = checkpoint
+        self.Sizes.update(checkpoint.Sizes)
@@ -2,6 +2,7 @@
 
 import copy
 
+from HelperIO import OpenTextFile
 from HelperIO import ReadNextFloat
 from HelperIO import ReadNextInteger
 from HelperIO import ReadIntegersInLine
@@ -23,8 +24,8 @@ class SimFile:
         "NCUT", "NTILLS", "PRUNOF", "RZMAX", "RZMGMT", "RZMIN", "TBREAK", "TINTRV", "TillageOperations", "YCOEFF",
         "YMAX", "_ITFLAG", "_RZMAX", "_RZMGMT", "_TILL")
 
-    # TODO: Find the values in the .SIM files that are modified during the simulation:
-    # IMPLT, IDPLT, TillageOperations[i].TILDAY
+    # TONOTE: The values in the .SIM files modified during the simulation are:
+    # IMPLT, IDPLT, ITFLAG, TillageOperations[i].TILDAY and Irrigation.JFIRST, see clone()
 
     def __init__(self, filename: str = None):
         self.JDFREQ = 0
@@ -36,7 +37,7 @@ class SimFile:
             return
 
         print("Reading SIMFILE file at: " + filename)
-        file = open(filename, "r")
+        file = OpenTextFile(filename)
 
         # See line 821 in Fortran code
         # Read The Setup Values From The SIM Files
@@ -108,7 +109,7 @@ class SimFile:
         for _ in range(self.NTILLS):
             itemp = ReadIntegersInLine(file)
             self.TillageOperations.append(TillageOperation(itemp[0], itemp[1], itemp[2]))
-        self._TILL = copy.deepcopy(self.TillageOperations)
+        self._TILL = [copy.copy(till) for till in self.TillageOperations]
 
         # Read irrigation data
         self.Irrigation = IrrigationData(file)
@@ -141,10 +142,19 @@ class SimFile:
 
         file.close()
 
+    def clone(self):
+        """Returns a copy to be simulated, leaving this one as read from the file.
+        Only the objects modified during the simulation are copied, the rest is shared."""
+        file = copy.copy(self)
+        # IMPLT, IDPLT and ITFLAG are immutable values, only re-assigned on the copy.
+        file.Irrigation = copy.copy(self.Irrigation)
+        file.TillageOperations = [copy.copy(till) for till in self.TillageOperations]
+        return file
+
     def restore(self):
         """Restores the overwritten values as they were read from the file."""
         # TODO: Check restoring.
         self.RZMAX = self._RZMAX
         self.RZMGMT = self._RZMGMT
         self.ITFLAG = self._ITFLAG
-        self.TillageOperations = copy.deepcopy(self._TILL)
+        self.TillageOperations = [copy.copy(till) for till in self._TILL]
@@ -1,5 +1,6 @@
 """Tillage file module"""
 
+from HelperIO import OpenTextFile
 from HelperIO import ReadNextNumberSequence
 from Data.Tillage import Tillage
 
@@ -11,7 +12,7 @@ class TillageFile:
 
     def __init__(self, filename):
         print("Reading TILLAGE file at: " + filename)
-        file = open(filename, "rt+")
+        file = OpenTextFile(filename)
 
         data = []
         sof = file.tell()
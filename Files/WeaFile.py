@@ -1,10 +1,9 @@
 """WEA File module."""
 
-from io import TextIOWrapper
-
+from HelperIO import OpenTextFile, TextBuffer
 from HelperIO import ReadNextWord
 from HelperIO import ReadNextInteger
-from HelperIO import  ReadNextFloat
+from HelperIO import ReadNextFloat
 
 from Data.WeatherStation import WeatherStation
 from Data.WeatherDailyData import WeatherDailyData
@@ -12,13 +11,14 @@ from Data.WeatherDailyData import WeatherDailyData
 
 class WeaFile:
     """Class for reading a .WEA file."""
-    __file: TextIOWrapper = None
+    __file: TextBuffer = None
+    __lines = None
 
     StationData: WeatherStation = None
 
     def __init__(self, filename):
         print("Reading WEA file at: " + filename)
-        file = open(filename, "rt+")
+        file = OpenTextFile(filename)
         self.__file = file
 
         # Read Weather Station data.
@@ -38,10 +38,12 @@ class WeaFile:
         self.StationData = WeatherStation(location, IMSTR, IDSTR, NDAYS, LAT, LONG, ELEV)
 
         file.readline()
+        # The daily data lines are split at once.
+        self.__lines = iter(file.readlines())
 
     def ReadNextDayData(self):
         """Reads the next weather daily data in the file"""
-        values = self.__file.readline().strip().split(",")
+        values = next(self.__lines, "").strip().split(",")
         return WeatherDailyData(
             int(values[0].strip()),
             float(values[1].strip()),
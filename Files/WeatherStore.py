@@ -0,0 +1,184 @@
+"""Weather Store module.
+
+The weather store is a single binary file holding every .WEA file of a WEA_DIR, written by the
+weather-compile command and memory-mapped by the simulation, so the weather is read without
+parsing thousands of small text files.
+
+Layout (little-endian):
+    HEADER   magic (8 bytes), version (uint32), number of site-years (uint32)
+    INDEX    one INDEX_DTYPE record per site-year, sorted by site and year
+    DATA     float32 columns (DOY, TMAX, TMIN, PRECIP, EVAP, ETR) of NDAYS values for every site-year
+
+TONOTE: The .WEA values are decimal numbers stored as float32, the index keeps the number of
+decimals of every column so the reader restores the exact float64 values parsed from the text file.
+"""
+
+import os
+
+import numpy as np
+
+from Data.WeatherStation import WeatherStation
+from Data.WeatherDailyData import WeatherDailyData
+from Files.WeaFile import WeaFile
+
+MAGIC = b"CSWSTORE"
+VERSION = 1
+
+COLUMNS = ("DOY", "TMAX", "TMIN", "PRECIP", "EVAP", "ETR")
+"""The daily columns stored for every site-year, in order."""
+
+MAX_DECIMALS = 6
+"""Beyond this number of decimals a float32 no longer holds the exact value."""
+
+HEADER_DTYPE = np.dtype([("MAGIC", "S8"), ("VERSION", "<u4"), ("COUNT", "<u4")])
+
+INDEX_DTYPE = np.dtype([
+    ("SITE", "S16"), ("YEAR", "<i4"), ("LOCATE", "S80"),
+    ("IMSTR", "<i4"), ("IDSTR", "<i4"), ("NDAYS", "<i4"),
+    ("LAT", "<f8"), ("LONG", "<f8"), ("ELEV", "<f8"),
+    ("DECIMALS", "i1", (len(COLUMNS),)),
+    ("OFFSET", "<i8")])
+"""Index record, OFFSET is the position (in float32 values) of the site-year columns in DATA."""
+
+
+class WeatherStore:
+    """Memory-mapped reader for a weather store file."""
+
+    __slots__ = ("Filename", "__index", "__data", "__entries")
+
+    def __init__(self, filename: str):
+        print("Opening weather store at: " + filename)
+        self.Filename = filename
+
+        header = np.fromfile(filename, dtype=HEADER_DTYPE, count=1)
+        if len(header) != 1 or header["MAGIC"][0] != MAGIC or header["VERSION"][0] != VERSION:
+            raise ValueError(f"Invalid weather store file: {filename}")
+
+        count = int(header["COUNT"][0])
+        self.__index = np.memmap(filename, dtype=INDEX_DTYPE, mode="r",
+                                 offset=HEADER_DTYPE.itemsize, shape=(count,))
+        self.__data = np.memmap(filename, dtype="<f4", mode="r", offset=getDataOffset(count)) \
+            if count > 0 else np.zeros(0, dtype="<f4")
+
+        self.__entries = {(site.decode(), int(year)): i for i, (site, year) in
+                          enumerate(zip(self.__index["SITE"], self.__index["YEAR"]))}
+
+    def __contains__(self, key: tuple):
+        return key in self.__entries
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def getStation(self, site: str, year: int) -> WeatherStation:
+        """Returns the weather station data for the site and year."""
+        entry = self.__index[self.__entries[(site, year)]]
+        return WeatherStation(entry["LOCATE"].decode(), int(entry["IMSTR"]), int(entry["IDSTR"]),
+                              int(entry["NDAYS"]), float(entry["LAT"]), float(entry["LONG"]),
+                              float(entry["ELEV"]))
+
+    def getColumns(self, site: str, year: int) -> np.ndarray:
+        """Returns a read-only (columns, NDAYS) float32 view over the site-year data, without copying it."""
+        entry = self.__index[self.__entries[(site, year)]]
+        offset, ndays = int(entry["OFFSET"]), int(entry["NDAYS"])
+        return self.__data[offset:offset + len(COLUMNS) * ndays].reshape(len(COLUMNS), ndays)
+
+    def getValues(self, site: str, year: int, columns: tuple = COLUMNS) -> np.ndarray:
+        """Returns the site-year columns specified as float64, equal to the values parsed from the .WEA file.
+        Only those columns are converted, from the float32 views over the store (see getColumns)."""
+        decimals = self.__index[self.__entries[(site, year)]]["DECIMALS"]
+        stored = self.getColumns(site, year)
+        values = np.empty((len(columns), stored.shape[1]), dtype=np.float64)
+        for row, name in enumerate(columns):
+            column = COLUMNS.index(name)
+            values[row] = stored[column]
+            if decimals[column] >= 0:
+                np.round(values[row], decimals[column], out=values[row])
+        return values
+
+    def open(self, site: str, year: int):
+        """Returns a reader for the site-year with the same interface as a WeaFile."""
+        return WeatherStoreReader(self.getStation(site, year), self.getValues(site, year))
+
+
+class WeatherStoreReader:
+    """Reads the daily data of a site-year from a weather store, like a WeaFile does."""
+
+    __slots__ = ("StationData", "__days")
+
+    def __init__(self, station: WeatherStation, values: np.ndarray):
+        self.StationData = station
+        self.__days = iter([WeatherDailyData(int(day[0]), *day[1:]) for day in zip(*values.tolist())])
+
+    def ReadNextDayData(self):
+        """Reads the next weather daily data."""
+        return next(self.__days)
+
+    def close(self):
+        """Nothing to close, the store stays mapped."""
+
+
+def compileWeatherStore(weaDir: str, filename: str) -> int:
+    """Writes every .WEA file found in the folder into a weather store file.
+    Returns the number of site-years written."""
+    names = sorted(name for name in os.listdir(weaDir)
+                   if name.endswith(".WEA") and name[-8:-4].isdigit() and len(name) > 8)
+
+    index = np.zeros(len(names), dtype=INDEX_DTYPE)
+    columns = []
+    offset = 0
+    for i, name in enumerate(names):
+        wea = WeaFile(os.path.join(weaDir, name))
+        station = wea.StationData
+        days = [wea.ReadNextDayData() for _ in range(station.NDAYS)]
+        wea.close()
+
+        locate = station.LOCATE.encode()
+        if len(locate) > INDEX_DTYPE["LOCATE"].itemsize:
+            raise ValueError(f"Station name too long on {name}: {station.LOCATE}")
+
+        values = np.array([[getattr(day, column) for day in days] for column in COLUMNS],
+                          dtype=np.float64).reshape(len(COLUMNS), station.NDAYS)
+        stored = values.astype(np.float32)
+
+        entry = index[i]
+        entry["SITE"] = name[:-8].encode()
+        entry["YEAR"] = int(name[-8:-4])
+        entry["LOCATE"] = locate
+        entry["IMSTR"], entry["IDSTR"], entry["NDAYS"] = station.IMSTR, station.IDSTR, station.NDAYS
+        entry["LAT"], entry["LONG"], entry["ELEV"] = station.LAT, station.LONG, station.ELEV
+        entry["DECIMALS"] = [__findDecimals(stored[c], values[c]) for c in range(len(COLUMNS))]
+        entry["OFFSET"] = offset
+
+        columns.append(stored)
+        offset += stored.size
+
+    header = np.array([(MAGIC, VERSION, len(names))], dtype=HEADER_DTYPE)
+    padding = getDataOffset(len(names)) - HEADER_DTYPE.itemsize - index.nbytes
+
+    # Written aside and renamed, so a running simulation never maps a partial file.
+    tempName = filename + ".tmp"
+    with open(tempName, "wb") as file:
+        file.write(header.tobytes())
+        file.write(index.tobytes())
+        file.write(b"\0" * padding)
+        for stored in columns:
+            file.write(stored.astype("<f4").tobytes())
+    os.replace(tempName, filename)
+
+    return len(names)
+
+
+def getDataOffset(count: int) -> int:
+    """Returns the byte offset of the DATA section, aligned to 8 bytes."""
+    size = HEADER_DTYPE.itemsize + count * INDEX_DTYPE.itemsize
+    return (size + 7) // 8 * 8
+
+
+def __findDecimals(stored: np.ndarray, values: np.ndarray) -> int:
+    """Returns the number of decimals restoring the values from the float32 ones, or -1 when lossy."""
+    restored = stored.astype(np.float64)
+    for digits in range(MAX_DECIMALS + 1):
+        if np.array_equal(np.round(restored, digits), values):
+            return digits
+    print(f"Warning: values with more than {MAX_DECIMALS} decimals are stored with float32 precision.")
+    return -1
@@ -1,11 +1,119 @@
-"""Helper methods for file I/O"""
+"""Helper methods for file I/O
 
-import io
+The readers accept any text file object, reading it one character at a time, or a TextBuffer
+(see OpenTextFile) holding the whole file, which is scanned with regular expressions instead.
+Both behave the same, up to the end of the file. A TextBuffer is faster on the long numeric lines of
+BLOCK.DAT (about 1.4x), on the short .SIM files the readers are on par, see HelperIOBenchmark.
+"""
+
+import re
 from hashlib import md5
 
+LETTER = re.compile(r"[^\W\d_]")
+"""Matches an alphabetic character, the start of the label ending the sequences in the input files."""
+DIGITS = re.compile(r"[\d.]+")
+"""Matches the characters read by ReadFloats."""
+
+__patterns = {}
+"""The compiled (word, number, delimiter) patterns, by delimiters."""
+
+
+class TextBuffer:
+    """A text file read at once, with the file methods used by the input file readers."""
+
+    __slots__ = ("Text", "Pos")
+
+    def __init__(self, text: str):
+        self.Text = text
+        """The whole file contents, with the new lines translated as in text mode."""
+        self.Pos = 0
+        """The current reading position."""
+
+    def read(self, size: int = -1) -> str:
+        """Reads the specified number of characters, or the rest of the text."""
+        end = len(self.Text) if size < 0 else min(len(self.Text), self.Pos + size)
+        text = self.Text[self.Pos:end]
+        self.Pos = end
+        return text
+
+    def readline(self, size: int = -1) -> str:
+        """Reads up to the next new line, included, or up to the number of characters specified."""
+        end = self.Text.find("\n", self.Pos)
+        end = len(self.Text) if end < 0 else end + 1
+        if size >= 0:
+            end = min(end, self.Pos + size)
+        line = self.Text[self.Pos:end]
+        self.Pos = end
+        return line
+
+    def readlines(self) -> list:
+        """Reads the remaining lines, each one ending with its new line."""
+        lines = self.read().split("\n")
+        last = lines.pop()
+        lines = [line + "\n" for line in lines]
+        if last:
+            lines.append(last)
+        return lines
+
+    def tell(self) -> int:
+        """Returns the current position."""
+        return self.Pos
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        """Moves to the position specified relative to the start, current position or end."""
+        base = (0, self.Pos, len(self.Text))[whence]
+        self.Pos = min(max(0, base + offset), len(self.Text))
+        return self.Pos
+
+    def close(self):
+        """The file was already closed after reading it."""
+
+
+def OpenTextFile(filename: str) -> TextBuffer:
+    """Reads the whole text file into a TextBuffer."""
+    with open(filename, "r") as file:
+        return TextBuffer(file.read())
+
+
+def __compilePatterns(delimiters) -> tuple:
+    """Compiles the word, number and delimiter patterns for the delimiters."""
+    chars = "".join(re.escape(d) for d in delimiters)
+    patterns = (
+        # A word is anything but a delimiter.
+        re.compile(f"[^{chars}]+"),
+        # A number is anything but a delimiter or a letter.
+        re.compile(f"(?:(?![^\\W\\d_])[^{chars}])+"),
+        re.compile(f"[{chars}]"))
+    __patterns[delimiters] = patterns
+    return patterns
+
+
+def __readTokens(file: TextBuffer, delimiters) -> tuple:
+    """Reads the delimited tokens up to the next letter, which is consumed.
+    Returns the tokens and the letter, None at the end of the file.
+    The characters following the last delimiter are discarded, as the character readers do."""
+    text, pos = file.Text, file.Pos
+    match = LETTER.search(text, pos)
+    end = match.start() if match else len(text)
+    pieces = (__patterns.get(delimiters) or __compilePatterns(delimiters))[2].split(text[pos:end])
+    file.Pos = end + 1 if match else end
+    return [piece for piece in pieces[:-1] if piece], match.group() if match else None
+
 
 def ReadNextWord(file, skipLines=0, delimiters=(" ", "\r", "\n")) -> str:
     """Reads the file until the next white-space and returns the read string."""
+    if isinstance(file, TextBuffer):
+        text = file.Text
+        match = (__patterns.get(delimiters) or __compilePatterns(delimiters))[0].search(text, file.Pos)
+        if match is None or match.end() == len(text):
+            # EOF End Of File
+            file.Pos = len(text)
+            return match.group() if match else ""
+        file.Pos = match.end() + 1
+        if skipLines > 0:
+            SkipLines(file, skipLines)
+        return match.group()
+
     buffer: str = ""
     while True:
         c = file.read(1)
@@ -23,6 +131,14 @@ def ReadNextWord(file, skipLines=0, delimiters=(" ", "\r", "\n")) -> str:
 
 def ReadNextNumberSequence(file, includeText=False):
     """Reads the file until the next letter and returns and array of strings."""
+    if isinstance(file, TextBuffer):
+        ret, letter = __readTokens(file, (" ", "\r", "\n"))
+        if letter:
+            text = letter + file.readline().strip()
+            if includeText:
+                ret.append(text)
+        return ret
+
     ret = []
     buffer = ""
     while True:
@@ -46,6 +162,12 @@ def ReadNextNumberSequence(file, includeText=False):
 
 def ReadNextSequenceAsInteger(file, delimiters=(" ", "\r", "\n", "\t")):
     """Reads the file until the next letter and returns and array of integers."""
+    if isinstance(file, TextBuffer):
+        tokens, letter = __readTokens(file, delimiters)
+        if letter:
+            file.readline()
+        return list(map(int, tokens))
+
     ret = []
     buffer = ""
     while True:
@@ -67,6 +189,23 @@ def ReadNextSequenceAsInteger(file, delimiters=(" ", "\r", "\n", "\t")):
 
 def ReadFloats(file, count):
     """Reads the specified amount of floats from the file and returns and array."""
+    if isinstance(file, TextBuffer):
+        ret = []
+        if count <= 0:
+            return ret
+        text = file.Text
+        for match in DIGITS.finditer(text, file.Pos):
+            if match.end() == len(text):
+                break
+            ret.append(float(match.group()))
+            if len(ret) == count:
+                # The character ending the number is consumed too.
+                file.Pos = match.end() + 1
+                return ret
+        # EOF End Of File
+        file.Pos = len(text)
+        return ret
+
     ret = []
     buffer = ""
     while len(ret) < count:
@@ -85,6 +224,12 @@ def ReadFloats(file, count):
 
 def ReadNextSequenceAsFloats(file):
     """Reads the file until the next letter and returns and array of floats."""
+    if isinstance(file, TextBuffer):
+        tokens, letter = __readTokens(file, (" ", "\r", "\n"))
+        if letter:
+            file.readline()
+        return list(map(float, tokens))
+
     ret = []
     buffer = ""
     while True:
@@ -106,7 +251,7 @@ def ReadNextSequenceAsFloats(file):
 
 def ReadIntegersInLine(file):
     """Reads the integers found in the next file line."""
-    return ReadNextSequenceAsInteger(io.StringIO(file.readline()))
+    return ReadNextSequenceAsInteger(TextBuffer(file.readline()))
 
 
 def ReadWholeFile(file):
@@ -128,8 +273,24 @@ def ReadNextFloat(file, skipLines=0) -> float:
 
 
 def ReadNextInteger(file, skipLines=0, delimiters=(" ", "\r", "\n")) -> int:
-    """Reads the file until the next invalid char and returns an integer."""
+    """Reads the file until the next invalid char and returns an integer, None at the end of the file."""
     # return int(ReadNextWord(file, skipLines, delimiters))
+    if isinstance(file, TextBuffer):
+        text = file.Text
+        patterns = __patterns.get(delimiters) or __compilePatterns(delimiters)
+        match = patterns[0].search(text, file.Pos)
+        # The next word is the integer, unless it holds a letter, read as a delimiter (a rare case).
+        if match is None or LETTER.search(match.group()):
+            match = patterns[1].search(text, file.Pos)
+        if match is None:
+            # EOF End Of File
+            file.Pos = len(text)
+            return None
+        file.Pos = min(match.end() + 1, len(text))
+        if skipLines > 0:
+            SkipLines(file, skipLines)
+        return int(match.group())
+
     buffer = ""
     while True:
         c = file.read(1)
@@ -138,6 +299,9 @@ def ReadNextInteger(file, skipLines=0, delimiters=(" ", "\r", "\n")) -> int:
                 if skipLines > 0:
                     SkipLines(file, skipLines)
                 return int(buffer)
+            if not c:
+                # EOF End Of File
+                return None
         else:
             buffer += c
 
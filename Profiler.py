@@ -0,0 +1,182 @@
+"""Subroutine Profiler module.
+
+With PROFILE set, the main subroutines are wrapped at the start of the run to record their wall
+time and number of calls, by weather site and crop type. When not set nothing is wrapped, so the
+simulation runs the subroutines as they are.
+
+Every subroutine gets its total time, including the subroutines it calls, and its self time,
+excluding them. At the end of the run the numbers are written to profile.json and, sorted by self
+time, to profile.txt in the output folder.
+
+TONOTE: In lockstep (see DEPLT_BATCH) the layer subroutines run once a day for every soil of the
+site, a call is counted for the whole batch.
+"""
+
+import json
+import os
+from time import perf_counter
+
+from SimulationContext import SimulationContext
+from Subroutines import CROPSIM, READWEAT, DEPLT, DEPLT_BATCH
+from Data.Crop import CropId
+
+PROFILE_FILE: str = "profile.json"
+"""The profile filename, in the output folder."""
+PROFILE_TABLE_FILE: str = "profile.txt"
+"""The profile table filename, in the output folder."""
+
+SUBROUTINES = (
+    (CROPSIM, "READWEAT", "READWEAT"),
+    (CROPSIM, "DEPLT", "DEPLT"),
+    (CROPSIM, "DEPLT_BATCH", "DEPLT"),
+    (CROPSIM, "PrintInputSummary", "PrintInputSummary"),
+    (READWEAT, "ComputeSeasonCoefficients", "CROPCO"),
+    (DEPLT, "ROOTZN", "ROOTZN"),
+    (DEPLT, "EFPRECIP", "EFPRECIP"),
+    (DEPLT, "SNOWMELT", "SNOWMELT"),
+    (DEPLT, "IRRIGA", "IRRIGA"),
+    (DEPLT, "SOILTEMP", "SOILTEMP"),
+    (DEPLT, "EVAP", "EVAP"),
+    (DEPLT, "NTHET", "NTHET"),
+    (DEPLT, "PerformUptake", "UPTAKE"),
+    (DEPLT, "PrintHeaders", "PrintHeaders"),
+    (DEPLT, "PrintSummary", "PrintSummary"),
+    (DEPLT, "PrintDailyReport", "PrintDailyReport"),
+    (DEPLT, "PrintMonthlySummary", "PrintMonthlySummary"),
+    (DEPLT, "PrintWeeklySummary", "PrintWeeklySummary"),
+    (DEPLT_BATCH, "PrintHeaders", "PrintHeaders"),
+    (DEPLT_BATCH, "PrintSummary", "PrintSummary"),
+    (DEPLT_BATCH, "PrintDailyReport", "PrintDailyReport"),
+    (DEPLT_BATCH, "PrintMonthlySummary", "PrintMonthlySummary"),
+    (DEPLT_BATCH, "PrintWeeklySummary", "PrintWeeklySummary"),
+    (DEPLT_BATCH.SoilBatch, "ROOTZN", "ROOTZN"),
+    (DEPLT_BATCH.SoilBatch, "NTHET", "NTHET"),
+    (DEPLT_BATCH.SoilBatch, "SOILTEMP", "SOILTEMP"),
+    (DEPLT_BATCH.SoilBatch, "PerformUptake", "UPTAKE"),
+    (SimulationContext, "writeYearRow", "writeYearRow"),
+)
+"""The (module or class, attribute, reported name) of every subroutine timed.
+Their first argument is the simulation context, or the SoilBatch of the soils simulated in lockstep."""
+
+
+class SubroutineProfiler:
+    """The wall time and calls of the subroutines, by (name, weather site, crop type)."""
+
+    __slots__ = ("Stats", "__stack", "__originals")
+
+    def __init__(self):
+        self.Stats: dict = {}
+        """The [calls, total time, self time] by (name, site, crop)."""
+        self.__stack: list = []
+        self.__originals: list = []
+
+    def install(self):
+        """Wraps the subroutines to time them, until uninstalled."""
+        if self.__originals:
+            return
+        for owner, attribute, name in SUBROUTINES:
+            function = getattr(owner, attribute)
+            self.__originals.append((owner, attribute, function))
+            setattr(owner, attribute, self.__wrap(function, name))
+
+    def uninstall(self):
+        """Puts the subroutines back as they were."""
+        for owner, attribute, function in reversed(self.__originals):
+            setattr(owner, attribute, function)
+        self.__originals.clear()
+
+    def pop(self) -> dict:
+        """Returns the numbers recorded so far, then clears them."""
+        stats, self.Stats = self.Stats, {}
+        return stats
+
+    def merge(self, stats: dict):
+        """Adds the numbers recorded on a worker process."""
+        for key, (calls, total, own) in stats.items():
+            entry = self.Stats.get(key)
+            if entry is None:
+                self.Stats[key] = [calls, total, own]
+            else:
+                entry[0] += calls
+                entry[1] += total
+                entry[2] += own
+
+    def write(self, folder: str):
+        """Writes the numbers aggregated by subroutine, by site and by crop type into the output folder."""
+        subroutines, sites, crops = {}, {}, {}
+        for (name, site, crop), entry in self.Stats.items():
+            addStats(subroutines, name, entry)
+            addStats(sites.setdefault(site, {}), name, entry)
+            addStats(crops.setdefault(getCropName(crop), {}), name, entry)
+
+        profile = {"subroutines": subroutines, "sites": sites, "crops": crops}
+        with open(os.path.join(folder, PROFILE_FILE), "wt") as file:
+            json.dump({group: statsToDict(values) for group, values in profile.items()}, file, indent=1)
+
+        with open(os.path.join(folder, PROFILE_TABLE_FILE), "wt") as file:
+            file.write(formatTable("SUBROUTINE", {"": subroutines}))
+            file.write(formatTable("CROP", crops))
+            file.write(formatTable("SITE", sites))
+        print(f"Subroutine profile written to: {os.path.join(folder, PROFILE_TABLE_FILE)}")
+
+    def __wrap(self, function, name: str):
+        stack, stats = self.__stack, self
+
+        def timed(*args):
+            ctx = args[0]
+            if type(ctx) is DEPLT_BATCH.SoilBatch: ctx = ctx.Contexts[0]
+            start = perf_counter()
+            stack.append(0.0)
+            try:
+                return function(*args)
+            finally:
+                elapsed = perf_counter() - start
+                children = stack.pop()
+                if stack: stack[-1] += elapsed
+                key = (name, ctx.Control.WSITE, int(ctx.Sim.CROP))
+                entry = stats.Stats.get(key)
+                if entry is None:
+                    entry = stats.Stats[key] = [0, 0.0, 0.0]
+                entry[0] += 1
+                entry[1] += elapsed
+                entry[2] += elapsed - children
+
+        timed.__wrapped__ = function
+        return timed
+
+
+def getCropName(crop: int) -> str:
+    """Returns the name of the crop type, as written to the YR file."""
+    try:
+        return CropId(crop).getName().strip()
+    except (ValueError, IndexError):
+        return str(crop)
+
+
+def addStats(values: dict, name: str, entry: list):
+    """Adds the [calls, total time, self time] entry to the numbers of the subroutine."""
+    total = values.setdefault(name, [0, 0.0, 0.0])
+    for i in range(3):
+        total[i] += entry[i]
+
+
+def statsToDict(values: dict) -> dict:
+    """Returns the numbers by subroutine, or by group and subroutine, as plain data for the JSON file."""
+    if values and isinstance(next(iter(values.values())), dict):
+        return {group: statsToDict(entries) for group, entries in values.items()}
+    return {name: {"calls": calls, "total": total, "self": own} for name, (calls, total, own) in values.items()}
+
+
+def formatTable(title: str, groups: dict) -> str:
+    """Returns the table of the numbers by group and subroutine, sorted by self time."""
+    rows = [(group, name, *entry) for group, values in groups.items() for name, entry in values.items()]
+    rows.sort(key=lambda row: row[4], reverse=True)
+    runTime = sum(row[4] for row in rows) or 1.0
+
+    label = "SUBROUTINE" if title == "SUBROUTINE" else f"{title:<12}SUBROUTINE"
+    lines = [f"{label:<32}{'CALLS':>12}{'TOTAL S':>12}{'SELF S':>12}{'SELF %':>8}{'US/CALL':>10}"]
+    for group, name, calls, total, own in rows:
+        label = name if title == "SUBROUTINE" else f"{group:<12}{name}"
+        lines.append(f"{label:<32}{calls:>12}{total:>12.3f}{own:>12.3f}{own / runTime * 100.0:>8.1f}"
+                     f"{total / calls * 1e6:>10.1f}")
+    return "\n".join(lines) + "\n\n"
@@ -1,57 +1,114 @@
 """Program Entry Point"""
 
+import os
 import sys
 import SIM
 from Configuration import Configuration
 from Subroutines import CROPSIM
+from ChainPool import getChains, getSites, runChains, runSites
 from Errors.CustomError import CropSimError
+from Files.WeatherStore import compileWeatherStore
+from Files.RunJournal import RunJournal, JOURNAL_FILE
+from Profiler import SubroutineProfiler
 
-SIM.Config = Configuration()
-
-print("Starting simulation.")
-
-# From Label 6 to 950, lines 683~1433 in the Fortran Program code.
-for sim in SIM.Simulations:
-    # This print emulates the original console output.
-    print(sim)
-    site = CROPSIM.initSimulation(sim)
-
-    # Here starts the loop from label 15 to 900.
-    # soilIndex = 0
-    for soilIndex in range(len(SIM.SoilProps)):  # @ 738 DO 850 ISOIL = 1,28 / 850 CONTINUE
-        if site.SOILSIM[soilIndex] == 1:
-            # Go on with the simulation if specified on CROPFILE
-            try:
-                CROPSIM.initSoilSimulation(SIM.SoilProps[soilIndex].ISCODE, soilIndex)
-
-                # @ 749, DO 800 II=1,NORUNS
-                # Begins Sim loop for 1 to total years for this site.
-                # crop: Crop = None
-                II: int = 0
-                print(f"NORUNS: {len(SIM.Crops)}")
-                for crop in SIM.Crops:
-                    assert crop.Index == II
-                    II += 1
-                    if crop.YR < SIM.Control.YEAR1:
-                        break
-
-                    print(f"#{II} YEAR:{crop.YR}")
-
-                    CROPSIM.initCropSimulation(crop)
-                    CROPSIM.performSimulation()
-
-                    # TODO: Remove this break in production, just for testing a single year run
-                    # if SIM.Config.SINGLE_RUN: break
-            except CropSimError as err:
-                print(err)
-                sys.exit()
-
-            # TODO: Remove this break in production, just for testing a single year run
-            # if SIM.Config.SINGLE_RUN: break
-        # else:
-        #     break
-        # soilIndex += 1
-
-    # if SIM.Config.SINGLE_RUN: break
-
-print("CropSim terminated successfully.")
+
+def main():
+    """Runs the simulations specified by the configuration."""
+    if len(sys.argv) > 1 and sys.argv[1] == "weather-compile":
+        del sys.argv[1]
+        weatherCompile()
+        return
+
+    SIM.Config = Configuration()
+
+    if SIM.Config.JOURNAL:
+        SIM.Journal = RunJournal(os.path.join(SIM.Config.OUTDIR, JOURNAL_FILE))
+        if SIM.Config.RESUME_DIR:
+            SIM.Journal.resume((SIM.Config.SQLITE_FILE,))
+
+    if SIM.Config.PROFILE:
+        SIM.Profile = SubroutineProfiler()
+        SIM.Profile.install()
+
+    print("Starting simulation.")
+
+    try:
+        simulate()
+    except CropSimError as err:
+        print(err)
+        sys.exit(1)
+    finally:
+        # The writer thread and the renderer process of the daily report are stopped, even when aborted.
+        SIM.OutputFiles.shutdown()
+        # The crop-years failed, including the one aborting the run.
+        SIM.Failures.write(SIM.Config.OUTDIR)
+        if SIM.Profile is not None:
+            SIM.Profile.write(SIM.Config.OUTDIR)
+
+    print("CropSim terminated successfully.")
+
+
+def simulate():
+    """Simulates the chains serially, in parallel or in lockstep, as configured."""
+    # The soils of a site can go through the daily loop together, unless running in LEGACY mode.
+    if SIM.Config.LOCKSTEP:
+        if SIM.Config.LEGACY:
+            print("LEGACY mode carries the state between soils, simulating them one at a time.")
+        else:
+            runSites(getSites(), SIM.Config.WORKERS)
+            return
+
+    # Each (site, soil) chain starts from the initial conditions, so they can be
+    # simulated in parallel, unless running in LEGACY mode.
+    if SIM.Config.WORKERS > 1:
+        if SIM.Config.LEGACY:
+            print("LEGACY mode carries the state between soils, running on a single process.")
+        else:
+            runChains(getChains(), SIM.Config.WORKERS)
+            return
+
+    # From Label 6 to 950, lines 683~1433 in the Fortran Program code.
+    ctx = SIM.getContext()
+    try:
+        for sim in SIM.Simulations:
+            # This print emulates the original console output.
+            print(sim)
+            site = SIM.Sites[sim.WSITE]
+
+            # Here starts the loop from label 15 to 900.
+            for soilIndex in range(len(SIM.SoilProps)):  # @ 738 DO 850 ISOIL = 1,28 / 850 CONTINUE
+                if site.SOILSIM[soilIndex] == 1:
+                    # TONOTE: The legacy code carries the INITFILE and the rest of the state over to
+                    # the next soil and site, otherwise every chain starts from a new context.
+                    if not SIM.Config.LEGACY:
+                        ctx = SIM.Context = SIM.newContext()
+                    ctx.Journal, ctx.Failures = SIM.Journal, SIM.Failures
+                    # A resumed chain starts after its last crop-year journaled. In LEGACY mode the
+                    # state of the chains already completed is restored too, carried to the next one.
+                    checkpoint = SIM.Journal.get(sim.WSITE, SIM.SoilProps[soilIndex].ISCODE) \
+                        if SIM.Journal else None
+                    start = checkpoint.restore(ctx) if checkpoint else 0
+                    # Go on with the simulation if specified on CROPFILE
+                    CROPSIM.simulateChain(ctx, sim, soilIndex, start)
+
+            # The output files of the site are kept open for all its soils.
+            SIM.OutputFiles.close()
+    finally:
+        SIM.OutputFiles.close()
+
+
+def weatherCompile():
+    """Writes the .WEA files of the configured WEA_DIR into a single weather store."""
+    config = Configuration(readGlobalData=False)
+    weaDir = os.path.join(config.INPUTDIR, os.path.normpath(config.WEA_DIR))
+    filename = config.getWeatherStoreFilename()
+
+    print(f"Compiling the .WEA files at {weaDir}")
+    count = compileWeatherStore(weaDir, filename)
+    print(f"{count} site-years written to the weather store at: {filename}")
+    if not config.WEA_STORE_FILE:
+        print("Set WEA_STORE_FILE in the configuration file to simulate from the weather store.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,511 @@
+"""
+Defines the state of a single simulation run.
+A context holds every variable read and written by the subroutines during the simulation
+of a (site, soil) chain, so several simulations can share the same process.
+"""
+
+import os
+from copy import deepcopy
+
+from Data.Crop import Crop
+from Data.Crop import CropId
+from Data.SoilData import SoilData
+from Data.SoilType import SoilType
+from Data.SimControl import SimControl
+from Data.Irrigation import IrrigationTypes
+from Data.WeatherStation import WeatherStation
+from Data.WeatherData import WeatherCache, ForecastWindows
+from Files.WeatherStore import WeatherStore
+from Data.Summary import WeeklyData, MonthlyData, DailyFluxes
+from Data.DailyResults import DailyResults
+
+from Files.SimFile import SimFile
+from Files.BlocFile import BlocFile
+from Files.TillageFile import TillageFile
+from Files.PrintOutFile import PrintOutFile, PrintPlan
+from Files.InitialFile import InitialFile
+from Files.DataFile import OutputFormats
+from Files.OutputFiles import OutputFiles, HeldFile
+from Files.DailyReport import DailyReport
+from Files.ResultsDatabase import ResultsDatabase, ResultsBatch
+from Files.FailureReport import FailureReport
+from Errors.CustomError import CropNameError
+
+# Constants
+LAYER_COUNT: int = 10
+
+
+class SimulationContext:
+    """Holds the per-run simulation state, passed through the subroutines call chain."""
+    __slots__ = (
+        # Shared input data
+        "Config", "BLOC", "Tillages", "PrintOut", "Sites", "SoilProps", "WeatherCache", "WeatherStore",
+        "SimFiles", "OutputFiles", "ResultsDatabase",
+        # Current simulation
+        "InitialData", "Crops", "Sim", "Soil", "Site", "Station", "Control", "CurrentCrop",
+        "IZONE", "LIVECOND", "ISIM", "OLDCRP", "OLDRES", "LIVECROP",
+        # Per-layer data
+        "PERRZD", "RDF", "PAWFT", "PWP", "CENTER", "AVMFT", "THETA", "SOILT", "DEPL",
+        # Soil related
+        "RESIDUE", "SOIL", "TOTDEP",
+        "EP", "E1", "E2",
+        # Dates
+        "TIME", "TODAY", "JNEXTI", "JDAY", "IYEAR", "JDYSTR", "JDYBG", "JDYEND", "JDYPLT", "JDYMAT",
+        "JDYFRZ", "JDYEFC", "JDYFLO", "JDYRIPE", "JDYVEG", "JFPLT",
+        # Daily data
+        "TMAX", "TMIN", "PRECIP", "SOLAR", "ETR", "CROPKC", "Forecast",
+        # Seasonal data
+        "KSTG", "ICUT", "SNIRR", "SGRIRR", "TDEFS", "TPS", "TDEF",
+        "PAW", "AWATER", "GDD", "GDDS",
+        "YIELD", "ETYLD", "ETMAX", "BVALUE", "YLDRATIO",
+        "EPRECIP", "PRECIPS", "EPRECIPS", "RUNON", "RUNOFF", "DINF",
+        "SNOTMP", "SNOH2O", "TANUAL", "TAVG", "RAIN", "ALPHA1", "CURVNO", "Runoff", "RZMAX", "RZMGMT", "KC",
+        "IRIGNO", "NETIRR", "GROIRR", "DPLA", "DPLN", "AWDPLN", "MON", "WEEK", "Fluxes",
+        "TOTWAT", "DRAIND", "DCOEFF", "DRAINS", "RZD", "ETS", "FDIRRIG", "SATWC",
+        "LASTSIMF", "LASTYR", "DPLBG", "IEFC", "PCT", "GDDCUT",
+        # Output files
+        "outFile", "yearFile", "monthFile", "precipFile", "profileFile", "Results", "Daily", "Journal",
+        "Failures", "SoilTemperature", "Plan", "DailyReport")
+
+    def __init__(self, config=None, bloc: BlocFile = None, tillages: TillageFile = None,
+                 printOut: PrintOutFile = None, initialData: InitialFile = None,
+                 sites: dict = None, soilProps: list = None, weatherCache: WeatherCache = None,
+                 weatherStore: WeatherStore = None, simFiles: dict = None, outputFiles: OutputFiles = None,
+                 resultsDatabase: ResultsDatabase = None):
+        """Creates a new context for the shared input data specified,
+        starting from a copy of the initial data."""
+
+        # Shared input data, never modified by the simulation.
+        self.Config = config
+        """Program configuration"""
+        self.BLOC: BlocFile = bloc
+        self.Tillages: TillageFile = tillages
+        self.PrintOut: PrintOutFile = printOut
+        self.Sites: dict = sites if sites is not None else {}
+        """A dictionary with the site simulation data."""
+        self.SoilProps: list = soilProps
+        """A list with the soil types loaded from the SOILPROP file."""
+        self.WeatherCache: WeatherCache = weatherCache
+        """The weather data already read, shared by the contexts of the process."""
+        self.WeatherStore: WeatherStore = weatherStore
+        """The compiled weather store, used instead of the .WEA files when loaded."""
+        self.SimFiles: dict = simFiles if simFiles is not None else {}
+        """The .SIM files already read, by (IZONE, SIMFILE), never simulated directly."""
+        self.OutputFiles: OutputFiles = outputFiles if outputFiles is not None else OutputFiles()
+        """The output files kept open by the process, shared by the contexts writing to the same files."""
+        self.ResultsDatabase: ResultsDatabase = resultsDatabase
+        """The database receiving the results, None when only the text files are written."""
+
+        self.InitialData: InitialFile = deepcopy(initialData) if initialData else InitialFile()
+        """Initial Data read from the INITIAL.DAT file, rewritten after every crop-year."""
+
+        self.Crops: list = []
+        self.Sim: SimFile = None
+        self.Soil: SoilType = None
+        """The current simulated soil type."""
+        self.Site: SoilData = None
+        """The current site in simulation."""
+        self.Station: WeatherStation = None
+        self.Control: SimControl = None
+        self.CurrentCrop: Crop = None
+
+        self.IZONE: int = 0
+        """The current zone for the simulation."""
+        self.LIVECOND: bool = False
+
+        self.ISIM: int = 0
+        """Simulation 0-based index"""
+
+        # From INITIAL data file
+        self.OLDCRP: int = 0
+        self.OLDRES: float = 0.0
+
+        self.LIVECROP: bool = False
+        """
+        If LIVECROP = 0, starting with residue/fallow from wheat/other crops
+        If LIVECROP = 1, starting year with growing wheat
+        """
+
+        # =====================================================
+        # PER-LAYER DATA
+        self.PERRZD = [0.0]
+        """Percent Of Each Layer Filled With Roots."""
+        self.RDF = [0.0] * LAYER_COUNT
+        """Root distribution."""
+        self.PAWFT = [0.0] * LAYER_COUNT
+        """Plant Available Water for each layer."""
+        self.PWP = [0.0] * LAYER_COUNT
+        """Permanent wilting point value for the 10 soil layers."""
+
+        self.CENTER = [0.0] * LAYER_COUNT
+        """The depth at the middle point of the layer.
+        TONOTE: CENTER: This is actually read-only, calculated on SimFile loading."""
+
+        self.AVMFT = [0.0] * LAYER_COUNT
+        """Available Volumetric Moisture in each layer."""
+        self.THETA = [0.0]
+        """INITAL VOLUMETRIC WATER CONTENT FOR EACH LAYER.
+        TONOTE: From INITIAL data file"""
+        self.SOILT = [0.0]
+        """Average temperature of soil layer (in °F)."""
+        self.DEPL = [0.0] * LAYER_COUNT
+        """
+        Used by ComputeWaterDepletion() and __TranspirationRoutine() on DEPLT.
+        """
+        # PER-LAYER DATA
+        # =====================================================
+
+        self.RESIDUE: float = 0.0
+        """Amount of residue on soil surface (in lb/acre)."""
+
+        self.SOIL = 411  # A initial value to perform testing of .SIM files, which relies on this
+        """The current soil code for the simulation."""
+
+        self.TOTDEP = 0.0
+        """Total depth of soil profile, depth to bottom of soil layer (in inches)."""
+
+        self.EP, self.E1, self.E2 = 0.0, 0.0, 0.0
+        """Related to evaporation stages."""
+
+        # =====================================================
+        # Dates
+        self.TIME: float = 0.0
+        self.TODAY: float = 0.0
+        self.JNEXTI: float = 0.0
+
+        self.JDAY: int = 0
+        """Current Julian Day of the simulation."""
+        self.IYEAR: int = 0
+        """Current year of the simulation."""
+
+        self.JDYSTR: int = 0
+        """First day of weather data."""
+        self.JDYBG: int = 0
+        """First day of simulation."""
+        self.JDYEND: int = 0
+        """Last day of simulation."""
+        self.JDYPLT: int = 0
+        """Day of planting of wheat in the fall."""
+        self.JDYMAT: int = 0
+        """Day of maturity."""
+        self.JDYFRZ: int = 0
+        """Freeze Date"""
+        self.JDYEFC: int = 0
+        """Day to effective cover."""
+        self.JDYFLO: int = 0
+        """Day of start of flowering stage."""
+        self.JDYRIPE: int = 0
+        """Ripe Day."""
+        self.JDYVEG: int = 0
+        """Day of start of vegetative stage."""
+
+        self.JFPLT: int = 0
+        """Day the wheat is planted in the fall."""
+        # Date related
+        # =====================================================
+
+        # =====================================================
+        # DAILY DATA
+        self.TMAX = []
+        """Maximum temperature (in °F)."""
+        self.TMIN = []
+        """Minimum temperature (in °F)."""
+        self.PRECIP = [0.0]
+        """Recorded precipitation (in inches)."""
+
+        self.SOLAR = [0.0]
+
+        self.ETR = [0.0]
+        self.CROPKC = [0.0]
+        """Daily value of Crop Coefficient."""
+        self.Forecast: ForecastWindows = None
+        """The rain and crop ET of the forecast periods of the crop-year, see IRRIGA."""
+
+        # DAILY DATA
+        # =====================================================
+
+        # =====================================================
+        # SEASONAL DATA
+
+        self.KSTG: int = 0
+        """Growth stage index."""
+        self.ICUT: int = 0
+
+        self.SNIRR = 0.0
+        """Seasonal net irrigation."""
+        self.SGRIRR = 0.0
+        """Seasonal gross irrigation."""
+        self.TDEFS = 0.0
+        """Seasonal transpiration deficit."""
+
+        self.TPS = []
+        """Seasonal potential transpiration."""
+        self.TDEF = []
+        """Transpirational deficit during each stage."""
+
+        # SEASONAL DATA
+        # =====================================================
+
+        self.PAW = 0.0
+        """Current Plant Available Water."""
+        self.AWATER = 0.0
+
+        self.GDD = 0.0
+        """Current GDD in the simulation."""
+
+        # Initialized on READWEAT
+        self.GDDS = []
+        """Accumulated GDD"""
+
+        # Yield used in lines:
+        # 1119: PROGRAM: Assigned to 0.0 if ITFLAG > 0
+        # 1170: PROGRAM: Written to REP RIVER output file.
+        # 1203: PROGRAM: Written to unit 13
+        # 1274, 1285: PROGRAM: Written to unit 7
+        # 2157: DEPLT: Read after calling YIELDS
+        self.YIELD = 0.0
+        self.ETYLD = 0.0
+        self.ETMAX = 0.0
+        self.BVALUE = 0.0
+        self.YLDRATIO = 0.0
+
+        # From EFPRECIP
+        self.EPRECIP = 0.0
+        self.PRECIPS = 0.0
+        self.EPRECIPS = 0.0
+
+        self.RUNON = 0.0
+        """Depth of water that runs onto terrace channel, (in inches)"""
+        self.RUNOFF = 0.0
+        """Depth of water that runs off, (in inches)"""
+
+        self.DINF = 0.0
+        """The depth of water that infiltrated."""
+
+        # =====================================================
+        # Snow parameters
+        self.SNOTMP = 0.0
+        """Temperature of snow pack (in °F)."""
+        self.SNOH2O = 0.0
+        """Amount of water in snow (in inches H20)"""
+        # =====================================================
+
+        self.TANUAL = 0.0
+        """Average annual air temperature, (in °C)."""
+        self.TAVG = 0.0
+        """Average temperature of the day (in °F)."""
+        self.RAIN = 0.0
+        """Daily rain (in inches)"""
+
+        self.ALPHA1 = 0.0  # in lines 137, 914, 934, 1477, 1478 (Move it to the SimFile (?))
+
+        self.CURVNO = 0.0
+        """Curve Number from EFPRECIP"""
+        self.Runoff = None
+        """The RunoffConstants of the soil for the crop-year, see EFPRECIP."""
+
+        # Adjusted values, always use these instead of those in the SimFile.
+        self.RZMAX: float = 0.0
+        self.RZMGMT: float = 0.0
+
+        self.KC = 0.0
+        """Crop Coefficient."""
+
+        # Irrigation related
+        self.IRIGNO = 0
+        """Number os irrigations."""
+        self.NETIRR = 0.0
+        """Net irrigation."""
+        self.GROIRR = 0.0
+        """Gross irrigation."""
+
+        self.DPLA = 0.0
+        self.DPLN = 0.0
+        self.AWDPLN = 0.0
+        """Allowable depletion."""
+
+        self.MON = [MonthlyData()]
+        """Monthly data array."""
+        self.WEEK = [WeeklyData()]
+        """Weekly data array."""
+        self.Fluxes = DailyFluxes()
+        """The daily fluxes of the crop-year, summed into MON and WEEK at the end of the season."""
+
+        self.TOTWAT = 0.0
+        """Amount of water stored in soil profile, (in inches H₂O)."""
+        self.DRAIND = 0.0
+        """Drainage time for current soil."""
+        self.DCOEFF = 0.0
+        """Drainage coefficient for current soil."""
+        self.DRAINS = 0.0
+        """Total drainage."""
+
+        self.RZD = 0.0
+        self.ETS = 0.0
+
+        self.FDIRRIG = []
+        """2-dimensional array for storing historical data."""
+
+        self.SATWC = 0.0
+        """Saturated soil water content."""
+
+        self.LASTSIMF, self.LASTYR = "", 0
+        self.DPLBG: float = 0.0
+        self.IEFC: int = 0
+        self.PCT: float = 0.0
+        self.GDDCUT: float = 0.0
+
+        # I/O section
+        self.outFile = None
+        self.yearFile = None
+        self.monthFile = None
+        self.precipFile = None
+        self.profileFile = None
+        self.Results: ResultsBatch = ResultsBatch() if resultsDatabase is not None else None
+        """The results of the chain, inserted into the database at the end of the chain."""
+        self.Daily: DailyResults = None
+        """The daily values recorded by DEPLT, only when simulated in-process, see CropSimAPI."""
+        self.Journal = None
+        """Records every crop-year completed, see RunJournal. None unless JOURNAL is set."""
+        self.Failures: FailureReport = FailureReport()
+        """Records every crop-year failed, see the ERROR_POLICY setting."""
+        self.SoilTemperature: bool = True
+        """When False, SOILTEMP is skipped, see the SOIL_TEMP setting."""
+        self.Plan: PrintPlan = None
+        """The outputs printed for the crop-year, set before its daily loop."""
+        self.DailyReport: DailyReport = DailyReport()
+        """The daily rows of the crop-year, written to the OUT and PROFILE files at the end of the season."""
+
+    def openMonFile(self):
+        """Returns the path to the monthly summary output file."""
+        Config = self.Config
+
+        monthFilename: str = None
+        if Config.OUTPUT_FORMAT == OutputFormats.REPRIVER:
+            # The folders are created by the OutputFiles when opened.
+            dirPath = os.path.join(Config.OUTDIR)
+            monthFilename = os.path.join(dirPath, f"{self.Control.WSITE}{self.CurrentCrop.YR}"
+                                                  f"{self.Soil.ISCODE}_MON.TXT")
+        # Defaulting to COHYST
+        # if Config.OutputFormat == OutputFormats.COHYST:
+        monthFilename = os.path.join(Config.OUTDIR, "Mon", f"{self.Control.WSITE}_MON.TXT")
+        self.monthFile = HeldFile(self.OutputFiles.open(monthFilename))
+        return monthFilename
+
+    def openYearFile(self):
+        """Returns the path to the yearly summary output file."""
+        # TONOTE: The file used to be rewritten on every crop-year, keeping only the last row,
+        # the Fortran code appends to it.
+        yearFilename: str = os.path.join(self.Config.OUTDIR, "YR", f"{self.Control.WSITE}_YR.TXT")
+        self.yearFile = self.OutputFiles.open(yearFilename)
+        return yearFilename
+
+    def openPrecipFile(self):
+        """Returns the path to the precipitation output file."""
+        precipFilename = os.path.join(self.Config.OUTDIR, "Precip", f"{self.Control.WSITE}_PRECIP.CSV")
+        self.precipFile = HeldFile(self.OutputFiles.open(precipFilename))
+        return precipFilename
+
+    def openOutFile(self):
+        """Opens the OUT file for appending."""
+        filename = os.path.join(self.Config.OUTDIR, f"{self.Control.WSITE}_OUT.TXT")
+        self.outFile = self.OutputFiles.open(filename, queued=True)
+
+    def openProfileFile(self):
+        """Opens the PROFILE file for appending."""
+        filename = os.path.join(self.Config.OUTDIR, "PROFILE.TXT")
+        self.profileFile = self.OutputFiles.open(filename, queued=True)
+
+    def releaseRows(self):
+        """Writes the MON and PRECIP rows and keeps the results of the crop-year, once its YR row is written."""
+        if self.monthFile is not None:
+            self.monthFile.release()
+            self.precipFile.release()
+        if self.Results is not None:
+            self.Results.keep()
+
+    def dropRows(self):
+        """Drops the MON and PRECIP rows and the results of the crop-year failed."""
+        self.monthFile = None
+        self.precipFile = None
+        if self.Results is not None:
+            self.Results.drop()
+
+    def closeFiles(self):
+        """Releases the output files of the crop-year.
+        They stay open on the OutputFiles, flushed at the end of the chain and closed at the end of the site."""
+        self.yearFile = None
+        self.monthFile = None
+        self.precipFile = None
+        self.outFile = None
+        self.profileFile = None
+
+    def writeInitialFile(self, filename, newLine="\n"):
+        """Writes the data in the structure to the file specified."""
+        file = open(filename, "wt")
+
+        file.write("  ")
+        for _, theta in enumerate(self.THETA):
+            file.write(f"{theta}:4.3f")
+        file.write(newLine)
+
+        file.write(f"  {int(self.Sim.CROP):4}  {self.RESIDUE:7.1f}  {int(self.LIVECROP):4}{newLine}")
+        file.write(f"  {self.SNOTMP:8.1f}    {self.SNOH2O:6.2f}    ")
+        for _, soilt in enumerate(self.SOILT):
+            file.write(f"{soilt}:5.1f")
+        file.write(newLine)
+
+        file.close()
+
+    def writeYearRow(self):
+        """Writes the current year row to output YR file."""
+        Sim = self.Sim
+        try:
+            cropName = Sim.CROP.getName(self.Config.LEGACY)
+        except AttributeError as err:
+            raise CropNameError(self, Sim.CROP) from err
+
+        IRR = Sim.Irrigation
+        line: str = None
+        TOTROF: float = 0.0
+        JFIRST = IRR.JFIRST
+        crop = Sim.CROP
+        if self.Config.OUTPUT_FORMAT == OutputFormats.REPRIVER:
+            IMPLT = Sim.IMPLT
+            IDPLT = Sim.IDPLT
+            # FORMAT(A4,',',A8,8(',',I5),',',F9.2,3(',',F7.2),',',F6.3,
+            # 2(',',F7.2),',',I5,3(',',F6.2),',',F8.2,',',A10)
+            line = (f"{self.Site.NWSITE:>4},{self.CurrentCrop.SIMFILE:>8},{self.SOIL:>5},{self.IYEAR:>5},"
+                    f"{IMPLT:>5},{IDPLT:>5},{JFIRST:>5},{self.JDYEFC:>5},{self.JDYMAT:>5},{self.JDYFRZ:>5},"
+                    f"{self.YIELD:>9.2f},{self.ETS:>7.2f},{self.ETYLD:>7.2f},{self.BVALUE:>7.2f},"
+                    f"{self.YLDRATIO:>6.3f},{self.SGRIRR:>7.2f},{self.SNIRR:>7.2f},{self.IRIGNO:>5},"
+                    f"{self.PRECIPS:>6.2f},{self.EPRECIPS:>6.2f},{self.DRAINS:>6.2f},{self.DPLBG:>8.2f},"
+                    f"  {cropName:<8}\n")
+        else:
+            # Perform wheat/fallow rotation (?)
+            if self.LIVECROP and Sim.CROP == CropId.WinterWheat and Sim.ITFLAG != 3 and \
+                    Sim.Irrigation.IRRTYP == IrrigationTypes.DryLand:
+                Sim.CROP = CropId.SummerFallow
+            crop = Sim.CROP
+            ITFLAG = Sim.ITFLAG
+            IRRTYP = IRR.IRRTYP
+            # compute annual runoff
+            # The monthly runoff is summed from the daily fluxes, MON is not summed by the YIELD_ONLY runs.
+            runoff = self.Fluxes.getMonthTotals("ROF")
+            for i in range(Sim.IMBG - 1, Sim.IMEND):
+                TOTROF += runoff[i]
+            # FORMAT(1X,A4,2X,A8,1X,8I5,F8.1,2X,3F7.2,I5,2X,4F6.2,2X,A10, 3I3, F7.2)
+            line = (f" {self.Site.NWSITE:>4}  {self.CurrentCrop.SIMFILE:>8} {self.SOIL:>5}{self.IYEAR:>5}"
+                    f"{self.JDYPLT:>5}{JFIRST:>5}{JFIRST:>5}{self.JDYEFC:>5}{self.JDYMAT:>5}{self.JDYFRZ:>5}"
+                    f"{self.YIELD:>8.1f}  {self.ETS:>7.2f}{self.SGRIRR:>7.2f}{self.SNIRR:>7.2f}"
+                    f"{self.IRIGNO:>5}  {self.PRECIPS:>6.2f}{self.EPRECIPS:>6.2f}{self.DRAINS:>6.2f}"
+                    f"{self.DPLBG:>6.2f}    {cropName:<8}{Sim.CROP:>3}{ITFLAG:>3}{IRRTYP:>3}{TOTROF:>7.2f}\n")
+            print(line)
+
+            if self.LIVECROP and Sim.CROP == CropId.SummerFallow and Sim.ITFLAG != 3 and \
+                    Sim.Irrigation.IRRTYP == IrrigationTypes.DryLand:
+                Sim.CROP = CropId.WinterWheat
+
+        self.yearFile.write(line)
+        if self.Results is not None:
+            self.Results.addYear(self, crop, cropName, TOTROF)
@@ -26,8 +26,10 @@
 # KC:
 # =================================================================
 
-import SIM
-# SIM is the module which holds global data accessed an modified
+import numpy as np
+
+from SimulationContext import SimulationContext
+# The SimulationContext holds the data accessed and modified
 # during the different simulation stages and subroutines.
 
 from Fortran import INT
@@ -53,11 +55,16 @@ FSKC = {
 }
 """Coefficients for straight computing of the majority of crop types."""
 
+SEASON_STATE = ("JDAY", "GDD", "KC")
+"""The context variables left by the last CROPCO call of a season, for every crop type."""
+HAY_STATE = SEASON_STATE + ("GDDCUT",)
+ALFALFA_STATE = SEASON_STATE + ("IEFC", "ICUT")
+
 
 # FGS stands for Full Growing Season
 
 
-def CROPCO():
+def CROPCO(ctx: SimulationContext):
     """Compute Daily Crop Coefficient."""
 
     # Crops 1 - 7 Represent Spring Grains, Edible Beans, Soybeans,
@@ -68,33 +75,33 @@ def CROPCO():
     # as an integer (easier to compare with the previous code)
     # or as an Enumeration (easier to understand the new code).
     # Which do you prefer ?
-    CROP = SIM.Sim.CROP
+    CROP = ctx.Sim.CROP
     if CROP <= 7:
-        SIM.KC = __CROPCO7()
+        ctx.KC = __CROPCO7(ctx)
     elif CROP == CropId.Corn:
-        __CROPCO8()
+        __CROPCO8(ctx)
     elif CROP == CropId.Alfalfa:
-        __CROPCO10()
+        __CROPCO10(ctx)
     elif CROP == CropId.IrrigatedHay:
-        __CROPCO11()
+        __CROPCO11(ctx)
     else:
         cc = FSKC[CROP]
-        __CROPCO(cc[0], cc[1], cc[2], cc[3], cc[4], cc[5])
+        __CROPCO(ctx, cc[0], cc[1], cc[2], cc[3], cc[4], cc[5])
 
     # Check Bounds On Crop Coefficients
     ICROP: int = CROP - 1
-    # TONOTE: if SIM.JDAY > SIM.JDYFRZ is True, the performed computation is useless.
-    if SIM.JDAY > SIM.JDYFRZ or SIM.KC < SIM.BLOC.KCL[ICROP]:
-        SIM.KC = SIM.BLOC.KCL[ICROP]
-    if SIM.KC > SIM.BLOC.KCU[ICROP]:
-        SIM.KC = SIM.BLOC.KCU[ICROP]
+    # TONOTE: if ctx.JDAY > ctx.JDYFRZ is True, the performed computation is useless.
+    if ctx.JDAY > ctx.JDYFRZ or ctx.KC < ctx.BLOC.KCL[ICROP]:
+        ctx.KC = ctx.BLOC.KCL[ICROP]
+    if ctx.KC > ctx.BLOC.KCU[ICROP]:
+        ctx.KC = ctx.BLOC.KCU[ICROP]
 
 
-def __CROPCO(FS1: float, FS2: float, FS3: float, KCINI: float, KCMID: float, KCEND: float):
-    __CROPCO_FGS(SIM.GDD / SIM.Sim.GDD.MAT, FS1, FS2, FS3, KCINI, KCMID, KCEND)
+def __CROPCO(ctx: SimulationContext, FS1: float, FS2: float, FS3: float, KCINI: float, KCMID: float, KCEND: float):
+    __CROPCO_FGS(ctx, ctx.GDD / ctx.Sim.GDD.MAT, FS1, FS2, FS3, KCINI, KCMID, KCEND)
 
 
-def __CROPCO_FGS(FGS: float, FS1: float, FS2: float, FS3: float,
+def __CROPCO_FGS(ctx: SimulationContext, FGS: float, FS1: float, FS2: float, FS3: float,
                  KCINI: float, KCMID: float, KCEND: float):
     """Adjust Kc based on FGS"""
     assert FS1 < FS2 < FS3
@@ -102,43 +109,43 @@ def __CROPCO_FGS(FGS: float, FS1: float, FS2: float, FS3: float,
     # assert(KCINI < KCMID < KCEND)
 
     if FGS > 1.0 or FGS <= FS1:
-        SIM.KC = KCINI
+        ctx.KC = KCINI
     elif FS1 < FGS < FS2:
-        SIM.KC = KCINI + (KCMID - KCINI) * (FGS - FS1) / (FS2 - FS1)
+        ctx.KC = KCINI + (KCMID - KCINI) * (FGS - FS1) / (FS2 - FS1)
     elif FS2 <= FGS <= FS3:
-        SIM.KC = KCMID
+        ctx.KC = KCMID
     elif FS3 < FGS <= 1.0:
-        SIM.KC = KCMID - (KCMID - KCEND) * (FGS - FS3) / (1.0 - FS3)
+        ctx.KC = KCMID - (KCMID - KCEND) * (FGS - FS3) / (1.0 - FS3)
     # TONOTE: Maybe missing a condition in which KC takes the KCEND value ?
     # Maybe this should happen when FGS > 1.0 ?
 
 
-def __CROPCO7():
+def __CROPCO7(ctx: SimulationContext):
     """Compute Daily Crop Coefficient for Spring Grains, Edible Beans, Soybeans,
     Potatoes, Sugar Beets, Grain Sorghum (Milo) and Winter Wheat."""
 
-    CROP = SIM.Sim.CROP
-    if CROP == 7 and SIM.JDAY >= SIM.JFPLT > 0:
+    CROP = ctx.Sim.CROP
+    if CROP == 7 and ctx.JDAY >= ctx.JFPLT > 0:
         return 0.25
 
     # Adjusted code for 0-base indexing
     IEFC, PCT = 0, 0.0
     # IEFC: Index to growing stage.
-    if SIM.JDAY > SIM.JDYEFC:
+    if ctx.JDAY > ctx.JDYEFC:
         IEFC = 1
-        PCT = float(SIM.JDAY - SIM.JDYEFC) / 100.0
+        PCT = float(ctx.JDAY - ctx.JDYEFC) / 100.0
     else:
-        PCT = float(SIM.JDAY - SIM.JDYPLT) / float(SIM.JDYEFC - SIM.JDYPLT)
+        PCT = float(ctx.JDAY - ctx.JDYPLT) / float(ctx.JDYEFC - ctx.JDYPLT)
 
-    ICROP = SIM.Sim.CROP - 1
-    KCL = SIM.BLOC.KCL
+    ICROP = ctx.Sim.CROP - 1
+    KCL = ctx.BLOC.KCL
     # TONOTE: Conditional branching changed for readability and performance,
     # Now it requires less comparisons saving CPU instructions.
     # TONOTE: Here, the lower limit is also assigned for PCT > 1.0
     if PCT < 0.0 or PCT > 1.0:
         return KCL[ICROP]
     else:
-        CC = SIM.BLOC.CC
+        CC = ctx.BLOC.CC
         IPCT = INT(PCT / 0.1)
         mod = 10.0 * (PCT % 0.1)
         if IPCT == 0:
@@ -151,59 +158,59 @@ def __CROPCO7():
 
     # The original code performs a redundant range clamping here,
     # since it is performed anyway at the end of CROPCO for all cases.
-    # if SIM.KC > SIM.BLOC.KCU[ICROP]: SIM.KC = SIM.BLOC.KCU[ICROP]
-    # if SIM.KC < KCL[ICROP]: SIM.KC = KCL[ICROP]
+    # if ctx.KC > ctx.BLOC.KCU[ICROP]: ctx.KC = ctx.BLOC.KCU[ICROP]
+    # if ctx.KC < KCL[ICROP]: ctx.KC = KCL[ICROP]
 
 
-def __CROPCO8():
+def __CROPCO8(ctx: SimulationContext):
     """Compute Daily Crop Coefficient for Corn.
     Kc from Bill Kranz
     Values from Watts (1982) and Stegman (1988)"""
     # TONOTE: Fully revised method.
-    GDD = SIM.GDD
-    GDDMAT = SIM.Sim.GDD.MAT
-    SIM.KC = SIM.BLOC.KCU[SIM.Sim.CROP - 1]
+    GDD = ctx.GDD
+    GDDMAT = ctx.Sim.GDD.MAT
+    ctx.KC = ctx.BLOC.KCU[ctx.Sim.CROP - 1]
     if GDD <= 0.12 * GDDMAT:
-        SIM.KC = 0.15
+        ctx.KC = 0.15
     elif GDD < 0.42 * GDDMAT:
-        SIM.KC = 0.15 + 0.85 * (GDD - 0.12 * GDDMAT) / (0.3 * GDDMAT)
+        ctx.KC = 0.15 + 0.85 * (GDD - 0.12 * GDDMAT) / (0.3 * GDDMAT)
     elif GDD > 0.78 * GDDMAT:
-        SIM.KC = 1.0 - 0.7 * (GDD - 0.78 * GDDMAT) / (0.22 * GDDMAT)
+        ctx.KC = 1.0 - 0.7 * (GDD - 0.78 * GDDMAT) / (0.22 * GDDMAT)
     elif GDD > GDDMAT:
-        SIM.KC = 0.15
+        ctx.KC = 0.15
 
     # Range adjustment.
     # TONOTE: The following instructions could be written as:
-    # SIM.KC = min(SIM.BLOC.KCU[SIM.Sim.CROP-1], max(0.15, SIM.KC))
+    # ctx.KC = min(ctx.BLOC.KCU[ctx.Sim.CROP-1], max(0.15, ctx.KC))
     # using V = min(MAX, max(MIN, V)) makes the code more readable
     # but slower (~2X) than IF-checking, which is your preference?
-    # if SIM.KC > SIM.BLOC.KCU[SIM.Sim.CROP-1]:
-    #    SIM.KC = SIM.BLOC.KCU[SIM.Sim.CROP-1]
-    if SIM.KC < 0.15:
-        SIM.KC = 0.15
+    # if ctx.KC > ctx.BLOC.KCU[ctx.Sim.CROP-1]:
+    #    ctx.KC = ctx.BLOC.KCU[ctx.Sim.CROP-1]
+    if ctx.KC < 0.15:
+        ctx.KC = 0.15
 
 
-def __CROPCO10():
+def __CROPCO10(ctx: SimulationContext):
     """Compute crop coefficients for alfalfa. Kc from Wright (1982)"""
     # TONOTE: Fully revised method.
     # ICUT as the 0-base index
-    GetCuttingIndices()
-    JDAY, JDYCUT, ICUT, IEFC = SIM.JDAY, SIM.Sim.JDYCUT, SIM.ICUT - 1, SIM.IEFC
+    GetCuttingIndices(ctx)
+    JDAY, JDYCUT, ICUT, IEFC = ctx.JDAY, ctx.Sim.JDYCUT, ctx.ICUT - 1, ctx.IEFC
 
     # Compute The Percent Time For Each Stage
-    PCT = SIM.PCT
-    if ICUT == 0 and JDAY >= SIM.JDYPLT:
-        PCT = float(JDAY - SIM.JDYPLT) / float(JDYCUT[0] - SIM.JDYPLT)
+    PCT = ctx.PCT
+    if ICUT == 0 and JDAY >= ctx.JDYPLT:
+        PCT = float(JDAY - ctx.JDYPLT) / float(JDYCUT[0] - ctx.JDYPLT)
 
-    if SIM.Config.LEGACY:
+    if ctx.Config.LEGACY:
         # TONOTE: Getting legacy and probably buggy behaviour.
         if ICUT == 1:
-            if SIM.IEFC == 1:
+            if ctx.IEFC == 1:
                 PCT = float(JDAY - JDYCUT[0]) / float(JDYCUT[1] - JDYCUT[0])
             else:
                 PCT = float(JDAY - JDYCUT[0]) / float(305.0 - JDYCUT[0])
         elif 2 <= ICUT <= 4:
-            if SIM.IEFC == 1:
+            if ctx.IEFC == 1:
                 PCT = float(JDAY - JDYCUT[ICUT - 1]) / float(JDYCUT[ICUT] - JDYCUT[ICUT - 1])
             else:
                 PCT = float(JDAY - JDYCUT[ICUT]) / float(305.0 - JDYCUT[ICUT])
@@ -213,50 +220,197 @@ def __CROPCO10():
                 if IEFC == 1 else float(JDAY - JDYCUT[ICUT]) / float(305.0 - JDYCUT[ICUT])
 
     # 0-based index for CC[CROP] (0,1,2)
-    CROP = SIM.Sim.CROP
+    CROP = ctx.Sim.CROP
     ICROP = CROP - 1
-    if JDAY <= SIM.JDYPLT or JDAY >= 305:
-        SIM.KC = SIM.BLOC.KCL[ICROP]
+    if JDAY <= ctx.JDYPLT or JDAY >= 305:
+        ctx.KC = ctx.BLOC.KCL[ICROP]
         # TONOTE: Maybe we can (or should) exit the method here
 
-    CC = SIM.BLOC.CC
+    CC = ctx.BLOC.CC
     IPCT = INT(PCT / 0.1)
     # IPCT here is a 1-based index
     # CC is a dictionary so is accessed by the 1-based index instead of the 0-based
     if IPCT == 10:
-        SIM.KC = CC[CROP][IEFC][9]
+        ctx.KC = CC[CROP][IEFC][9]
     else:
         mod = 10.0 * (PCT % 0.1)
         if IPCT == 0:
-            SIM.KC = SIM.BLOC.KCL[ICROP] + mod * (CC[CROP][IEFC][IPCT] - SIM.BLOC.KCL[ICROP])
+            ctx.KC = ctx.BLOC.KCL[ICROP] + mod * (CC[CROP][IEFC][IPCT] - ctx.BLOC.KCL[ICROP])
         elif 0 < IPCT < 10:
-            SIM.KC = CC[CROP][IEFC][IPCT - 1] + mod * (CC[CROP][IEFC][IPCT] - CC[CROP][IEFC][IPCT - 1])
+            ctx.KC = CC[CROP][IEFC][IPCT - 1] + mod * (CC[CROP][IEFC][IPCT] - CC[CROP][IEFC][IPCT - 1])
 
 
-def GetCuttingIndices():
+def GetCuttingIndices(ctx: SimulationContext):
     """Gets IEFC and ICUT for Alfalfa coefficients."""
 
-    JDAY, JDYCUT = SIM.JDAY, SIM.Sim.JDYCUT
+    JDAY, JDYCUT = ctx.JDAY, ctx.Sim.JDYCUT
 
     if JDAY < JDYCUT[0]:
-        SIM.IEFC, SIM.ICUT = 0, 1
+        ctx.IEFC, ctx.ICUT = 0, 1
     if JDYCUT[0] <= JDAY < JDYCUT[1]:
-        SIM.IEFC, SIM.ICUT = 1, 2
+        ctx.IEFC, ctx.ICUT = 1, 2
     for i in range(1, 4):
         if JDYCUT[i] < JDAY < JDYCUT[i + 1]:
-            SIM.IEFC, SIM.ICUT = 1, i + 2
-    if JDAY >= JDYCUT[SIM.Sim.NCUT - 1]:
-        SIM.IEFC, SIM.ICUT = 2, SIM.Sim.NCUT
+            ctx.IEFC, ctx.ICUT = 1, i + 2
+    if JDAY >= JDYCUT[ctx.Sim.NCUT - 1]:
+        ctx.IEFC, ctx.ICUT = 2, ctx.Sim.NCUT
 
 
-def __CROPCO11():
+def __CROPCO11(ctx: SimulationContext):
     """Compute crop coefficients for Irrigated Hay."""
 
-    GDDMAT = SIM.Sim.GDD.MAT
-    JDYCUT = SIM.Sim.JDYCUT[0]
-    if SIM.JDAY == JDYCUT:
-        SIM.GDDCUT = SIM.GDD
+    GDDMAT = ctx.Sim.GDD.MAT
+    JDYCUT = ctx.Sim.JDYCUT[0]
+    if ctx.JDAY == JDYCUT:
+        ctx.GDDCUT = ctx.GDD
+
+    FGS = ctx.GDD / GDDMAT if ctx.JDAY < JDYCUT else \
+        (ctx.GDD - ctx.GDDCUT) / (GDDMAT - ctx.GDDCUT)
+    __CROPCO_FGS(ctx, FGS, 0.036, 0.109, 0.927, 0.243, 0.750, 0.669)
+
+
+# =================================================================
+# SEASON COEFFICIENTS
+# =================================================================
+# The coefficients of every day of the season computed at once from the GDDS array,
+# as READWEAT would call CROPCO day by day (see @ 3683).
+# CROPCO sees the GDD accumulated up to the day before, the first day the GDD left by READWEAT.
+
+
+def ComputeSeasonCoefficients(ctx: SimulationContext, JDYSTR: int, JDYSTP: int) -> list:
+    """Compute the crop coefficients from JDYSTR to JDYSTP, returns the CROPKC array.
+    The context is left as the last CROPCO call leaves it, see GetSeasonState."""
+    CROPKC = [0.0] * 366
+    if JDYSTP < JDYSTR:
+        return CROPKC
+
+    CROP = ctx.Sim.CROP
+    if CROP == CropId.Alfalfa:
+        # The cutting stage is carried from day to day, alfalfa goes on day by day.
+        for i in range(JDYSTR - 1, JDYSTP):
+            ctx.JDAY = i + 1
+            CROPCO(ctx)
+            ctx.GDD = ctx.GDDS[i]
+            CROPKC[i] = ctx.KC
+        return CROPKC
+
+    JDAY = np.arange(JDYSTR, JDYSTP + 1)
+    GDD = np.empty(len(JDAY))
+    GDD[0] = ctx.GDD
+    GDD[1:] = ctx.GDDS[JDYSTR - 1:JDYSTP - 1]
+
+    # The branches not taken may divide by zero, the ones taken are checked as CROPCO would raise.
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if CROP <= 7:
+            KC = __CROPCO7_SEASON(ctx, JDAY)
+        elif CROP == CropId.Corn:
+            KC = __CROPCO8_SEASON(ctx, GDD)
+        elif CROP == CropId.IrrigatedHay:
+            KC = __CROPCO11_SEASON(ctx, JDAY, GDD)
+        else:
+            FGS = __checkFinite(GDD / ctx.Sim.GDD.MAT)
+            KC = __CROPCO_FGS_SEASON(FGS, *FSKC[CROP])
+    KC = __checkFinite(KC)
+
+    # Check Bounds On Crop Coefficients
+    ICROP: int = CROP - 1
+    KCL, KCU = ctx.BLOC.KCL[ICROP], ctx.BLOC.KCU[ICROP]
+    KC = np.where((JDAY > ctx.JDYFRZ) | (KC < KCL), KCL, KC)
+    KC = np.where(KC > KCU, KCU, KC)
+
+    CROPKC[JDYSTR - 1:JDYSTP] = KC.tolist()
+    ctx.JDAY, ctx.GDD, ctx.KC = JDYSTP, ctx.GDDS[JDYSTP - 1], CROPKC[JDYSTP - 1]
+    return CROPKC
+
 
-    FGS = SIM.GDD / GDDMAT if SIM.JDAY < JDYCUT else \
-        (SIM.GDD - SIM.GDDCUT) / (GDDMAT - SIM.GDDCUT)
-    __CROPCO_FGS(FGS, 0.036, 0.109, 0.927, 0.243, 0.750, 0.669)
+def GetSeasonKey(ctx: SimulationContext, JDYSTP: int) -> tuple:
+    """Returns the data the season coefficients of the crop depend on, besides the GDDS array and the BLOCFILE."""
+    CROP = ctx.Sim.CROP
+    key = (int(CROP), ctx.JDYSTR, JDYSTP, ctx.JDYFRZ)
+    if CROP <= 7:
+        return key + (ctx.JDYEFC, ctx.JDYPLT, ctx.JFPLT)
+    elif CROP == CropId.Alfalfa:
+        return key + (ctx.JDYPLT, tuple(ctx.Sim.JDYCUT), ctx.Sim.NCUT, ctx.Config.LEGACY,
+                      ctx.KC, ctx.PCT, ctx.IEFC, ctx.ICUT)
+    elif CROP == CropId.IrrigatedHay:
+        return key + (ctx.Sim.GDD.MAT, ctx.Sim.JDYCUT[0], ctx.GDD, ctx.GDDCUT)
+    return key + (ctx.Sim.GDD.MAT, ctx.GDD)
+
+
+def GetSeasonState(CROP: int) -> tuple:
+    """Returns the context variables left by the season coefficients of the crop."""
+    if CROP == CropId.Alfalfa:
+        return ALFALFA_STATE
+    elif CROP == CropId.IrrigatedHay:
+        return HAY_STATE
+    return SEASON_STATE
+
+
+def __checkFinite(values: np.ndarray) -> np.ndarray:
+    if not np.isfinite(values).all():
+        raise ZeroDivisionError("float division by zero")
+    return values
+
+
+def __CROPCO_FGS_SEASON(FGS: np.ndarray, FS1: float, FS2: float, FS3: float,
+                        KCINI: float, KCMID: float, KCEND: float) -> np.ndarray:
+    """Adjust Kc based on FGS, see __CROPCO_FGS"""
+    assert FS1 < FS2 < FS3
+    return np.select(
+        [(FGS > 1.0) | (FGS <= FS1), FGS < FS2, FGS <= FS3],
+        [KCINI, KCINI + (KCMID - KCINI) * (FGS - FS1) / (FS2 - FS1), KCMID],
+        KCMID - (KCMID - KCEND) * (FGS - FS3) / (1.0 - FS3))
+
+
+def __CROPCO7_SEASON(ctx: SimulationContext, JDAY: np.ndarray) -> np.ndarray:
+    """Season crop coefficients for the crops <= 7, see __CROPCO7"""
+    CROP = ctx.Sim.CROP
+    KCL = ctx.BLOC.KCL[CROP - 1]
+    CC = np.array(ctx.BLOC.CC[CROP], dtype=np.float64)
+
+    late = JDAY > ctx.JDYEFC
+    IEFC = late.astype(np.int64)
+    early = (JDAY - ctx.JDYPLT) / float(ctx.JDYEFC - ctx.JDYPLT)
+    if not late.all(): __checkFinite(early)
+    PCT = np.where(late, (JDAY - ctx.JDYEFC) / 100.0, early)
+
+    inside = (PCT >= 0.0) & (PCT <= 1.0)
+    PCT = np.where(inside, PCT, 0.0)
+    IPCT = (PCT / 0.1).astype(np.int64)
+    mod = 10.0 * np.fmod(PCT, 0.1)
+    # The lower limit is taken as the coefficient before the first one of the first stage.
+    LOWER = np.where(IEFC == 0, KCL, CC[IEFC, 0])
+    UPPER = np.where(IEFC == 0, CC[IEFC, 0], CC[IEFC, 1])
+    PREV = CC[IEFC, np.maximum(IPCT - 1, 0)]
+    NEXT = CC[IEFC, np.minimum(IPCT, 9)]
+    KC = np.select([~inside, IPCT == 0, IPCT < 10],
+                   [KCL, LOWER + mod * (UPPER - LOWER), PREV + mod * (NEXT - PREV)], CC[IEFC, 9])
+
+    if CROP == 7 and ctx.JFPLT > 0:
+        KC = np.where(JDAY >= ctx.JFPLT, 0.25, KC)
+    return KC
+
+
+def __CROPCO8_SEASON(ctx: SimulationContext, GDD: np.ndarray) -> np.ndarray:
+    """Season crop coefficients for corn, see __CROPCO8"""
+    GDDMAT = ctx.Sim.GDD.MAT
+    KC = np.select(
+        [GDD <= 0.12 * GDDMAT, GDD < 0.42 * GDDMAT, GDD > 0.78 * GDDMAT, GDD > GDDMAT],
+        [0.15, 0.15 + 0.85 * (GDD - 0.12 * GDDMAT) / (0.3 * GDDMAT),
+         1.0 - 0.7 * (GDD - 0.78 * GDDMAT) / (0.22 * GDDMAT), 0.15],
+        ctx.BLOC.KCU[ctx.Sim.CROP - 1])
+    return np.where(__checkFinite(KC) < 0.15, 0.15, KC)
+
+
+def __CROPCO11_SEASON(ctx: SimulationContext, JDAY: np.ndarray, GDD: np.ndarray) -> np.ndarray:
+    """Season crop coefficients for irrigated hay, see __CROPCO11"""
+    GDDMAT = ctx.Sim.GDD.MAT
+    JDYCUT = ctx.Sim.JDYCUT[0]
+    cut = JDAY == JDYCUT
+    if cut.any():
+        ctx.GDDCUT = float(GDD[np.argmax(cut)])
+
+    after = JDAY >= JDYCUT
+    FGS = np.where(after, (GDD - ctx.GDDCUT) / (GDDMAT - ctx.GDDCUT), GDD / GDDMAT)
+    __checkFinite(FGS)
+    return __CROPCO_FGS_SEASON(FGS, 0.036, 0.109, 0.927, 0.243, 0.750, 0.669)
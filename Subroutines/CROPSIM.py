@@ -1,14 +1,18 @@
 """Main simulation module."""
 
 import os
+import traceback
 from math import exp
 
-import SIM
+from SimulationContext import SimulationContext
 
 from Subroutines.DAYS import DAYOFYR
 from Subroutines.YIELDS import YIELDS
 from Subroutines.READWEAT import READWEAT
-from Subroutines.DEPLT import DEPLT
+from Subroutines.DEPLT import DEPLT, PrintDailyReport
+from Subroutines.DEPLT_BATCH import SoilBatch, DEPLT_BATCH, PrintBatchReports, LAYER_ARRAYS
+from Subroutines.SOILTEMP import IsSoilTemperatureUsed
+from Subroutines.EFPRECIP import RunoffConstants
 
 from Data.Crop import Crop, CropId
 from Data.Tillage import TillageFlags
@@ -18,95 +22,301 @@ from Data.Irrigation import IrrigationTypes
 
 from Files.SimFile import SimFile
 from Files.InputSummary import PrintInputSummary
+from Files.PrintOutFile import PrintPlan
+from Files.FailureReport import Failure, ABORT, SKIP_CHAIN
 
+from Errors.CustomError import SimulationError
 
-def initSimulation(sim: SimControl):
+
+def initSimulation(ctx: SimulationContext, sim: SimControl):
     """Initializes the simulation parameters and returns the list of crops to simulate."""
-    SIM.Control = sim
-    if SIM.IZONE != sim.IZONE:
-        SIM.IZONE = sim.IZONE
-        SIM.Crops = SIM.Config.openCropFile(SIM.IZONE).Rows
+    ctx.Control = sim
+    if ctx.IZONE != sim.IZONE:
+        ctx.IZONE = sim.IZONE
+        ctx.Crops = ctx.Config.openCropFile(ctx.IZONE).Rows
 
-    SIM.Site = SIM.Sites[sim.WSITE]
-    return SIM.Site
+    ctx.Site = ctx.Sites[sim.WSITE]
+    return ctx.Site
 
 
-def initSoilSimulation(soilKey: int, soilIndex: int):
+def initSoilSimulation(ctx: SimulationContext, soilKey: int, soilIndex: int):
     """Init simulation for the specified soil."""
 
-    SIM.SOIL = soilKey
-    SIM.Soil = SIM.SoilProps[soilIndex]
-    print(f"{soilIndex}\tWEATHER SITE: {SIM.Control.WSITE}\tSOIL: {soilKey}")
-
-
-def initCropSimulation(crop: Crop):
+    ctx.SOIL = soilKey
+    ctx.Soil = ctx.SoilProps[soilIndex]
+    ctx.SoilTemperature = IsSoilTemperatureUsed(ctx)
+    print(f"{soilIndex}\tWEATHER SITE: {ctx.Control.WSITE}\tSOIL: {soilKey}")
+
+
+def simulateChain(ctx: SimulationContext, sim: SimControl, soilIndex: int, start: int = 0):
+    """Simulates all the crop-years of the site for the specified soil, the (site, soil) chain.
+    The crop-years before the start index are skipped, already simulated by a resumed run."""
+    initSimulation(ctx, sim)
+    initSoilSimulation(ctx, ctx.SoilProps[soilIndex].ISCODE, soilIndex)
+
+    # @ 749, DO 800 II=1,NORUNS
+    # Begins Sim loop for 1 to total years for this site.
+    II: int = 0
+    print(f"NORUNS: {len(ctx.Crops)}")
+    for crop in ctx.Crops:
+        assert crop.Index == II
+        II += 1
+        if crop.YR < ctx.Control.YEAR1:
+            break
+        if crop.Index < start:
+            continue
+
+        print(f"#{II} YEAR:{crop.YR}")
+
+        try:
+            initCropSimulation(ctx, crop)
+            performSimulation(ctx)
+        except Exception as err:
+            error = recordFailure(ctx, err)
+            policy = ctx.Config.ERROR_POLICY
+            if policy == ABORT: raise error
+            if policy == SKIP_CHAIN: break
+            continue
+        saveCheckpoint(ctx)
+
+    # The output of the chain is written before the next one starts.
+    ctx.OutputFiles.flush()
+    if ctx.ResultsDatabase is not None:
+        ctx.ResultsDatabase.insert(ctx.Results)
+
+
+def simulateSite(contexts: list, sim: SimControl, soilIndexes: list, start: int = 0):
+    """Simulates the chains of the site for the specified soils in lockstep, a crop-year at a time,
+    every soil on its own context. The soils go through the daily loop together, see DEPLT_BATCH.
+    The crop-years before the start index are skipped, already simulated by a resumed run.
+    A crop-year failing on a soil fails for that soil alone, the other soils simulate it again without it."""
+    for ctx, soilIndex in zip(contexts, soilIndexes):
+        initSimulation(ctx, sim)
+        initSoilSimulation(ctx, ctx.SoilProps[soilIndex].ISCODE, soilIndex)
+
+    # The soils whose chain goes on, every soil of the site reads the same crops from the zone CROPFILE.
+    chains = list(contexts)
+    fused: bool = contexts[0].Config.FUSED_LAYERS
+    print(f"NORUNS: {len(contexts[0].Crops)}")
+    for II, crop in enumerate(contexts[0].Crops):
+        assert crop.Index == II
+        if crop.YR < sim.YEAR1 or not chains:
+            break
+        if II < start:
+            continue
+
+        print(f"#{II + 1} YEAR:{crop.YR}")
+
+        soils = []
+        for ctx in list(chains):
+            try:
+                initCropSimulation(ctx, crop)
+                loadSimulationFiles(ctx)
+            except Exception as err:
+                skipSoil(ctx, err, chains)
+                continue
+            soils.append(ctx)
+
+        batch = simulateBatch(soils, chains, fused)
+        for k, ctx in enumerate(batch.Contexts if batch else ()):
+            try:
+                PrintBatchReports(batch, k)
+                finishSimulation(ctx)
+            except Exception as err:
+                skipSoil(ctx, err, chains)
+                continue
+            saveCheckpoint(ctx)
+
+    for ctx in contexts:
+        ctx.OutputFiles.flush()
+        if ctx.ResultsDatabase is not None:
+            ctx.ResultsDatabase.insert(ctx.Results)
+
+
+def simulateBatch(soils: list, chains: list, fused: bool) -> SoilBatch:
+    """Runs the daily loop of the crop-year for the soils in lockstep, returns the batch of the soils that
+    completed it, None if none did. When it fails on a soil, the failure is recorded for that soil and
+    the loop is run again from the start of the crop-year for the other soils."""
+    # The state carried over from the last crop-year, the loop changes it before failing.
+    carried = [saveCarriedState(ctx) for ctx in soils]
+    while soils:
+        batch = SoilBatch(soils, fused)
+        try:
+            DEPLT_BATCH(batch)
+            return batch
+        except Exception as err:
+            failed = [ctx for ctx in soils if ctx.SOIL == getattr(err, "SOIL", None)]
+            if not failed:
+                # TONOTE: Not raised for a soil of the batch, so every soil fails.
+                recordSiteFailure(soils, err, chains)
+                return None
+            k = soils.index(failed[0])
+            skipSoil(soils.pop(k), err, chains)
+            carried.pop(k)
+
+        # The title and headers are already printed, only the daily loop is run again.
+        for ctx, state in zip(soils, carried):
+            restoreCarriedState(ctx, state)
+            loadSimulationFiles(ctx, again=True)
+    return None
+
+
+def saveCarriedState(ctx: SimulationContext) -> tuple:
+    """Returns the state of the context that the daily loop reads before setting,
+    the last curve number and the per-layer values (see LAYER_ARRAYS)."""
+    return ctx.CURVNO, [list(getattr(ctx, name)) for name in LAYER_ARRAYS]
+
+
+def restoreCarriedState(ctx: SimulationContext, state: tuple):
+    """Restores the state saved by saveCarriedState."""
+    ctx.CURVNO, layers = state
+    for name, values in zip(LAYER_ARRAYS, layers):
+        setattr(ctx, name, values[:])
+
+
+def initCropSimulation(ctx: SimulationContext, crop: Crop):
     """Initializes the simulation for the specified crop data row."""
 
-    crop.WEAFILE = f"{SIM.Control.WSITE}{crop.YR}"
+    crop.WEAFILE = f"{ctx.Control.WSITE}{crop.YR}"
     print(f"{crop.Index}\t{crop.SIMFILE}\t{crop.WEAFILE}\t{crop.YR}")
-    SIM.CurrentCrop = crop
-    SIM.IYEAR = crop.YR
+    ctx.CurrentCrop = crop
+    ctx.IYEAR = crop.YR
 
     # TONOTE: @765, II is the index from the crop list, simulated or skipped
     # TOASK: It doesn't makes more sense to check the live condition
     # against the index of simulated crops ?
-    SIM.ISIM, SIM.IRIGNO = crop.Index, 0
+    ctx.ISIM, ctx.IRIGNO = crop.Index, 0
     # Set initial condition for live crops for wheat when 
     # simulating the second sequence of a wheat-fallow rotation
-    SIM.LIVECOND = SIM.ISIM > 0 and crop.YR < SIM.LASTYR and crop.SIMFILE == SIM.LASTSIMF
-    SIM.LASTSIMF, SIM.LASTYR = crop.SIMFILE, crop.YR
+    ctx.LIVECOND = ctx.ISIM > 0 and crop.YR < ctx.LASTYR and crop.SIMFILE == ctx.LASTSIMF
+    ctx.LASTSIMF, ctx.LASTYR = crop.SIMFILE, crop.YR
 
 
-def loadSimulationFiles():
-    """Loads the .WEA and .SIM for the current simulation."""
+def loadSimulationFiles(ctx: SimulationContext, again: bool = False):
+    """Loads the .WEA and .SIM for the current simulation.
+    Loaded again to rerun the crop-year in lockstep, the title and headers already printed aren't printed again."""
 
-    simFilename = os.path.join(SIM.Config.getZonePath(SIM.IZONE),
-                               f"{SIM.CurrentCrop.SIMFILE}.SIM")
+    simFilename = os.path.join(ctx.Config.getZonePath(ctx.IZONE),
+                               f"{ctx.CurrentCrop.SIMFILE}.SIM")
 
-    #    if simFilename == SIM.LASTSIMF:
+    #    if simFilename == ctx.LASTSIMF:
     #        reloadLastSimFile()
     #    else:
-    loadSimFile(SimFile(simFilename))
-    initSoilData()
-    setInitialConditions()
-    READWEAT(SIM.Site.NWSITE, SIM.CurrentCrop.YR)
+    loadSimFile(ctx, getSimFile(ctx, simFilename))
+    initSoilData(ctx)
+    setInitialConditions(ctx)
+    READWEAT(ctx, ctx.Site.NWSITE, ctx.CurrentCrop.YR)
 
     # @ 1049
     # initTillageDays()
 
-    initTillageDaysWithBranches()
+    initTillageDaysWithBranches(ctx)
 
     # @ 1079
-    openOutputFiles()
+    ctx.Plan = PrintPlan(ctx.PrintOut, ctx.Config, ctx.Control.WSITE, ctx.Site.NWSITE, ctx.SOIL, ctx.IYEAR)
+    if again: ctx.Plan.Title = ctx.Plan.Headers = False
+    openOutputFiles(ctx)
 
 
-def performSimulation():
+def performSimulation(ctx: SimulationContext):
     """Performs the simulation."""
-    loadSimulationFiles()
+    loadSimulationFiles(ctx)
     # @1110
-    DEPLT()
-    # @1114
-    calculateYield()
-
-    rewriteInitFile()
+    DEPLT(ctx)
+    finishSimulation(ctx)
 
-    # Do Output @1165~1215
-    SIM.writeYearRow()
-
-    if SIM.PrintOut.IPFLAG > 3:
-        PrintInputSummary()
 
-    SIM.closeFiles()
+def finishSimulation(ctx: SimulationContext):
+    """Computes the yield and writes the results once the daily loop is done."""
+    # @1114
+    calculateYield(ctx)
 
+    rewriteInitFile(ctx)
 
-def loadSimFile(file: SimFile):
+    # Do Output @1165~1215
+    ctx.writeYearRow()
+    ctx.releaseRows()
+
+    if ctx.Plan.InputSummary:
+        PrintInputSummary(ctx)
+
+    ctx.closeFiles()
+
+
+def saveCheckpoint(ctx: SimulationContext):
+    """Records the crop-year completed into the run journal, once its results are written."""
+    if ctx.Journal is None:
+        return
+    if ctx.ResultsDatabase is not None:
+        ctx.ResultsDatabase.insert(ctx.Results)
+    ctx.Journal.record(ctx)
+
+
+def recordFailure(ctx: SimulationContext, err: Exception) -> SimulationError:
+    """Records the failure of the current crop-year, returns the SimulationError recorded, to raise
+    when the error policy aborts the run. Any other error is recorded as a SimulationError on the
+    current day, caused by the error and reported with its traceback, as the errors of a soil in lockstep."""
+    # The daily rows are written up to the day it failed, as when printed every day.
+    PrintDailyReport(ctx)
+    ctx.dropRows()
+    trace = ""
+    error = SimulationError.fromError(ctx, err)
+    cause = error.__cause__
+    if type(error) is SimulationError and cause is not None:
+        # TONOTE: Not a failure of the simulated crop-year, maybe a bug, so its traceback is kept.
+        trace = "".join(traceback.format_exception(type(cause), cause, cause.__traceback__))
+    policy = ctx.Config.ERROR_POLICY
+    if policy != ABORT:
+        print(f"{error}, {policy}")
+        if trace: print(trace, end="")
+    ctx.Failures.record(Failure.fromError(error, policy, trace))
+    return error
+
+
+def skipSoil(ctx: SimulationContext, err: Exception, chains: list):
+    """Records the failure of the current crop-year of a soil simulated in lockstep, its chain is
+    removed from the chains going on under skip-chain. Raises the SimulationError recorded when
+    the error policy aborts the run."""
+    error = recordFailure(ctx, err)
+    policy = ctx.Config.ERROR_POLICY
+    if policy == ABORT: raise error
+    if policy == SKIP_CHAIN: chains.remove(ctx)
+
+
+def recordSiteFailure(contexts: list, err: Exception, chains: list):
+    """Records the failure of the current crop-year for every soil simulated in lockstep,
+    when the soil it failed on is not known. Raises the SimulationError recorded when
+    the error policy aborts the run."""
+    error = recordFailure(contexts[0], err)
+    policy = contexts[0].Config.ERROR_POLICY
+    for ctx in contexts[1:]:
+        PrintDailyReport(ctx)
+        ctx.dropRows()
+        ctx.Failures.record(Failure.fromError(
+            SimulationError(ctx, f"Simulated in lockstep with soil {contexts[0].SOIL}"), policy))
+    if policy == ABORT: raise error
+    if policy == SKIP_CHAIN:
+        for ctx in contexts:
+            chains.remove(ctx)
+
+
+def getSimFile(ctx: SimulationContext, simFilename: str) -> SimFile:
+    """Returns a copy of the .SIM file for the current crop, reading it only the first time."""
+    key = (ctx.IZONE, ctx.CurrentCrop.SIMFILE)
+    file: SimFile = ctx.SimFiles.get(key)
+    if file is None:
+        file = ctx.SimFiles[key] = SimFile(simFilename)
+    return file.clone()
+
+
+def loadSimFile(ctx: SimulationContext, file: SimFile):
     """Loads the specified .SIM file into the global data module."""
-    SIM.Sim = file
-    SIM.RZMAX = file.RZMAX
-    SIM.RZMGMT = file.RZMGMT
+    ctx.Sim = file
+    ctx.RZMAX = file.RZMAX
+    ctx.RZMGMT = file.RZMGMT
 
     if file.Irrigation.IRRTYP != IrrigationTypes.HistoricalDates:
-        SIM.ALPHA1 = 0.0
+        ctx.ALPHA1 = 0.0
 
     # Adjust the maximum and management root depths based on the soil type.
     # Depths are reduced for soils in the 300-600 series.
@@ -115,108 +325,110 @@ def loadSimFile(file: SimFile):
         # encoded as the first digit of the digit code
         # TONOTE: Here soilRz is a float that takes 4.11 from the soil code
         # 
-        soilRz = SIM.Soil.AvailableWaterHoldingCapacity
+        soilRz = ctx.Soil.AvailableWaterHoldingCapacity
         rzFact = min((0.6 + 0.4 * (float(soilRz) - 3.0) / 4.0), 1.0)
-        SIM.RZMAX *= rzFact
-        SIM.RZMGMT *= rzFact
+        ctx.RZMAX *= rzFact
+        ctx.RZMGMT *= rzFact
 
 
-def initSoilData():
+def initSoilData(ctx: SimulationContext):
     """Initialize soil data."""
 
-    loadInitialData()
+    loadInitialData(ctx)
 
     # @976 
-    SIM.SATWC = 1.0 - SIM.Soil.BULKD / 2.65
+    ctx.SATWC = 1.0 - ctx.Soil.BULKD / 2.65
 
-    SIM.PWP = SIM.Soil.PWP[:]
+    ctx.PWP = ctx.Soil.PWP[:]
     # DRNCOE & DRNDAY are found in Soil properties.
-    SIM.TOTDEP, SIM.DPLBG = 0.0, 0.0
-    for i in range(SIM.Sim.LAYERS):
-        DEPTH: float = SIM.BLOC.DEPTH[i]
-        SIM.CENTER[i] = SIM.TOTDEP + DEPTH * 0.5
-        RDEPTH: float = SIM.CENTER[i] / SIM.RZMAX
+    ctx.TOTDEP, ctx.DPLBG = 0.0, 0.0
+    for i in range(ctx.Sim.LAYERS):
+        DEPTH: float = ctx.BLOC.DEPTH[i]
+        ctx.CENTER[i] = ctx.TOTDEP + DEPTH * 0.5
+        RDEPTH: float = ctx.CENTER[i] / ctx.RZMAX
         if RDEPTH > 1.0: RDEPTH = 1.0
         D = exp(-2.303 * RDEPTH ** 4.462)
         # TONOTE: Here PWP is both R/W, I guess the original programmers
         # were aware of the proper order or reading/writing.
-        SIM.AVMFT[i] = (SIM.Soil.FIELDC[i] - SIM.PWP[i]) * DEPTH
-        SIM.PWP[i] += (SIM.Soil.FIELDC[i] - SIM.PWP[i]) * (1.0 - D)
+        ctx.AVMFT[i] = (ctx.Soil.FIELDC[i] - ctx.PWP[i]) * DEPTH
+        ctx.PWP[i] += (ctx.Soil.FIELDC[i] - ctx.PWP[i]) * (1.0 - D)
         # The new value of PWP is being used here por PAWFT.
-        SIM.PAWFT[i] = (SIM.Soil.FIELDC[i] - SIM.PWP[i]) * DEPTH
+        ctx.PAWFT[i] = (ctx.Soil.FIELDC[i] - ctx.PWP[i]) * DEPTH
+
+        ctx.DPLBG += (ctx.Soil.FIELDC[i] - ctx.THETA[i]) * DEPTH
+        ctx.TOTDEP += DEPTH
 
-        SIM.DPLBG += (SIM.Soil.FIELDC[i] - SIM.THETA[i]) * DEPTH
-        SIM.TOTDEP += DEPTH
+    ctx.Runoff = RunoffConstants(ctx)
 
     # @922
 
 
-def setInitialConditions():
+def setInitialConditions(ctx: SimulationContext):
     """Sets the initial simulation conditions."""
 
     # Load initial data.
-    # initFile = InitialFile(os.path.join(SIM.Config.InputPath, \
-    # os.path.normpath(SIM.Config.INITFILE)))
+    # initFile = InitialFile(os.path.join(ctx.Config.InputPath, \
+    # os.path.normpath(ctx.Config.INITFILE)))
     # TODO: By now, not loading/rewriting the Initial file, 
     # using the Default at program start and using memory copy.
 
     # TOASK: @985 Why not LIVECROP = LIVECOND ?
-    if SIM.LIVECOND: SIM.LIVECROP = True
+    if ctx.LIVECOND: ctx.LIVECROP = True
     # Set intial conditions for residue for grain and tuber crops
     # Set residue to default value for other crops
-    SIM.RESIDUE = SIM.OLDRES if SIM.Sim.CROP < 10 else 100.0
+    ctx.RESIDUE = ctx.OLDRES if ctx.Sim.CROP < 10 else 100.0
     # Set starting conditions for winter wheat.
-    if SIM.Sim.CROP == 7:
-        SIM.JDYPLT = DAYOFYR(SIM.Sim.IMPLT, SIM.Sim.IDPLT)
-        SIM.JFPLT = SIM.JDYPLT
+    if ctx.Sim.CROP == 7:
+        ctx.JDYPLT = DAYOFYR(ctx.Sim.IMPLT, ctx.Sim.IDPLT)
+        ctx.JFPLT = ctx.JDYPLT
         # If the crop is irrigated or the tillage flag is set to continuous
         # then the crop is alive at the start of the simulation
         # TONOTE: Why to change the tillage flag?
-        if SIM.Sim.Irrigation.IRRTYP > 1 or SIM.Sim.ITFLAG > 2:
-            SIM.LIVECROP = True
-        elif not SIM.LIVECROP:
-            SIM.Sim.ITFLAG = TillageFlags.Fallow
+        if ctx.Sim.Irrigation.IRRTYP > 1 or ctx.Sim.ITFLAG > 2:
+            ctx.LIVECROP = True
+        elif not ctx.LIVECROP:
+            ctx.Sim.ITFLAG = TillageFlags.Fallow
         # If the crop is alive set the greenup date to March 15 and 
         # the planting date is set to a negative number to indicate
         #  that the crop was planted before the start of this year.
-        if SIM.LIVECROP:
-            SIM.Sim.IMPLT = 3
-            SIM.Sim.IDPLT = 15
-            if SIM.Sim.Irrigation.IRRTYP == 1 and SIM.Sim.ITFLAG < 3:
-                SIM.JFPLT = -999
+        if ctx.LIVECROP:
+            ctx.Sim.IMPLT = 3
+            ctx.Sim.IDPLT = 15
+            if ctx.Sim.Irrigation.IRRTYP == 1 and ctx.Sim.ITFLAG < 3:
+                ctx.JFPLT = -999
     else:
-        SIM.LIVECROP = False
-        SIM.JFPLT = -999
+        ctx.LIVECROP = False
+        ctx.JFPLT = -999
 
     # DPLBG accumulation made in the previous loop in initSoilData()
 
-    SIM.DRAIND = SIM.Soil.DRNDAY
-    SIM.DCOEFF = SIM.Soil.DRNCOE
+    ctx.DRAIND = ctx.Soil.DRNDAY
+    ctx.DCOEFF = ctx.Soil.DRNCOE
 
     # Compute Day Of Year For Special Days
-    SIM.JDYBG = DAYOFYR(SIM.Sim.IMBG, SIM.Sim.IDBG)
-    SIM.JDYEND = DAYOFYR(SIM.Sim.IMEND, SIM.Sim.IDEND)
-    SIM.JDYPLT = DAYOFYR(SIM.Sim.IMPLT, SIM.Sim.IDPLT)
-    print(f"Simulating from DAY {SIM.JDYBG} to {SIM.JDYEND}")
+    ctx.JDYBG = DAYOFYR(ctx.Sim.IMBG, ctx.Sim.IDBG)
+    ctx.JDYEND = DAYOFYR(ctx.Sim.IMEND, ctx.Sim.IDEND)
+    ctx.JDYPLT = DAYOFYR(ctx.Sim.IMPLT, ctx.Sim.IDPLT)
+    print(f"Simulating from DAY {ctx.JDYBG} to {ctx.JDYEND}")
 
 
-def initTillageDaysWithBranches():
+def initTillageDaysWithBranches(ctx: SimulationContext):
     """CONVERT TILLAGE DAYS TO THE DAY OF THE YEAR RATHER THAN
     THE DAYS BEFORE PLANTING, AFTER PLANTING OR AFTER MATURITY."""
-    for i in range(SIM.Sim.NTILLS):
-        till: TillageOperation = SIM.Sim.TillageOperations[i]
-        if SIM.Sim.CROP != 7:
+    for i in range(ctx.Sim.NTILLS):
+        till: TillageOperation = ctx.Sim.TillageOperations[i]
+        if ctx.Sim.CROP != 7:
             if till.ITILTM == 1:
-                till.TILDAY = SIM.JDYPLT - till.TILDAY
+                till.TILDAY = ctx.JDYPLT - till.TILDAY
             elif till.ITILTM == 2:
-                till.TILDAY += SIM.JDYPLT
+                till.TILDAY += ctx.JDYPLT
             elif till.ITILTM == 3:
-                till.TILDAY += SIM.JDYMAT
-        elif not SIM.LIVECROP:
+                till.TILDAY += ctx.JDYMAT
+        elif not ctx.LIVECROP:
             if till.ITILTM == 1:
-                till.TILDAY = SIM.JDYPLT - till.TILDAY
+                till.TILDAY = ctx.JDYPLT - till.TILDAY
             elif till.ITILTM == 2:
-                till.TILDAY += SIM.JDYPLT
+                till.TILDAY += ctx.JDYPLT
             elif till.ITILTM == 3:
                 till.TILDAY += 367
         else:
@@ -225,86 +437,87 @@ def initTillageDaysWithBranches():
             elif till.ITILTM == 2:
                 till.TILDAY = -999 + till.TILDAY
             elif till.ITILTM == 3:
-                till.TILDAY += SIM.JDYMAT
+                till.TILDAY += ctx.JDYMAT
         # TODO: Check if the values in Sim are actually changed without re-assigment
-        SIM.Sim.TillageOperations[i] = till
+        ctx.Sim.TillageOperations[i] = till
 
 
-def openOutputFiles():
+def openOutputFiles(ctx: SimulationContext):
     """Open output files."""
     # TODO: Continue @1079 Open Output Files
-    SIM.openMonFile()
-    SIM.openYearFile()
-    SIM.openPrecipFile()
-    SIM.openOutFile()
-    SIM.openProfileFile()
+    # The YIELD_ONLY runs only write the YR file.
+    if not ctx.Plan.Summaries:
+        ctx.openYearFile()
+        return
+    ctx.openMonFile()
+    ctx.openYearFile()
+    ctx.openPrecipFile()
+    ctx.openOutFile()
+    ctx.openProfileFile()
 
     # Print Header for Out File
-    pout = SIM.PrintOut
-    if pout.IPFLAG > 1 and (pout.IPSOIL == SIM.SOIL or SIM.Config.PRINT_ALL_SOILS):
-        if pout.JPRSTR <= SIM.IYEAR <= pout.JPRSTP:
-            if SIM.Site.NWSITE in pout.PRSITE:
-                # WRITE(7,450)WEAFILE(II),ICROP(CROP),SOIL,SIMFILE(II),ITFLAG,IHYGRP
-                # FORMAT(1X,A12/5X,A8,5X,'SOIL CODE:',I4,5X,'CROP/IRR/TILL: ',
-                # A8,5X,'TILL CODE: ',I3,5X,'HYDRO GROUP: ', I2/159('-'))
-                crop = SIM.CurrentCrop
-                IHYGRP = SIM.Soil.HydrologicGroup
-                SIM.outFile.write((
-                    f" {crop.WEAFILE:<12}\n     {SIM.Sim.CROP.getName(SIM.Config.LEGACY):<8}"
-                    f"     SOIL CODE: {SIM.SOIL:>4}     CROP/IRR/TILL: {crop.SIMFILE:<8}     "
-                    f"TILL CODE: {SIM.Sim.ITFLAG:>3}     HYDROGROUP: {IHYGRP:>2}\n{'*' * 159}\n"
-                ))
-
-
-def loadInitialData():
+    if ctx.Plan.Title:
+        # WRITE(7,450)WEAFILE(II),ICROP(CROP),SOIL,SIMFILE(II),ITFLAG,IHYGRP
+        # FORMAT(1X,A12/5X,A8,5X,'SOIL CODE:',I4,5X,'CROP/IRR/TILL: ',
+        # A8,5X,'TILL CODE: ',I3,5X,'HYDRO GROUP: ', I2/159('-'))
+        crop = ctx.CurrentCrop
+        IHYGRP = ctx.Soil.HydrologicGroup
+        ctx.outFile.write((
+            f" {crop.WEAFILE:<12}\n     {ctx.Sim.CROP.getName(ctx.Config.LEGACY):<8}"
+            f"     SOIL CODE: {ctx.SOIL:>4}     CROP/IRR/TILL: {crop.SIMFILE:<8}     "
+            f"TILL CODE: {ctx.Sim.ITFLAG:>3}     HYDROGROUP: {IHYGRP:>2}\n{'*' * 159}\n"
+        ))
+
+
+def loadInitialData(ctx: SimulationContext):
     """Writes the initial data to the simulation shared space."""
-    SIM.THETA = SIM.InitialData.THETA[:]
-    SIM.OLDCRP = SIM.InitialData.CROP
-    SIM.OLDRES = SIM.InitialData.RESIDUE
+    ctx.THETA = ctx.InitialData.THETA[:]
+    ctx.OLDCRP = ctx.InitialData.CROP
+    ctx.OLDRES = ctx.InitialData.RESIDUE
 
-    SIM.LIVECROP = SIM.InitialData.LIVECROP
-    SIM.SNOTMP = SIM.InitialData.SNOTMP
-    SIM.SNOH2O = SIM.InitialData.SNOH2O
+    ctx.LIVECROP = ctx.InitialData.LIVECROP
+    ctx.SNOTMP = ctx.InitialData.SNOTMP
+    ctx.SNOH2O = ctx.InitialData.SNOH2O
 
-    SIM.SOILT = SIM.InitialData.SOILT[:]
+    ctx.SOILT = ctx.InitialData.SOILT[:]
 
 
-def rewriteInitFile():
+def rewriteInitFile(ctx: SimulationContext):
     """Rewrites the INITFILE."""
     # TODO: By now using an in-memory Initial file.
     # @1148
 
-    SIM.InitialData.THETA = SIM.THETA[:]
-    SIM.InitialData.CROP = SIM.Sim.CROP
-    SIM.InitialData.RESIDUE = SIM.RESIDUE
+    ctx.InitialData.THETA = ctx.THETA[:]
+    ctx.InitialData.CROP = ctx.Sim.CROP
+    ctx.InitialData.RESIDUE = ctx.RESIDUE
 
-    SIM.InitialData.LIVECROP = SIM.LIVECROP
-    SIM.InitialData.SNOTMP = SIM.SNOTMP
-    SIM.InitialData.SNOH2O = SIM.SNOH2O
+    ctx.InitialData.LIVECROP = ctx.LIVECROP
+    ctx.InitialData.SNOTMP = ctx.SNOTMP
+    ctx.InitialData.SNOH2O = ctx.SNOH2O
 
-    SIM.InitialData.SOILT = SIM.SOILT[:]
+    ctx.InitialData.SOILT = ctx.SOILT[:]
 
 
-def calculateYield():
+def calculateYield(ctx: SimulationContext):
     """Calculate Yield If There Is A Growing Crop"""
     # From @1114 to 1146
 
     # Calculate Yield If There Is A Growing Crop
-    if SIM.Sim.ITFLAG > 0:
-        YIELDS()
+    if ctx.Sim.ITFLAG > 0:
+        YIELDS(ctx)
     else:
-        SIM.YIELD = 0.0
-        SIM.YLDRATIO = 0.0
+        ctx.YIELD = 0.0
+        ctx.YLDRATIO = 0.0
 
     # Update the initial water content and residue for 
     # next year and reset the livecrop flag for winter wheat.
     # TONOTE: I guess that the initial water content and 
     # residue for next is already updated in YIELDS()
-    if SIM.Sim.CROP == CropId.WinterWheat:
+    if ctx.Sim.CROP == CropId.WinterWheat:
         # If the wheat crop was alive at the start of the year it was harvested
         # and is now dead for wheat-fallow rotations. Conversely if it started
         # the year as dead, it was planted in the fall and is now alive.
-        SIM.LIVECROP = (not SIM.LIVECROP) if SIM.Sim.Irrigation.IRRTYP == 1 \
-                                             and SIM.Sim.ITFLAG < 3 else True
+        ctx.LIVECROP = (not ctx.LIVECROP) if ctx.Sim.Irrigation.IRRTYP == 1 \
+                                             and ctx.Sim.ITFLAG < 3 else True
     else:
-        SIM.LIVECROP = False
+        ctx.LIVECROP = False
@@ -1,12 +1,12 @@
 """Implementation module for the DEPLT subroutine. Lines (1849~2744)"""
 
-import sys
 from aenum import IntEnum
-import SIM
+from SimulationContext import SimulationContext
 import Fortran
 from Data.Crop import CropId
 from Data.Tillage import TillageOperation
-from Data.Summary import WeeklyData, MonthlyData
+from Data.Summary import MonthlyData, MONTH_STARTS
+from Files.DailyReport import renderOutRows, renderProfileRows
 
 # from Subroutines.ROOTZN import ROOTZN
 from Subroutines.SNOWMELT import SNOWMELT
@@ -19,7 +19,12 @@ from Subroutines.DAYS import CALDAY
 from Subroutines.EVAP_MOD import EVAP
 from Subroutines.ROOTZN_MOD import ROOTZN
 
-from Errors.CustomError import TransLoopConvergenceError
+from Errors.CustomError import TransLoopConvergenceError, EffectivePrecipitationError, NegativeRunoffError
+
+MAX_UPTAKE_TRIES: int = 20
+"""Passes over the layers the uptake loop makes before raising a TransLoopConvergenceError.
+TONOTE: The Fortran code stops after the 20th pass, here the pass is counted after the check,
+so a 21st pass is made."""
 
 
 class ContinueTo(IntEnum):
@@ -37,124 +42,125 @@ class ContinueTo(IntEnum):
 # The following methods don't use variables of the Depletion class.
 
 
-def ComputeWaterDepletion():
+def ComputeWaterDepletion(ctx: SimulationContext):
     """Compute Available Water Depletion."""
-    SIM.AWDPLN = 0.0
-    RZMGMT = SIM.RZMGMT
+    ctx.AWDPLN = 0.0
+    RZMGMT = ctx.RZMGMT
 
     depth: float = 0.0
     FDEPTH: float = 0.0
     TOPDEP: float = 0.0  # Top depth of a soil layer.
     BOTDEP: float = 0.0  # Bottom depth of a soil layer.
-    for i in range(SIM.Sim.LAYERS):
-        depth = SIM.BLOC.DEPTH[i]
+    for i in range(ctx.Sim.LAYERS):
+        depth = ctx.BLOC.DEPTH[i]
         TOPDEP = BOTDEP
         BOTDEP += depth
 
         if BOTDEP <= RZMGMT:
-            SIM.DEPL[i] = (SIM.Soil.FIELDC[i] - SIM.THETA[i]) * depth * SIM.PERRZD[i]
-            SIM.AWDPLN += SIM.DEPL[i]
+            ctx.DEPL[i] = (ctx.Soil.FIELDC[i] - ctx.THETA[i]) * depth * ctx.PERRZD[i]
+            ctx.AWDPLN += ctx.DEPL[i]
             # TONOTE: Bad practice to compare floats this way.
             # This is only safe if both values can be represented as fractions of integers.
-            if SIM.RZMGMT == BOTDEP: return
+            if ctx.RZMGMT == BOTDEP: return
             # if abs(RZMGMT - BOTDEP) < 0.001: return
 
         if TOPDEP < RZMGMT < BOTDEP:
-            FDEPTH = SIM.PERRZD[i] if SIM.RZD < RZMGMT else (RZMGMT - TOPDEP) / depth
-            SIM.DEPL[i] = (SIM.Soil.FIELDC[i] - SIM.THETA[i]) * depth * FDEPTH
-            SIM.AWDPLN += SIM.DEPL[i]
+            FDEPTH = ctx.PERRZD[i] if ctx.RZD < RZMGMT else (RZMGMT - TOPDEP) / depth
+            ctx.DEPL[i] = (ctx.Soil.FIELDC[i] - ctx.THETA[i]) * depth * FDEPTH
+            ctx.AWDPLN += ctx.DEPL[i]
             return
 
 
-def ComputeAvailableWaterDepletion():
+def ComputeAvailableWaterDepletion(ctx: SimulationContext):
     """Compute Available Water Depletion to see if irrigation is needed."""
     # @2032
-    ComputeWaterDepletion()
+    ComputeWaterDepletion(ctx)
 
-    SIM.DPLA = SIM.AWATER * SIM.Sim.Irrigation.PAD[SIM.KSTG - 1]
+    ctx.DPLA = ctx.AWATER * ctx.Sim.Irrigation.PAD[ctx.KSTG - 1]
 
 
-def ComputeFinalSoilWaterDepletions():
+def ComputeFinalSoilWaterDepletions(ctx: SimulationContext):
     """Compute Final Soil Water Depletion."""
-    SIM.DPLN = 0.0
-    for i in range(SIM.Sim.LAYERS):
-        SIM.DPLN += (SIM.Soil.FIELDC[i] - SIM.THETA[i]) * SIM.BLOC.DEPTH[i]
+    ctx.DPLN = 0.0
+    for i in range(ctx.Sim.LAYERS):
+        ctx.DPLN += (ctx.Soil.FIELDC[i] - ctx.THETA[i]) * ctx.BLOC.DEPTH[i]
 
-    ComputeWaterDepletion()
+    ComputeWaterDepletion(ctx)
 
 
-def ComputeAmountOfWaterStoredInSoilProfile():
+def ComputeAmountOfWaterStoredInSoilProfile(ctx: SimulationContext):
     """Computes the amount of water stored in soil profile."""
-    SIM.TOTWAT = 0.0
-    for i in range(SIM.Sim.LAYERS):
-        SIM.TOTWAT += SIM.THETA[i] * SIM.BLOC.DEPTH[i]
+    ctx.TOTWAT = 0.0
+    for i in range(ctx.Sim.LAYERS):
+        ctx.TOTWAT += ctx.THETA[i] * ctx.BLOC.DEPTH[i]
 
 
-def DetermineGrowthStage():
+def DetermineGrowthStage(ctx: SimulationContext):
     """Determine the growth stage for grain, tuber and forage crops."""
     # TONOTE: Fully revised method.
     # Implements Fortran code lines (1994~2004)
-    SIM.KSTG = 1
-    if SIM.Sim.CROP < 12:
-        if SIM.GDD > SIM.Sim.GDD.FLO:
-            SIM.KSTG = 2
+    ctx.KSTG = 1
+    if ctx.Sim.CROP < 12:
+        if ctx.GDD > ctx.Sim.GDD.FLO:
+            ctx.KSTG = 2
 
-        if SIM.GDD > SIM.Sim.GDD.RIPE:
-            SIM.KSTG = 3
+        if ctx.GDD > ctx.Sim.GDD.RIPE:
+            ctx.KSTG = 3
 
-        if SIM.Sim.CROP.isForage():
-            SIM.KSTG = SIM.ICUT
+        if ctx.Sim.CROP.isForage():
+            ctx.KSTG = ctx.ICUT
 
-    elif SIM.GDD > SIM.Sim.GDD.EFC:
-        SIM.KSTG = 2
+    elif ctx.GDD > ctx.Sim.GDD.EFC:
+        ctx.KSTG = 2
 
 
-def AdjustResidueCover():
+def AdjustResidueCover(ctx: SimulationContext):
     """Adjust the amount of residue cover for tillage on row crops & grains after crop maturity"""
 
     # Label 120
-    SIM.KC = SIM.CROPKC[SIM.JDAY - 1]
-    if SIM.Sim.CROP < 10:
-        if SIM.JDAY == SIM.JDYMAT:
-            if SIM.Sim.CROP != CropId.WinterWheat or SIM.LIVECROP:
-                YIELDS()
-                ICROP: int = SIM.Sim.CROP - 1
-                SIM.RESIDUE = SIM.YIELD * SIM.BLOC.YDENS[ICROP] * SIM.BLOC.RESRAT[ICROP]
-                SIM.OLDCRP = SIM.Sim.CROP
-        for i in range(SIM.Sim.NTILLS):
-            tillage: TillageOperation = SIM.Sim.TillageOperations[i]
-            if SIM.JDAY == tillage.TILDAY:
-                SIM.RESIDUE *= SIM.Tillages.GetFactor(tillage.TILCOD, SIM.BLOC.FRAGIL[SIM.OLDCRP - 1])
-
-
-def PrintHeaders():
+    ctx.KC = ctx.CROPKC[ctx.JDAY - 1]
+    if ctx.Sim.CROP < 10:
+        if ctx.JDAY == ctx.JDYMAT:
+            if ctx.Sim.CROP != CropId.WinterWheat or ctx.LIVECROP:
+                YIELDS(ctx)
+                ICROP: int = ctx.Sim.CROP - 1
+                ctx.RESIDUE = ctx.YIELD * ctx.BLOC.YDENS[ICROP] * ctx.BLOC.RESRAT[ICROP]
+                ctx.OLDCRP = ctx.Sim.CROP
+        for i in range(ctx.Sim.NTILLS):
+            tillage: TillageOperation = ctx.Sim.TillageOperations[i]
+            if ctx.JDAY == tillage.TILDAY:
+                ctx.RESIDUE *= ctx.Tillages.GetFactor(tillage.TILCOD, ctx.BLOC.FRAGIL[ctx.OLDCRP - 1])
+
+
+def PrintHeaders(ctx: SimulationContext):
     """Prints the report headers."""
     # (lines 1946~1970)
-    if SIM.PrintOut.IPFLAG > 0 and (SIM.PrintOut.IPSOIL == SIM.SOIL or SIM.Config.PRINT_ALL_SOILS):
-        if SIM.PrintOut.JPRSTR <= SIM.IYEAR <= SIM.PrintOut.JPRSTP \
-                and SIM.Control.WSITE in SIM.PrintOut.PRSITE:
-            SIM.outFile.write((
-                f"{' ' * 8}DAILY  TOTAL  TOTAL  TOTAL  TOTAL   NET   GROSS  GROSS   NET    SNOW"
-                f"{' ' * 31}TOTAL CROP TOTAL AWATER       ROOT PLANT  HOLD TOTAL\n"
-                "  DATE   ETR    ETR    EVAP  TRANS    ET   IRRIG  IRRIG PRECIP PRECIP"
-                "    H2O   RUNON  CURVE  RESIDUE   GDD DRAIN "
-                f"COEF  DEPL  DEPL  DEPL DEPTH WATER  CAPA WATER\n     {'     IN' * 11}      NO.   "
-                f"LB/AC     F     IN{' ' * 9}{'IN    ' * 1}% {'    IN' * 4}\n{'-' * 159}\n{' ' * 70}"
-                f"{SIM.SNOH2O:>6.3f}{' ' * 77}{SIM.TOTWAT:>6.2f}\n"))
-            # TONOTE: There's no space between RUNON and AWDPLN headers here.
-            SIM.profileFile.write((
-                " DATE  DFRACT EXTRA DIST  DET DRAIN DNETIR DINF RUNONAWDPLN DPLA"
-                f"{' ' * 16}VOLUMETRIC WATER CONTENTS{' ' * 30}SOIL TEMPERATURE, F\n{'-' * 163}\n"))
-
-
-def PrintWeeklySummary():
+    if ctx.Plan.Headers:
+        ctx.outFile.write((
+            f"{' ' * 8}DAILY  TOTAL  TOTAL  TOTAL  TOTAL   NET   GROSS  GROSS   NET    SNOW"
+            f"{' ' * 31}TOTAL CROP TOTAL AWATER       ROOT PLANT  HOLD TOTAL\n"
+            "  DATE   ETR    ETR    EVAP  TRANS    ET   IRRIG  IRRIG PRECIP PRECIP"
+            "    H2O   RUNON  CURVE  RESIDUE   GDD DRAIN "
+            f"COEF  DEPL  DEPL  DEPL DEPTH WATER  CAPA WATER\n     {'     IN' * 11}      NO.   "
+            f"LB/AC     F     IN{' ' * 9}{'IN    ' * 1}% {'    IN' * 4}\n{'-' * 159}\n{' ' * 70}"
+            f"{ctx.SNOH2O:>6.3f}{' ' * 77}{ctx.TOTWAT:>6.2f}\n"))
+        # TONOTE: There's no space between RUNON and AWDPLN headers here.
+        ctx.profileFile.write((
+            " DATE  DFRACT EXTRA DIST  DET DRAIN DNETIR DINF RUNONAWDPLN DPLA"
+            f"{' ' * 16}VOLUMETRIC WATER CONTENTS{' ' * 30}SOIL TEMPERATURE, F\n{'-' * 163}\n"))
+
+
+def PrintWeeklySummary(ctx: SimulationContext):
     """Print Weekly Summaries"""
 
     for i in range(52):
-        SIM.precipFile.write((
-            f'{SIM.Control.WSITE},{SIM.IYEAR:>5},{(i + 1):>3},{SIM.SOIL:>4},{SIM.Sim.CROP:>3},'
-            f"{SIM.Sim.ITFLAG:>2},{SIM.Sim.Irrigation.IRRTYP:>2},{SIM.Sim.ITERRC:>2},"
-            f"{SIM.WEEK[i].toPrecipFile()}\n"))
+        ctx.precipFile.write((
+            f'{ctx.Control.WSITE},{ctx.IYEAR:>5},{(i + 1):>3},{ctx.SOIL:>4},{ctx.Sim.CROP:>3},'
+            f"{ctx.Sim.ITFLAG:>2},{ctx.Sim.Irrigation.IRRTYP:>2},{ctx.Sim.ITERRC:>2},"
+            f"{ctx.WEEK[i].toPrecipFile()}\n"))
+
+    if ctx.Results is not None:
+        ctx.Results.addWeeks(ctx)
 
 
 class DepletionData:
@@ -162,35 +168,36 @@ class DepletionData:
     __slots__ = ("DDINF", "DET", "DFRACT", "DIST", "DISTD", "DNETI", "DPLPER", "DRAIN", "DRNOFF", "E", "EOFF", "EPMAX",
                  "ES", "ET", "ETOFF", "ETROFF", "ETRS", "EVEG", "EXTRA", "IPRINT", "JDYWET", "PERDEP", "RNOFF",
                  "RUNONS", "T", "TOFF", "TP", "TRANS", "TS", "TUP", "TUSE", "TVEG", "TWAIT", "TWEIGH", "UPTAKE",
-                 "WAVAIL")
+                 "WAVAIL", "Context")
 
-    def __init__(self):
+    def __init__(self, ctx: SimulationContext):
         """Initializes the values as they as required before starting the loop."""
-        SIM.AWATER = 0.0
-        SIM.DRAINS = 0.0
-        SIM.EPRECIPS = 0.0
-        SIM.ETMAX = 0.0
-        SIM.ETS = 0.0  # @1958
-        SIM.ETYLD = 0.0
-        SIM.ICUT = 1
-        SIM.IRIGNO = 0
-        SIM.JNEXTI = 1.0
-        SIM.KSTG = 0
-        SIM.PRECIPS = 0.0
-        SIM.SGRIRR = 0.0
-        SIM.SNIRR = 0.0
-        SIM.TDEFS = 0.0
-        SIM.RZD = SIM.Sim.RZMIN
-        SIM.TPS = ([0.0] * 5)[:]
-        SIM.TDEF = ([0.0] * 5)[:]
-        SIM.PERRZD = ([0.0] * 10)[:]
-        SIM.MON.clear()
-        for _ in range(12): SIM.MON.append(MonthlyData())
-        SIM.WEEK.clear()
-        for _ in range(53): SIM.WEEK.append(WeeklyData())
-
-        self.JDYWET = SIM.JDYBG - 1
-        SIM.TIME = float(self.JDYWET)
+        self.Context = ctx
+        """The simulation context."""
+
+        ctx.AWATER = 0.0
+        ctx.DRAINS = 0.0
+        ctx.EPRECIPS = 0.0
+        ctx.ETMAX = 0.0
+        ctx.ETS = 0.0  # @1958
+        ctx.ETYLD = 0.0
+        ctx.ICUT = 1
+        ctx.IRIGNO = 0
+        ctx.JNEXTI = 1.0
+        ctx.KSTG = 0
+        ctx.PRECIPS = 0.0
+        ctx.SGRIRR = 0.0
+        ctx.SNIRR = 0.0
+        ctx.TDEFS = 0.0
+        ctx.RZD = ctx.Sim.RZMIN
+        ctx.TPS = ([0.0] * 5)[:]
+        ctx.TDEF = ([0.0] * 5)[:]
+        ctx.PERRZD = ([0.0] * 10)[:]
+        ctx.Fluxes.clear()
+        ctx.DailyReport.clear()
+
+        self.JDYWET = ctx.JDYBG - 1
+        ctx.TIME = float(self.JDYWET)
 
         self.DDINF = 0.0
         self.DET = 0.0
@@ -242,150 +249,173 @@ class DepletionData:
         self.UPTAKE = 0.0
         self.WAVAIL = 0.0
 
-        ICROP: int = SIM.Sim.CROP - 1
-        self.TUP = SIM.BLOC.KCL[ICROP] / (SIM.BLOC.KCU[ICROP] - SIM.BLOC.KCL[ICROP])
+        ICROP: int = ctx.Sim.CROP - 1
+        self.TUP = ctx.BLOC.KCL[ICROP] / (ctx.BLOC.KCU[ICROP] - ctx.BLOC.KCL[ICROP])
 
     def initLoop(self, IJDAY: int):
         """Initializes the required variables at the start of the Daily loop."""
-        SIM.JDAY = IJDAY + 1
-        SIM.TODAY = float(SIM.JDAY)
+        ctx = self.Context
+        ctx.JDAY = IJDAY + 1
+        ctx.TODAY = float(ctx.JDAY)
 
         self.E, self.T, self.ET = 0.0, 0.0, 0.0
-        SIM.RUNON, SIM.RUNOFF, SIM.EPRECIP = 0.0, 0.0, 0.0
+        ctx.RUNON, ctx.RUNOFF, ctx.EPRECIP = 0.0, 0.0, 0.0
 
-        SIM.GDD = SIM.GDDS[IJDAY]
-        SIM.TAVG = 0.5 * (SIM.TMAX[IJDAY] + SIM.TMIN[IJDAY])
+        ctx.GDD = ctx.GDDS[IJDAY]
+        ctx.TAVG = 0.5 * (ctx.TMAX[IJDAY] + ctx.TMIN[IJDAY])
 
     # Irrigation Methods
     def DetermineIrrigation(self):
         """Determine if Irrigation is needed base on the type of irrigation."""
+        ctx = self.Context
 
         # FULLY REVISED
         # @ 2090
-        IRR = SIM.Sim.Irrigation
+        IRR = ctx.Sim.Irrigation
         if IRR.IRRTYP != 1:
             if IRR.IRRSCH == 3:
                 self.PerformFixedIrrigation()
             else:
                 # Fixed Irrigation Date And Amount For Simulating Experiments
                 # FDIRRIG = 1 - fixed irrig date, 2 - gross depth, 3 - application eff
-                if SIM.IRIGNO < 1: SIM.IRIGNO = 1
+                if ctx.IRIGNO < 1: ctx.IRIGNO = 1
                 if IRR.IRRTYP == 2:
-                    IRNO: int = SIM.IRIGNO - 1
-                    if Fortran.INT(SIM.FDIRRIG[IRNO][0]) == SIM.JDAY:
-                        # if int(SIM.FDIRRIG[IRNO][0]) == SIM.JDAY:
-                        SIM.GROIRR = SIM.FDIRRIG[IRNO][1]
-                        SIM.NETIRR = SIM.GROIRR * SIM.FDIRRIG[IRNO][2]
-                        SIM.DINF = SIM.NETIRR
-                        SIM.IRIGNO += 1
+                    IRNO: int = ctx.IRIGNO - 1
+                    if Fortran.INT(ctx.FDIRRIG[IRNO][0]) == ctx.JDAY:
+                        # if int(ctx.FDIRRIG[IRNO][0]) == ctx.JDAY:
+                        ctx.GROIRR = ctx.FDIRRIG[IRNO][1]
+                        ctx.NETIRR = ctx.GROIRR * ctx.FDIRRIG[IRNO][2]
+                        ctx.DINF = ctx.NETIRR
+                        ctx.IRIGNO += 1
                         self.AddIrrigationToSeasonalTotals()
                 elif IRR.IRRTYP > 2:
-                    if SIM.GDD < IRR.GSTART or SIM.GDD > IRR.GSTOP: return
-                    IRRIGA()
+                    if ctx.GDD < IRR.GSTART or ctx.GDD > IRR.GSTOP: return
+                    IRRIGA(ctx)
                     self.AddIrrigationToSeasonalTotals()
 
     def PerformFixedIrrigation(self):
         """Determines the irrigation for the fixed rotation and fixed depth scheduling method."""
+        ctx = self.Context
 
         # Scheduling Method 3 -- Fixed Rotation and Fixed Depth
-        if SIM.JDAY < SIM.Sim.Irrigation.JFIRST:
+        if ctx.JDAY < ctx.Sim.Irrigation.JFIRST:
             return
 
-        if 10 <= SIM.Sim.CROP <= 12:
-            if SIM.JDAY > 304 or (SIM.Sim.JGOI > SIM.JDAY > SIM.Sim.JSTOPI):
+        if 10 <= ctx.Sim.CROP <= 12:
+            if ctx.JDAY > 304 or (ctx.Sim.JGOI > ctx.JDAY > ctx.Sim.JSTOPI):
                 return
-        elif SIM.JDAY > SIM.JDYMAT:
+        elif ctx.JDAY > ctx.JDYMAT:
             return
 
-        if SIM.IRIGNO < 1:
-            IRRIGA()
-            if SIM.IRIGNO < 1: return
+        if ctx.IRIGNO < 1:
+            IRRIGA(ctx)
+            if ctx.IRIGNO < 1: return
         else:
-            if SIM.JDAY < SIM.JNEXTI: return
-            IRRIGA()
+            if ctx.JDAY < ctx.JNEXTI: return
+            IRRIGA(ctx)
 
         self.AddIrrigationToSeasonalTotals()
 
     def AddIrrigationToSeasonalTotals(self):
         """Adds irrigation to seasonal totals."""
-        SIM.SGRIRR += SIM.GROIRR
-        SIM.SNIRR += SIM.NETIRR
-        self.JDYWET = SIM.JDAY
-        NTHET()
+        ctx = self.Context
+        ctx.SGRIRR += ctx.GROIRR
+        ctx.SNIRR += ctx.NETIRR
+        self.JDYWET = ctx.JDAY
+        self.Infiltrate()
+
+    def Infiltrate(self):
+        """Adds the infiltrated water (DINF) to the soil layers."""
+        NTHET(self.Context)
 
     def StartEvaporationRoutine(self):
         """This method implements the control flow that starts with the evaporation routine."""
+        ctx = self.Context
 
-        if SIM.Sim.CROP.isNatural(): return ContinueTo.ComputeET
-        if SIM.ETR[SIM.JDAY - 1] <= 0.0: return ContinueTo.Redistribution
+        if ctx.Sim.CROP.isNatural(): return ContinueTo.ComputeET
+        if ctx.ETR[ctx.JDAY - 1] <= 0.0: return ContinueTo.Redistribution
 
         # @2191
-        ICROP = SIM.Sim.CROP - 1
-        SIM.EP = SIM.ETR[SIM.JDAY - 1] * min(1.0, SIM.BLOC.KCU[ICROP] + SIM.BLOC.KCL[ICROP] - SIM.KC)
+        ICROP = ctx.Sim.CROP - 1
+        ctx.EP = ctx.ETR[ctx.JDAY - 1] * min(1.0, ctx.BLOC.KCU[ICROP] + ctx.BLOC.KCL[ICROP] - ctx.KC)
         # TONOTE: Weird behaviour about setting EPMAX to EP before to check if it's <= 0.0
         # It could yield a DivisionByZero error later
         # Also EVAP checks if EP <= 0 before to compute, but it'd never get called in that case
-        self.EPMAX = SIM.EP
-
-        if SIM.EP <= 0.0: SIM.EP = 0.001
-        if SIM.EP > 0.001:
-            EVAP()
-            SIM.THETA[0] -= SIM.E1 / SIM.BLOC.DEPTH[0]
-            SIM.THETA[1] -= SIM.E2 / SIM.BLOC.DEPTH[1]
-            self.E = SIM.E1 + SIM.E2
-            if SIM.Sim.CROP == CropId.SummerFallow:
+        self.EPMAX = ctx.EP
+
+        if ctx.EP <= 0.0: ctx.EP = 0.001
+        if ctx.EP > 0.001:
+            EVAP(ctx)
+            ctx.THETA[0] -= ctx.E1 / ctx.BLOC.DEPTH[0]
+            ctx.THETA[1] -= ctx.E2 / ctx.BLOC.DEPTH[1]
+            self.E = ctx.E1 + ctx.E2
+            if ctx.Sim.CROP == CropId.SummerFallow:
                 # Skip transpiration calculation for summer fallow
                 return ContinueTo.DailyEvaporation
         return ContinueTo.Transpiration
 
+    def ComputePotentialTranspiration(self) -> bool:
+        """Computes the potential transpiration (TP) for the day.
+        Returns False when there is no transpiration."""
+        ctx = self.Context
+        self.TP = ctx.ETR[ctx.JDAY - 1] * (ctx.KC - ctx.BLOC.KCL[ctx.Sim.CROP - 1])
+
+        if ctx.EP > 0.0:
+            self.TP *= 1.0 + self.TUP * (self.EPMAX - self.E) / self.EPMAX
+
+        return self.TP > 0.0
+
     def AddDailyETToSeasonalTotals(self):
         """Add Daily Evaporation And Transpirational ToSeasonal Totals.
         Cumulative Values By Growth Stage For Grain/Tuber/Forage Crops"""
+        ctx = self.Context
 
         # This code was simplified from:
-        # if SIM.Sim.CROP.isGrainOrTuber():
-        #    if SIM.Sim.GDD.VEG <= SIM.GDD <= SIM.Sim.GDD.YFORM:
-        #        SIM.ETMAX += SIM.E1 + SIM.E2 + D.TP
-        #        SIM.ETYLD += SIM.E1 + SIM.E2 + D.T
-        #        SIM.TPS[SIM.KSTG-1] += D.TP
-        #        SIM.TDEFS = SIM.TDEFS + D.TP - D.T
-        #        SIM.TDEF[SIM.KSTG-1] = SIM.TDEF[SIM.KSTG-1] + D.TP - D.T
-        # elif SIM.Sim.CROP.isForage():
+        # if ctx.Sim.CROP.isGrainOrTuber():
+        #    if ctx.Sim.GDD.VEG <= ctx.GDD <= ctx.Sim.GDD.YFORM:
+        #        ctx.ETMAX += ctx.E1 + ctx.E2 + D.TP
+        #        ctx.ETYLD += ctx.E1 + ctx.E2 + D.T
+        #        ctx.TPS[ctx.KSTG-1] += D.TP
+        #        ctx.TDEFS = ctx.TDEFS + D.TP - D.T
+        #        ctx.TDEF[ctx.KSTG-1] = ctx.TDEF[ctx.KSTG-1] + D.TP - D.T
+        # elif ctx.Sim.CROP.isForage():
         #    # Cumulative Values By Cutting For Forage Crops
-        #    SIM.TPS[SIM.ICUT-1] += D.TP
-        #    SIM.TDEFS = SIM.TDEFS + D.TP - D.T
-        #    SIM.TDEF[SIM.ICUT-1] = SIM.TDEF[SIM.ICUT-1] + D.TP - D.T
-        #    SIM.ETMAX += SIM.E1 + SIM.E2 + D.TP
-        #    SIM.ETYLD += SIM.E1 + SIM.E2 + D.T
+        #    ctx.TPS[ctx.ICUT-1] += D.TP
+        #    ctx.TDEFS = ctx.TDEFS + D.TP - D.T
+        #    ctx.TDEF[ctx.ICUT-1] = ctx.TDEF[ctx.ICUT-1] + D.TP - D.T
+        #    ctx.ETMAX += ctx.E1 + ctx.E2 + D.TP
+        #    ctx.ETYLD += ctx.E1 + ctx.E2 + D.T
 
         # Label 248
-        if SIM.Sim.CROP.isGrainTuberOrForage():
-            if SIM.Sim.CROP.isForage() or SIM.Sim.GDD.VEG <= SIM.GDD <= SIM.Sim.GDD.YFORM:
-                i: int = (SIM.KSTG if SIM.Sim.CROP.isGrainOrTuber() else SIM.ICUT) - 1
-                SIM.TPS[i] += self.TP
-                SIM.ETYLD += SIM.E1 + SIM.E2 + self.T
-                SIM.ETMAX += SIM.E1 + SIM.E2 + self.TP
-                SIM.TDEFS = SIM.TDEFS + self.TP - self.T
-                SIM.TDEF[i] = SIM.TDEF[i] + self.TP - self.T
+        if ctx.Sim.CROP.isGrainTuberOrForage():
+            if ctx.Sim.CROP.isForage() or ctx.Sim.GDD.VEG <= ctx.GDD <= ctx.Sim.GDD.YFORM:
+                i: int = (ctx.KSTG if ctx.Sim.CROP.isGrainOrTuber() else ctx.ICUT) - 1
+                ctx.TPS[i] += self.TP
+                ctx.ETYLD += ctx.E1 + ctx.E2 + self.T
+                ctx.ETMAX += ctx.E1 + ctx.E2 + self.TP
+                ctx.TDEFS = ctx.TDEFS + self.TP - self.T
+                ctx.TDEF[i] = ctx.TDEF[i] + self.TP - self.T
 
     def DrainageRoutine(self):
         """Computes the drainage."""
+        ctx = self.Context
 
         self.DRAIN = 0.0
         if self.EXTRA > 0.0:
-            self.DFRACT = (float((SIM.JDAY - self.JDYWET) + 1) / SIM.DRAIND) ** SIM.DCOEFF
+            self.DFRACT = (float((ctx.JDAY - self.JDYWET) + 1) / ctx.DRAIND) ** ctx.DCOEFF
             if self.DFRACT > 1.0: self.DFRACT = 1.0
             self.DRAIN = self.EXTRA * self.DFRACT
             # TONOTE: LINES 2418~2420, Useless code
             self.DIST = (1.0 - self.DFRACT) * self.EXTRA / self.DISTD
 
-            SIM.DPLN = 0.0
-            for i in range(SIM.Sim.LAYERS):
-                if SIM.THETA[i] >= SIM.Soil.FIELDC[i]: SIM.THETA[i] += self.DIST
-                SIM.DPLN += (SIM.Soil.FIELDC[i] - SIM.THETA[i]) * SIM.BLOC.DEPTH[i] * SIM.PERRZD[i]
+            ctx.DPLN = 0.0
+            for i in range(ctx.Sim.LAYERS):
+                if ctx.THETA[i] >= ctx.Soil.FIELDC[i]: ctx.THETA[i] += self.DIST
+                ctx.DPLN += (ctx.Soil.FIELDC[i] - ctx.THETA[i]) * ctx.BLOC.DEPTH[i] * ctx.PERRZD[i]
 
     def RedistributionRoutine(self):
         """Redistribution Routine"""
+        ctx = self.Context
 
         # Label 260
         # If layer is above field capacity compute the amount of extra water,
@@ -395,14 +425,14 @@ class DepletionData:
         AMT, ADDL = 0.0, 0.0
         self.EXTRA, self.DISTD = 0.0, 0.0
 
-        for i in range(SIM.Sim.LAYERS):
-            FIELDC = SIM.Soil.FIELDC[i]
-            if SIM.THETA[i] > FIELDC:
-                self.EXTRA += (SIM.THETA[i] - FIELDC) * SIM.BLOC.DEPTH[i]
-                SIM.THETA[i] = FIELDC
-                self.DISTD += SIM.BLOC.DEPTH[i]
+        for i in range(ctx.Sim.LAYERS):
+            FIELDC = ctx.Soil.FIELDC[i]
+            if ctx.THETA[i] > FIELDC:
+                self.EXTRA += (ctx.THETA[i] - FIELDC) * ctx.BLOC.DEPTH[i]
+                ctx.THETA[i] = FIELDC
+                self.DISTD += ctx.BLOC.DEPTH[i]
             elif self.EXTRA != 0.0:
-                AMT = (FIELDC - SIM.THETA[i]) * SIM.BLOC.DEPTH[i]
+                AMT = (FIELDC - ctx.THETA[i]) * ctx.BLOC.DEPTH[i]
                 if AMT >= self.EXTRA:
                     ADDL = self.EXTRA
                     self.EXTRA = 0.0
@@ -410,50 +440,52 @@ class DepletionData:
                     ADDL = AMT
                     self.EXTRA -= AMT
 
-                SIM.THETA[i] += ADDL / SIM.BLOC.DEPTH[i]
-                if SIM.THETA[i] >= FIELDC:
-                    self.DISTD += SIM.BLOC.DEPTH[i]
+                ctx.THETA[i] += ADDL / ctx.BLOC.DEPTH[i]
+                if ctx.THETA[i] >= FIELDC:
+                    self.DISTD += ctx.BLOC.DEPTH[i]
 
     def ComputeET(self):
         """ET computation for riparian woodlands, wetlands, AND water"""
+        ctx = self.Context
         # Label 250, evaporation routine
-        if SIM.Sim.CROP.isNatural():
-            self.ET = SIM.KC * SIM.ETR[SIM.JDAY - 1]
-            for i in range(SIM.Sim.LAYERS):
-                SIM.THETA[i] = SIM.Soil.FIELDC[i]
+        if ctx.Sim.CROP.isNatural():
+            self.ET = ctx.KC * ctx.ETR[ctx.JDAY - 1]
+            for i in range(ctx.Sim.LAYERS):
+                ctx.THETA[i] = ctx.Soil.FIELDC[i]
 
     def CalculateEffectiveRainfallAmount(self):
         """Calculate Effective Rainfall Amount, and Redistribute Infiltration."""
-        IJDAY: int = SIM.JDAY - 1
-        if SIM.PRECIP[IJDAY] > 0.0 or SIM.SNOH2O > 0.0:
-            SIM.RAIN = SIM.PRECIP[IJDAY]
+        ctx = self.Context
+        IJDAY: int = ctx.JDAY - 1
+        if ctx.PRECIP[IJDAY] > 0.0 or ctx.SNOH2O > 0.0:
+            ctx.RAIN = ctx.PRECIP[IJDAY]
 
-            SNOWMELT(SIM.JDAY)
+            SNOWMELT(ctx, ctx.JDAY)
 
-            EFPRECIP()
+            EFPRECIP(ctx)
 
-            if SIM.EPRECIP > SIM.RAIN and SIM.Sim.ITERRC == 0:
-                # TODO: Here we have one of those exit conditions.
-                print(" @ 1729: ", SIM.JDAY, SIM.IYEAR)
-                sys.exit()
-            if SIM.Sim.Irrigation.IRRTYP == 2: SIM.EPRECIP = SIM.PRECIP[IJDAY]
-            SIM.DINF = SIM.EPRECIP
-            self.JDYWET = SIM.JDAY
-            NTHET()
+            if ctx.EPRECIP > ctx.RAIN and ctx.Sim.ITERRC == 0:
+                # TONOTE: Here the Fortran code prints the day and year and exits.
+                raise EffectivePrecipitationError(ctx, 1729)
+            if ctx.Sim.Irrigation.IRRTYP == 2: ctx.EPRECIP = ctx.PRECIP[IJDAY]
+            ctx.DINF = ctx.EPRECIP
+            self.JDYWET = ctx.JDAY
+            self.Infiltrate()
 
     def ComputeTotalsForBeforeMayAndAfterSept(self):
         """Compute Totals For Before May And After Sept"""
+        ctx = self.Context
 
-        self.DPLPER = (SIM.AWDPLN / SIM.AWATER) * 100.0
-        SIM.DRAINS += self.DRAIN
-        self.ETRS += SIM.ETR[SIM.JDAY - 1]
+        self.DPLPER = (ctx.AWDPLN / ctx.AWATER) * 100.0
+        ctx.DRAINS += self.DRAIN
+        self.ETRS += ctx.ETR[ctx.JDAY - 1]
         self.ES += self.E
-        SIM.PRECIPS += SIM.PRECIP[SIM.JDAY - 1]
-        SIM.EPRECIPS += SIM.EPRECIP
-        self.RUNONS += SIM.RUNON
+        ctx.PRECIPS += ctx.PRECIP[ctx.JDAY - 1]
+        ctx.EPRECIPS += ctx.EPRECIP
+        self.RUNONS += ctx.RUNON
         self.TS += self.T
 
-        if SIM.GDD <= SIM.Sim.GDD.VEG:
+        if ctx.GDD <= ctx.Sim.GDD.VEG:
             self.EVEG += self.E
             self.TVEG += self.T
 
@@ -462,55 +494,64 @@ class DepletionData:
         Setup printing dates for printout.
         Returns True if print must be performed. Returns False to break the daily loop.
         """
-        CROP = SIM.Sim.CROP
-        if CROP.isForage() and SIM.JDAY in (SIM.JDYPLT, SIM.JDYEND, SIM.Sim.JDYCUT[SIM.ICUT - 1]):
+        ctx = self.Context
+        CROP = ctx.Sim.CROP
+        if CROP.isForage() and ctx.JDAY in (ctx.JDYPLT, ctx.JDYEND, ctx.Sim.JDYCUT[ctx.ICUT - 1]):
             return True
-        if CROP in (12, 13) and SIM.JDAY in (SIM.JDYEFC, SIM.JDYMAT):
+        if CROP in (12, 13) and ctx.JDAY in (ctx.JDYEFC, ctx.JDYMAT):
             return True
-        if CROP < 10 and SIM.JDAY in (SIM.JDYPLT, SIM.JDYEFC, SIM.JDYRIPE, SIM.JDYFLO, SIM.JDYMAT):
+        if CROP < 10 and ctx.JDAY in (ctx.JDYPLT, ctx.JDYEFC, ctx.JDYRIPE, ctx.JDYFLO, ctx.JDYMAT):
             return True
 
-        if self.IPRINT == SIM.PrintOut.INPRIN: self.IPRINT = 0
+        if self.IPRINT == ctx.PrintOut.INPRIN: self.IPRINT = 0
         self.IPRINT += 1
         if self.IPRINT == 1: return True
         return False
 
 
-def DEPLT():
+def DEPLT(ctx: SimulationContext):
     """DAILY SOIL WATER BALANCE-DEPLETION SUBROUTINE"""
 
     # LINE (1857)
-    D = DepletionData()
+    D = DepletionData(ctx)
 
-    ComputeAmountOfWaterStoredInSoilProfile()
+    ComputeAmountOfWaterStoredInSoilProfile(ctx)
 
-    PrintHeaders()
+    plan = ctx.Plan
+    # Only the summaries written to the YR file are kept by the YIELD_ONLY runs.
+    summarize = ComputeDailySummaries if plan.Summaries else ComputeYieldSummaries
+    # TONOTE: SetupPrinting also ends the daily loop (GOTO 330), it never does when printing every day.
+    printDaily: bool = ctx.PrintOut.INPRIN == 1
+    # SOILTEMP reads the water stored in the soil profile, updated on the days printed.
+    storeWater: bool = plan.Daily or ctx.SoilTemperature
+
+    PrintHeaders(ctx)
 
     # Start of Daily Loop @1971
     # DO 330 => CONTINUE, SO GOTO 330 breaks the loop
-    for IJDAY in range(SIM.JDYBG - 1, SIM.JDYEND):
+    for IJDAY in range(ctx.JDYBG - 1, ctx.JDYEND):
         D.initLoop(IJDAY)
 
-        DetermineGrowthStage()
+        DetermineGrowthStage(ctx)
 
         # Compute Root Depth for the Day
-        if SIM.RZD < SIM.RZMAX or SIM.AWATER <= 0.0: ROOTZN()
+        if ctx.RZD < ctx.RZMAX or ctx.AWATER <= 0.0: ROOTZN(ctx)
 
         D.CalculateEffectiveRainfallAmount()
 
-        ComputeAvailableWaterDepletion()
+        ComputeAvailableWaterDepletion(ctx)
 
         D.DetermineIrrigation()
 
-        AdjustResidueCover()
+        AdjustResidueCover(ctx)
 
         # Compute soil temperatures @2175
-        SOILTEMP()
+        if ctx.SoilTemperature: SOILTEMP(ctx)
 
         flow = D.StartEvaporationRoutine()
 
         if flow == ContinueTo.Transpiration:
-            flow = __TranspirationRoutine(D)
+            flow = __TranspirationRoutine(ctx, D)
 
         if flow <= ContinueTo.DailyEvaporation:
             D.AddDailyETToSeasonalTotals()
@@ -527,276 +568,294 @@ def DEPLT():
         # Compute Totals For Before May And After Sept
         D.ComputeTotalsForBeforeMayAndAfterSept()
         # Compute Final Soil Water Depletions
-        ComputeFinalSoilWaterDepletions()
-
-        __ComputeSeasonalAndOffSeasonSummaries(D)
-        __ComputeWeeklySummaries(D)
+        ComputeFinalSoilWaterDepletions(ctx)
 
-        firstMonthDay = __ComputeMonthlySummaries(D)
+        firstMonthDay = summarize(ctx, D)
+        if ctx.Daily is not None:
+            ctx.Daily.record(ctx, D)
 
-        if firstMonthDay:
-            PrintSummary(D)
-        elif D.SetupPrinting():
-            PrintSummary(D)
-        else:
+        if not (firstMonthDay or printDaily or D.SetupPrinting()):
             break
+        # Label 310 @ 2591
+        if storeWater: ComputeAmountOfWaterStoredInSoilProfile(ctx)
+        if plan.Daily: PrintSummary(ctx, D)
     # End of Daily Loop @2622
 
-    PrintMonthlySummary(D)
-    PrintWeeklySummary()
+    PrintDailyReport(ctx)
+    if plan.Summaries:
+        SummarizeDailyFluxes(ctx)
+        PrintMonthlySummary(ctx, D)
+        PrintWeeklySummary(ctx)
+
+
+def ComputeDailySummaries(ctx: SimulationContext, D: DepletionData) -> bool:
+    """
+    Adds the daily values to the seasonal, weekly and monthly summaries.
+    Returns True if the summary must be printed.
+    """
+    __ComputeSeasonalAndOffSeasonSummaries(ctx, D)
 
+    return __RecordDailyFluxes(ctx, D)
 
-def __ComputeSeasonalAndOffSeasonSummaries(D: DepletionData):
+
+def ComputeYieldSummaries(ctx: SimulationContext, D: DepletionData) -> bool:
+    """
+    Adds the daily values to the seasonal summaries written to the YR file, for the YIELD_ONLY runs.
+    Only the runoff is recorded, for the annual runoff. Returns True on the first day of a month.
+    """
+    ctx.ETS = ctx.ETS + D.ET if ctx.Sim.CROP.isNatural() else D.ES + D.TS
+
+    IJDAY: int = ctx.JDAY - 1
+    ctx.Fluxes.ROF[IJDAY] = ctx.RUNOFF
+    if ctx.RUNOFF < 0.0: __CheckMonthlyRunoff(ctx, IJDAY)
+    ctx.GROIRR, ctx.NETIRR, ctx.DINF = 0.0, 0.0, 0.0
+
+    if IJDAY in MONTH_STARTS:
+        D.IPRINT = 1
+        return True
+    return False
+
+
+def SummarizeDailyFluxes(ctx: SimulationContext):
+    """Sums the daily fluxes of the season into the monthly and weekly summaries, for the printers."""
+    ctx.MON = ctx.Fluxes.getMonths(ctx.Sim.CROP.isNatural())
+    ctx.WEEK = ctx.Fluxes.getWeeks()
+
+
+def __ComputeSeasonalAndOffSeasonSummaries(ctx: SimulationContext, D: DepletionData):
     """Compute Seasonal and Off-season summaries"""
 
-    naturalCrop: bool = SIM.Sim.CROP.isNatural()
-    SIM.ETS = SIM.ETS + D.ET if naturalCrop else D.ES + D.TS
-    if SIM.JDAY <= 121 or SIM.JDAY >= 274:
+    naturalCrop: bool = ctx.Sim.CROP.isNatural()
+    ctx.ETS = ctx.ETS + D.ET if naturalCrop else D.ES + D.TS
+    if ctx.JDAY <= 121 or ctx.JDAY >= 274:
         D.TOFF += D.T
         D.EOFF += D.E
         D.ETOFF += D.ET if naturalCrop else D.E + D.T
-        D.RNOFF += SIM.PRECIP[SIM.JDAY - 1]
-        D.ETROFF += SIM.ETR[SIM.JDAY - 1]
+        D.RNOFF += ctx.PRECIP[ctx.JDAY - 1]
+        D.ETROFF += ctx.ETR[ctx.JDAY - 1]
         D.DRNOFF += D.DRAIN
 
 
-def __ComputeWeeklySummaries(D: DepletionData):
-    """Compute Weekly Summaries for Production Crops"""
-
-    # TONOTE: Seems an unnecessary checking, CROP can't be greater than 22
-    if SIM.Sim.CROP <= 22:
-        IWEEK = int((SIM.JDAY - 1) / 7)
-        SIM.WEEK[IWEEK].ET += D.E + D.T
-        SIM.WEEK[IWEEK].ER += SIM.EPRECIP
-        SIM.WEEK[IWEEK].IRN += SIM.NETIRR
-        SIM.WEEK[IWEEK].IRG += SIM.GROIRR
-        SIM.WEEK[IWEEK].ETR += SIM.ETR[SIM.JDAY - 1]
-        SIM.WEEK[IWEEK].RA += SIM.PRECIP[SIM.JDAY - 1]
-
-
-def __ComputeMonthlySummaries(D: DepletionData) -> bool:
+def __RecordDailyFluxes(ctx: SimulationContext, D: DepletionData) -> bool:
     """
-    Computes the monthly summaries.
+    Records the fluxes of the day for the weekly and monthly summaries, see SummarizeDailyFluxes.
     Returns True if the summary must be printed.
     Returns False if SetupPrinting must be called to decide.
     """
-
-    MON, DAY = CALDAY(SIM.JDAY)
-    IMON = MON - 1
-
-    SIM.MON[IMON].E += D.E
-    SIM.MON[IMON].T += D.T
-    SIM.MON[IMON].ER += SIM.EPRECIP
-    SIM.MON[IMON].ETR += SIM.ETR[SIM.JDAY - 1]
-    SIM.MON[IMON].RA += SIM.PRECIP[SIM.JDAY - 1]
-    SIM.MON[IMON].RON += SIM.RUNON
-    SIM.MON[IMON].ROF += SIM.RUNOFF
-
-    if SIM.MON[IMON].ROF < 0.0:
-        # TODO: Non documented exit condition
-        # What to do ?
-        sys.exit()
-
-    if SIM.Sim.CROP.isNatural():
-        SIM.MON[IMON].ET += D.ET
-    else:
-        SIM.MON[IMON].ET = SIM.MON[IMON].E + SIM.MON[IMON].T
-
-    SIM.MON[IMON].DRA += D.DRAIN
-    SIM.MON[IMON].IRG += SIM.GROIRR
-    SIM.GROIRR = 0.0
-    SIM.MON[IMON].IRN += SIM.NETIRR
-    D.DNETI = SIM.NETIRR
-    SIM.NETIRR = 0.0
-    SIM.MON[IMON].NUMIRR = SIM.IRIGNO
-    SIM.MON[IMON].INF += SIM.DINF
-    D.DDINF = SIM.DINF
-    SIM.DINF = 0.0
+    # TONOTE: REVISED, the summaries were added to every day, now they are summed at the end of the season.
+    # The weekly summaries were only computed for CROP <= 22, which every crop type is.
+    IJDAY: int = ctx.JDAY - 1
+    F = ctx.Fluxes
     D.DET = D.E + D.T
-
-    if DAY <= 1:
-        SIM.MON[IMON].DPL = SIM.DPLN
+    F.E[IJDAY] = D.E
+    F.T[IJDAY] = D.T
+    F.ET[IJDAY] = D.ET
+    F.DET[IJDAY] = D.DET
+    F.ER[IJDAY] = ctx.EPRECIP
+    F.ETR[IJDAY] = ctx.ETR[IJDAY]
+    F.RA[IJDAY] = ctx.PRECIP[IJDAY]
+    F.RON[IJDAY] = ctx.RUNON
+    F.ROF[IJDAY] = ctx.RUNOFF
+
+    if ctx.RUNOFF < 0.0: __CheckMonthlyRunoff(ctx, IJDAY)
+
+    F.DRA[IJDAY] = D.DRAIN
+    F.IRG[IJDAY] = ctx.GROIRR
+    ctx.GROIRR = 0.0
+    F.IRN[IJDAY] = ctx.NETIRR
+    D.DNETI = ctx.NETIRR
+    ctx.NETIRR = 0.0
+    F.IRIGNO[IJDAY] = ctx.IRIGNO
+    F.INF[IJDAY] = ctx.DINF
+    D.DDINF = ctx.DINF
+    ctx.DINF = 0.0
+    F.record(IJDAY)
+
+    if IJDAY in MONTH_STARTS:
+        F.DPLN[IJDAY] = ctx.DPLN
         D.IPRINT = 1
         return True
     return False
 
 
-def __TranspirationRoutine(D: DepletionData) -> ContinueTo:
+def __CheckMonthlyRunoff(ctx: SimulationContext, IJDAY: int):
+    """Raises a NegativeRunoffError if the runoff of the month is negative up to the day.
+    The monthly runoff may only turn negative on a day with negative runoff."""
+    ROF = ctx.Fluxes.getMonthToDate("ROF", IJDAY)
+    if ROF < 0.0:
+        # TONOTE: Non documented exit condition, the crop-year fails.
+        raise NegativeRunoffError(ctx, CALDAY(ctx.JDAY)[0], ROF)
+
+
+def __TranspirationRoutine(ctx: SimulationContext, D: DepletionData) -> ContinueTo:
     """Transpiration routine. Label 200"""
     # REVISED METHOD
 
     # TODO: Label 200
-    D.TP = SIM.ETR[SIM.JDAY - 1] * (SIM.KC - SIM.BLOC.KCL[SIM.Sim.CROP - 1])
-
-    if SIM.EP > 0.0:
-        D.TP *= 1.0 + D.TUP * (D.EPMAX - D.E) / D.EPMAX
-
-    if D.TP <= 0.0:
+    if not D.ComputePotentialTranspiration():
         return ContinueTo.Redistribution
 
-    SIM.DPLN, D.TWEIGH, D.WAVAIL = 0.0, 0.0, 0.0
+    ctx.DPLN, D.TWEIGH, D.WAVAIL = 0.0, 0.0, 0.0
 
-    for i in range(SIM.Sim.LAYERS):
-        SIM.DEPL[i] = (SIM.Soil.FIELDC[i] - SIM.THETA[i]) * SIM.BLOC.DEPTH[i] * SIM.PERRZD[i]
-        if SIM.DEPL[i] < 0.0: SIM.DEPL[i] = 0.0
+    for i in range(ctx.Sim.LAYERS):
+        ctx.DEPL[i] = (ctx.Soil.FIELDC[i] - ctx.THETA[i]) * ctx.BLOC.DEPTH[i] * ctx.PERRZD[i]
+        if ctx.DEPL[i] < 0.0: ctx.DEPL[i] = 0.0
 
-        SIM.DPLN += SIM.DEPL[i]
+        ctx.DPLN += ctx.DEPL[i]
 
-        if SIM.PERRZD[i] > 0.0:
-            D.PERDEP[i] = SIM.DEPL[i] / (SIM.PAWFT[i] * SIM.PERRZD[i])
+        if ctx.PERRZD[i] > 0.0:
+            D.PERDEP[i] = ctx.DEPL[i] / (ctx.PAWFT[i] * ctx.PERRZD[i])
             if D.PERDEP[i] > 1.0: D.PERDEP[i] = 1.0
 
-            if SIM.THETA[i] > SIM.PWP[i]:
-                D.WAVAIL += (SIM.THETA[i] - SIM.PWP[i]) * SIM.BLOC.DEPTH[i] * SIM.PERRZD[i]
-                D.TWEIGH += SIM.RDF[i] * (1.0 - D.PERDEP[i])
+            if ctx.THETA[i] > ctx.PWP[i]:
+                D.WAVAIL += (ctx.THETA[i] - ctx.PWP[i]) * ctx.BLOC.DEPTH[i] * ctx.PERRZD[i]
+                D.TWEIGH += ctx.RDF[i] * (1.0 - D.PERDEP[i])
         else:
             D.PERDEP[i] = 0.0
 
     # @2241
     # Compute the Stress Factor
-    AV: float = (1.0 - SIM.DPLN / SIM.PAW) * 100.0
+    AV: float = (1.0 - ctx.DPLN / ctx.PAW) * 100.0
     if AV < 0.0: AV = 0.0
-    SR: float = 1.0 if AV > SIM.Sim.TBREAK else AV / SIM.Sim.TBREAK
+    SR: float = 1.0 if AV > ctx.Sim.TBREAK else AV / ctx.Sim.TBREAK
     D.T = D.TP * SR
     if D.T > 0.0:
         # Uptake section
-        PerformUptake(D)
+        PerformUptake(ctx, D)
     # DAILY EVAPORATION COMES LATER AT LABEL 248
     return ContinueTo.DailyEvaporation
 
 
-def PerformUptake(D: DepletionData) -> ContinueTo:
-    """Uptake section."""
+def PerformUptake(ctx: SimulationContext, D: DepletionData) -> int:
+    """Uptake section.
+    Returns the number of passes over the layers, 0 when the demand is above the water available."""
     D.TRANS = D.T
-    SIM.DPLN = 0.0
+    ctx.DPLN = 0.0
     D.TUSE, D.TWAIT = 0.0, 0.0
 
     if D.WAVAIL > D.T:
         ITRIES = 1
-        while not __OnMoreThanEnoughWater(D):
+        while not __OnMoreThanEnoughWater(ctx, D):
             D.TWEIGH = D.TWAIT
             D.TRANS = D.T - D.TUSE
             if abs(D.TRANS) < 0.001: break
-            if ITRIES > 20: raise TransLoopConvergenceError(SIM.JDAY, D.TRANS)
+            if ITRIES > MAX_UPTAKE_TRIES: raise TransLoopConvergenceError(ctx, D.TRANS)
             D.TWAIT = 0.0
             ITRIES += 1
-            SIM.DPLN = 0.0
+            ctx.DPLN = 0.0
+        return ITRIES
     else:
         # Transpiration demand > Water Available
-        for i in range(SIM.Sim.LAYERS):
-            SIM.THETA[i] = SIM.PWP[i] * SIM.PERRZD[i] + SIM.THETA[i] * (1.0 - SIM.PERRZD[i])
+        for i in range(ctx.Sim.LAYERS):
+            ctx.THETA[i] = ctx.PWP[i] * ctx.PERRZD[i] + ctx.THETA[i] * (1.0 - ctx.PERRZD[i])
             D.PERDEP[i] = 1.0
 
-        SIM.DPLN = SIM.PAW
+        ctx.DPLN = ctx.PAW
         D.TUSE = D.WAVAIL
+        return 0
 
 
-def __OnMoreThanEnoughWater(D: DepletionData) -> bool:
+def __OnMoreThanEnoughWater(ctx: SimulationContext, D: DepletionData) -> bool:
     """Lines 2272~2292"""
     # Method revised.
     result: bool = True
-    for i in range(SIM.Sim.LAYERS):
-        D.UPTAKE = D.TRANS * (1.0 - D.PERDEP[i]) * SIM.RDF[i] / D.TWEIGH
+    for i in range(ctx.Sim.LAYERS):
+        D.UPTAKE = D.TRANS * (1.0 - D.PERDEP[i]) * ctx.RDF[i] / D.TWEIGH
         if D.UPTAKE < 0.0: D.UPTAKE = 0.0
-        D.WAVAIL = (SIM.THETA[i] - SIM.PWP[i]) * SIM.BLOC.DEPTH[i] * SIM.PERRZD[i]
+        D.WAVAIL = (ctx.THETA[i] - ctx.PWP[i]) * ctx.BLOC.DEPTH[i] * ctx.PERRZD[i]
         if D.WAVAIL < 0.0: D.WAVAIL = 0.0
         # TONOTE: See the weird flow control done here in the Fortran code.
         # The use of a float as a true/false flag was pretty funny too
         if D.UPTAKE > D.WAVAIL:
             # Not Enough Layer Water For Needed Uptake
             D.TUSE += D.WAVAIL
-            SIM.THETA[i] = SIM.PWP[i] * SIM.PERRZD[i] + SIM.THETA[i] * (1.0 - SIM.PERRZD[i])
+            ctx.THETA[i] = ctx.PWP[i] * ctx.PERRZD[i] + ctx.THETA[i] * (1.0 - ctx.PERRZD[i])
             result = False
         else:
             D.TUSE += D.UPTAKE
-            SIM.THETA[i] -= D.UPTAKE / SIM.BLOC.DEPTH[i]
+            ctx.THETA[i] -= D.UPTAKE / ctx.BLOC.DEPTH[i]
 
-        D.PERDEP[i] = (SIM.Soil.FIELDC[i] - SIM.THETA[i]) * SIM.BLOC.DEPTH[i] / SIM.PAWFT[i]
+        D.PERDEP[i] = (ctx.Soil.FIELDC[i] - ctx.THETA[i]) * ctx.BLOC.DEPTH[i] / ctx.PAWFT[i]
         if D.PERDEP[i] > 1.0: D.PERDEP[i] = 1.0
-        SIM.DPLN += (SIM.Soil.FIELDC[i] - SIM.THETA[i]) * SIM.BLOC.DEPTH[i] * SIM.PERRZD[i]
-        D.TWAIT += SIM.RDF[i] * (1.0 - D.PERDEP[i])
+        ctx.DPLN += (ctx.Soil.FIELDC[i] - ctx.THETA[i]) * ctx.BLOC.DEPTH[i] * ctx.PERRZD[i]
+        D.TWAIT += ctx.RDF[i] * (1.0 - D.PERDEP[i])
     return result
 
 
-def PrintSummary(D: DepletionData):
-    """Prints the depletion summary."""
-    # Label 310 @ 2591
-    ComputeAmountOfWaterStoredInSoilProfile()
-
-    if SIM.PrintOut.IPFLAG > 1 and (SIM.PrintOut.IPSOIL == SIM.SOIL or SIM.Config.PRINT_ALL_SOILS):
-        if SIM.Site.NWSITE in SIM.PrintOut.PRSITE:
-            MON, DAY = CALDAY(SIM.JDAY)
-            SIM.outFile.write((
-                f"{MON:>3}{DAY:>3}{SIM.ETR[SIM.JDAY]:>7.2f}{D.ETRS:>7.2f}{D.ES:>7.2f}{D.TS:>7.2f}"
-                f"{SIM.ETS:>7.2f}{SIM.SNIRR:>7.2f}{SIM.SGRIRR:>7.2f}{SIM.PRECIPS:>7.2f}"
-                f"{SIM.EPRECIPS:>7.2f}{SIM.SNOH2O:>7.2f}{D.RUNONS:>7.2f}{SIM.CURVNO:>8.1f}"
-                f"{SIM.RESIDUE:>8.0f} {SIM.GDD:>6.0f}{SIM.DRAINS:>6.2f}{SIM.KC:>5.2f}"
-                f"{SIM.DPLN:>6.2f}{SIM.AWDPLN:>6.2f}{D.DPLPER:>6.1f}{SIM.RZD:>6.2f}{SIM.PAW:>6.2f}"
-                f"{SIM.AWATER:>6.2f}{SIM.TOTWAT:>6.2f}\n"
-            ))
-            thetas = "".join([f" {SIM.THETA[i]:>4.3f}" for i in range(10)])
-            soilts = "".join([f" {SIM.SOILT[i]:>4.1f}" for i in range(10)])
-            SIM.profileFile.write((
-                f"{MON:>3}{DAY:>3}  {D.DFRACT:>4.2f}  {D.EXTRA:>4.2f}  {D.DIST:>4.2f} "
-                f"{D.DET:>4.2f}  {D.DRAIN:>4.2f}  {D.DNETI:>4.2f}  {D.DDINF:>4.2f}  "
-                f"{SIM.RUNON:>4.2f} {SIM.AWDPLN:>4.2f} {SIM.DPLA:>4.2f}  {thetas}   {soilts}\n"))
+def PrintSummary(ctx: SimulationContext, D: DepletionData):
+    """Prints the depletion summary, once the amount of water stored in the soil profile is updated.
+    Only called on the crop-years with daily rows, see PrintPlan. The row is recorded, then written
+    with the rows of the season by PrintDailyReport."""
+    ctx.DailyReport.record(ctx, D)
+
 
+def PrintDailyReport(ctx: SimulationContext):
+    """Writes the daily rows recorded by PrintSummary to the OUT and PROFILE files, at the end of the season
+    or when the crop-year fails. Nothing to write when no day was recorded."""
+    if ctx.DailyReport.Count == 0:
+        return
+    values = ctx.DailyReport.pop()
+    ctx.OutputFiles.render(ctx.outFile, renderOutRows, values)
+    ctx.OutputFiles.render(ctx.profileFile, renderProfileRows, values)
 
-def PrintMonthlySummary(D: DepletionData):
+
+def PrintMonthlySummary(ctx: SimulationContext, D: DepletionData):
     """Print Monthly Summaries"""
-    if SIM.PrintOut.IPFLAG > 1 and (SIM.PrintOut.IPSOIL == SIM.SOIL or SIM.Config.PRINT_ALL_SOILS):
-        if SIM.PrintOut.JPRSTR <= SIM.IYEAR <= SIM.PrintOut.JPRSTP and \
-                SIM.Site.NWSITE in SIM.PrintOut.PRSITE:
-            SIM.outFile.write((
-                f"{'-' * 139}\n\n\n{' ' * 20}MONTHLY WATER BALANCE SUMMARIES\n"
-                f"{' ' * 17}ETR     E     T    ET   PRECIP, in  RUNON  IRRIGATION, in  TOTAL  INFIL"
-                f"    DRAIN  BEGDPL\n{' ' * 10}month   in    in    in    in    tot   eff   in     "
-                f"gross    net    #IRR    in      in      in\n{' ' * 10}{'-' * 97}\n"))
-            IMBG, _ = CALDAY(SIM.JDYBG)
-            IMEND, _ = CALDAY(SIM.JDYEND)
-            total = MonthlyData()
-            for i in range(IMBG - 1, IMEND):
-                total.add(SIM.MON[i])
-                SIM.outFile.write(SIM.MON[i].toMonthlyOutput(i + 1))
-
-            SIM.outFile.write(f"{' ' * 10}{'-' * 104}\n")
-            SIM.outFile.write(f"{' ' * 6}TOTALS   {total.toTotalOutput()}\n\n")
-
-            SIM.outFile.write((
-                f"     OFF SEASON{D.ETROFF:>6.1f}{D.EOFF:>6.1f}{D.TOFF:>6.1f}{D.ETOFF:>6.1f}"
-                f"{D.RNOFF:>6.1f}{' ' * 43}{D.DRNOFF:>8.1f}\n"))
-            SIM.outFile.write((
-                f"     MAY - SEPT{total.ETR - D.ETROFF:>6.1f}{total.E - D.EOFF:>6.1f}"
-                f"{total.T - D.TOFF:>6.1f}{total.ET - D.ETOFF:>6.1f}{total.RA - D.RNOFF:>6.1f}"
-                f"{' ' * 43}{total.DRA - D.DRNOFF:>8.1f}\n\n{'=' * 139}\n\n\n\n"))
-
-    if SIM.Config.OUTPUT_FORMAT == 2:
-        if SIM.PrintOut.IPFLAG > 1:
-            SIM.monthFile.write((
-                f'"{SIM.CurrentCrop.WEAFILE}",{SIM.IYEAR:>5},{SIM.SOIL:>5},{SIM.Sim.CROP:>3},'
-                f"{SIM.Sim.ITFLAG:>3},{SIM.Sim.Irrigation.IRRTYP:>3},{SIM.Sim.ITERRC:>3},"
+    if ctx.Plan.Monthly:
+        ctx.outFile.write((
+            f"{'-' * 139}\n\n\n{' ' * 20}MONTHLY WATER BALANCE SUMMARIES\n"
+            f"{' ' * 17}ETR     E     T    ET   PRECIP, in  RUNON  IRRIGATION, in  TOTAL  INFIL"
+            f"    DRAIN  BEGDPL\n{' ' * 10}month   in    in    in    in    tot   eff   in     "
+            f"gross    net    #IRR    in      in      in\n{' ' * 10}{'-' * 97}\n"))
+        IMBG, _ = CALDAY(ctx.JDYBG)
+        IMEND, _ = CALDAY(ctx.JDYEND)
+        total = MonthlyData()
+        for i in range(IMBG - 1, IMEND):
+            total.add(ctx.MON[i])
+            ctx.outFile.write(ctx.MON[i].toMonthlyOutput(i + 1))
+
+        ctx.outFile.write(f"{' ' * 10}{'-' * 104}\n")
+        ctx.outFile.write(f"{' ' * 6}TOTALS   {total.toTotalOutput()}\n\n")
+
+        ctx.outFile.write((
+            f"     OFF SEASON{D.ETROFF:>6.1f}{D.EOFF:>6.1f}{D.TOFF:>6.1f}{D.ETOFF:>6.1f}"
+            f"{D.RNOFF:>6.1f}{' ' * 43}{D.DRNOFF:>8.1f}\n"))
+        ctx.outFile.write((
+            f"     MAY - SEPT{total.ETR - D.ETROFF:>6.1f}{total.E - D.EOFF:>6.1f}"
+            f"{total.T - D.TOFF:>6.1f}{total.ET - D.ETOFF:>6.1f}{total.RA - D.RNOFF:>6.1f}"
+            f"{' ' * 43}{total.DRA - D.DRNOFF:>8.1f}\n\n{'=' * 139}\n\n\n\n"))
+
+    crop = ctx.Sim.CROP
+    if ctx.Config.OUTPUT_FORMAT == 2:
+        if ctx.Plan.MonthRows:
+            ctx.monthFile.write((
+                f'"{ctx.CurrentCrop.WEAFILE}",{ctx.IYEAR:>5},{ctx.SOIL:>5},{ctx.Sim.CROP:>3},'
+                f"{ctx.Sim.ITFLAG:>3},{ctx.Sim.Irrigation.IRRTYP:>3},{ctx.Sim.ITERRC:>3},"
             ))
-            SIM.monthFile.write(",".join([
-                (f"{SIM.MON[i].ET:>5.1f},{SIM.MON[i].ER:>5.1f},{SIM.MON[i].IRN:>5.1f},"
-                 f"{SIM.MON[i].RA:>5.1f},{SIM.MON[i].ROF:>5.1f},{SIM.MON[i].RON:>5.1f}")
-                for i in range(SIM.Sim.IMBG - 1, SIM.Sim.IMEND)]))
-            SIM.monthFile.write("\n")
+            ctx.monthFile.write(",".join([
+                (f"{ctx.MON[i].ET:>5.1f},{ctx.MON[i].ER:>5.1f},{ctx.MON[i].IRN:>5.1f},"
+                 f"{ctx.MON[i].RA:>5.1f},{ctx.MON[i].ROF:>5.1f},{ctx.MON[i].RON:>5.1f}")
+                for i in range(ctx.Sim.IMBG - 1, ctx.Sim.IMEND)]))
+            ctx.monthFile.write("\n")
     else:
-        rotateWheat = SIM.Sim.CROP == 7 and not SIM.LIVECROP and \
-                      SIM.Sim.Irrigation.IRRTYP == 1 and SIM.Sim.ITFLAG != 3
+        rotateWheat = ctx.Sim.CROP == 7 and not ctx.LIVECROP and \
+                      ctx.Sim.Irrigation.IRRTYP == 1 and ctx.Sim.ITFLAG != 3
         if rotateWheat:
-            SIM.Sim.CROP = CropId(15)
+            ctx.Sim.CROP = crop = CropId(15)
 
-        SIM.monthFile.write((
-            f' {SIM.CurrentCrop.WEAFILE}  {SIM.IYEAR:>5}{SIM.SOIL:>5}{SIM.Sim.CROP:>3}'
-            f"{SIM.Sim.ITFLAG:>3}{SIM.Sim.Irrigation.IRRTYP:>3}"
+        ctx.monthFile.write((
+            f' {ctx.CurrentCrop.WEAFILE}  {ctx.IYEAR:>5}{ctx.SOIL:>5}{ctx.Sim.CROP:>3}'
+            f"{ctx.Sim.ITFLAG:>3}{ctx.Sim.Irrigation.IRRTYP:>3}"
         ))
 
-        SIM.monthFile.write("".join([
-            (f"  {SIM.MON[i].ET:>7.2f}{SIM.MON[i].ER:>7.2f}{SIM.MON[i].IRN:>7.2f}"
-             f"{SIM.MON[i].DRA:>7.2f}{SIM.MON[i].ROF:>7.2f}{SIM.MON[i].RA:>7.2f}")
-            for i in range(SIM.Sim.IMBG - 1, SIM.Sim.IMEND)]))
-        SIM.monthFile.write("\n")
+        ctx.monthFile.write("".join([
+            (f"  {ctx.MON[i].ET:>7.2f}{ctx.MON[i].ER:>7.2f}{ctx.MON[i].IRN:>7.2f}"
+             f"{ctx.MON[i].DRA:>7.2f}{ctx.MON[i].ROF:>7.2f}{ctx.MON[i].RA:>7.2f}")
+            for i in range(ctx.Sim.IMBG - 1, ctx.Sim.IMEND)]))
+        ctx.monthFile.write("\n")
 
         if rotateWheat:
-            SIM.Sim.CROP = CropId(7)
+            ctx.Sim.CROP = CropId(7)
+
+    if ctx.Results is not None:
+        ctx.Results.addMonths(ctx, crop)
@@ -0,0 +1,593 @@
+"""Lockstep implementation of the DEPLT subroutine, for every soil simulated on a site.
+
+The soils of a site share the weather and the crop sequence, so their daily loops can run
+side by side. The per-layer state of all the soils is held in (soils, layers) arrays, and
+the layer kernels (NTHET, root depth, depletion, soil temperature, transpiration and uptake,
+redistribution and drainage) run once per day for all of them, masked to the soils taking
+part on that day. Every other step of the daily loop runs per soil with the scalar code in
+DEPLT, on views of those arrays.
+
+TONOTE: The kernels repeat the operations of the scalar code in the same order, the sums over
+the layers are accumulated from the top layer down, so the results are identical.
+With the FUSED_LAYERS setting the kernels use the precomputed FIELDC * DEPTH products, whole
+row sums and NumPy's exp instead, which is faster but may change the last digits of the results,
+so the exact kernels are kept for the parity checks against the Fortran code.
+"""
+
+from math import exp
+
+import numpy as np
+
+from SimulationContext import SimulationContext, LAYER_COUNT
+from Subroutines.DEPLT import ContinueTo, DepletionData, ComputeAmountOfWaterStoredInSoilProfile, \
+    ComputeDailySummaries, ComputeYieldSummaries, DetermineGrowthStage, AdjustResidueCover, MAX_UPTAKE_TRIES, \
+    PrintHeaders, PrintSummary, PrintDailyReport, PrintMonthlySummary, PrintWeeklySummary, SummarizeDailyFluxes
+from Subroutines.SOILTEMP import ComputeSurfaceTemperature, TLAG
+
+from Errors.CustomError import SimulationError, TransLoopConvergenceError
+
+LAYER_ARRAYS = ("THETA", "PWP", "PERRZD", "RDF", "PAWFT", "AVMFT", "DEPL", "SOILT")
+"""Per-layer context variables replaced by rows of the batch arrays during DEPLT."""
+
+
+class SoilBatch:
+    """Holds the per-layer state of the soils simulated in lockstep on a site."""
+
+    __slots__ = ("Contexts", "Depletions", "Pending", "Fused", "DEPTH", "TOPDEP", "BOTDEP", "CENTER",
+                 "FIELDC", "FCDEPTH", "PERDEP") + LAYER_ARRAYS
+
+    def __init__(self, contexts: list, fused: bool = False):
+        self.Contexts: list = contexts
+        """The simulation context of every soil, in the serial order."""
+        self.Fused: bool = fused
+        """When True, the kernels trade the bit parity with the scalar code for speed."""
+        self.Depletions: list = []
+        """The depletion data of every soil for the current crop-year."""
+        self.Pending: list = []
+        """Indexes of the soils with water waiting to infiltrate (DINF)."""
+
+        shape = (len(contexts), LAYER_COUNT)
+        self.DEPTH = np.zeros(LAYER_COUNT)
+        self.TOPDEP = np.zeros(LAYER_COUNT)
+        """Top depth of every soil layer."""
+        self.BOTDEP = np.zeros(LAYER_COUNT)
+        """Bottom depth of every soil layer."""
+        self.CENTER = np.zeros(LAYER_COUNT)
+        """Depth at the center of every soil layer."""
+        self.FIELDC = np.zeros(shape)
+        self.FCDEPTH = np.zeros(shape)
+        """Water held at field capacity by every layer (FIELDC * DEPTH)."""
+        self.PERDEP = np.zeros(shape)
+        for name in LAYER_ARRAYS:
+            setattr(self, name, np.zeros(shape))
+
+    def load(self, depletions: list):
+        """Copies the per-layer data of the contexts into the arrays,
+        and makes every context work on its row of the arrays."""
+        self.Depletions = depletions
+        self.Pending = []
+        self.DEPTH[:] = self.Contexts[0].BLOC.DEPTH
+        np.add.accumulate(self.DEPTH, out=self.BOTDEP)
+        self.TOPDEP[1:] = self.BOTDEP[:-1]
+        self.CENTER[:] = self.Contexts[0].CENTER
+        for k, ctx in enumerate(self.Contexts):
+            self.FIELDC[k] = ctx.Soil.FIELDC
+            for name in LAYER_ARRAYS:
+                values = getattr(self, name)
+                values[k] = getattr(ctx, name)
+                setattr(ctx, name, values[k])
+            self.PERDEP[k] = depletions[k].PERDEP
+            depletions[k].PERDEP = self.PERDEP[k]
+        np.multiply(self.FIELDC, self.DEPTH, out=self.FCDEPTH)
+
+    def unload(self):
+        """Gives the contexts back their per-layer data as lists."""
+        for k, ctx in enumerate(self.Contexts):
+            for name in LAYER_ARRAYS:
+                setattr(ctx, name, getattr(self, name)[k].tolist())
+            self.Depletions[k].PERDEP = self.PERDEP[k].tolist()
+
+    def __depletion(self, rows: np.ndarray, THETA: np.ndarray = None) -> np.ndarray:
+        """Returns the water missing to reach field capacity on every layer of the soils specified,
+        for their current water content unless THETA is given."""
+        if THETA is None:
+            THETA = self.THETA[rows]
+        if self.Fused:
+            return self.FCDEPTH[rows] - THETA * self.DEPTH
+        return (self.FIELDC[rows] - THETA) * self.DEPTH
+
+    def __sum(self, values: np.ndarray) -> np.ndarray:
+        """Returns the sums over the layers of every row, in the order of the scalar code unless fused."""
+        if self.Fused:
+            return values.sum(axis=1) + 0.0
+        return sumLayers(values)
+
+    def ROOTZN(self, rows: list):
+        """Computes the root depth for the soils specified, like ROOTZN."""
+        if not rows:
+            return
+        contexts = [self.Contexts[k] for k in rows]
+        rows = np.array(rows)
+        DEPTH, TOPDEP, BOTDEP = self.DEPTH, self.TOPDEP, self.BOTDEP
+
+        depths = []
+        for ctx in contexts:
+            GDDROOT: float = ctx.Sim.GDDROOT
+            RZMIN, RZMAX = ctx.Sim.RZMIN, ctx.RZMAX
+            RZD: float = (RZMAX - RZMIN) * (ctx.GDD - GDDROOT) / (ctx.Sim.GDD.FLO - GDDROOT) + RZMIN
+            if RZD > RZMAX:
+                RZD = RZMAX
+            if RZD < RZMIN:
+                RZD = RZMIN
+            depths.append(RZD)
+        RZD = np.array(depths)[:, None]
+        RZMGMT = np.array([ctx.RZMGMT for ctx in contexts])[:, None]
+
+        # Calculate The Percent Of Each Layer Filled With Roots. The layer where the roots end
+        # is partially filled, the layers below keep their values.
+        REMAIN = np.subtract.accumulate(np.hstack((RZD, np.broadcast_to(DEPTH, (len(rows), LAYER_COUNT)))),
+                                        axis=1)[:, 1:]
+        ended = np.logical_or.accumulate(REMAIN < 0.0, axis=1)
+        last = ended & ~np.hstack((np.zeros((len(rows), 1), dtype=bool), ended[:, :-1]))
+        PERRZD = self.PERRZD[rows]
+        PERRZD[~ended] = 1.0
+        partial = last & (-DEPTH < REMAIN)
+        PERRZD[partial] = ((DEPTH + REMAIN) / DEPTH)[partial]
+
+        # Compute the available water in the irrigation management zone, see ROOTZN.
+        above = BOTDEP <= RZMGMT
+        holding = (TOPDEP < RZMGMT) & (RZMGMT < BOTDEP)
+        FDEPTH = np.where(above | (RZD < RZMGMT), PERRZD, (RZMGMT - TOPDEP) / DEPTH)
+        AVMFT = self.AVMFT[rows]
+        AWATER = sumLayers(np.where(above | holding, AVMFT * FDEPTH, 0.0))
+        PAW = sumLayers(self.PAWFT[rows] * PERRZD)
+
+        ZL = np.add.accumulate(DEPTH / RZD, axis=1)
+        ZL[ZL > 1.0] = 1.0
+        ZU = np.hstack((np.zeros((len(rows), 1)), ZL[:, :-1]))
+        self.RDF[rows] = 2.0633 * (ZL - ZU) - 1.622 * (ZL * ZL - ZU * ZU) + 0.5587 * (ZL * ZL * ZL - ZU * ZU * ZU)
+        self.PERRZD[rows] = PERRZD
+
+        for k, ctx in enumerate(contexts):
+            ctx.PAW, ctx.AWATER, ctx.RZD = float(PAW[k]), float(AWATER[k]), depths[k]
+
+    def NTHET(self):
+        """Adds the infiltrated water of the pending soils to their layers, like NTHET."""
+        if not self.Pending:
+            return
+        rows = np.array(self.Pending)
+        self.Pending = []
+
+        contexts = [self.Contexts[k] for k in rows]
+        DINF = np.array([ctx.DINF for ctx in contexts])
+        THETA, FIELDC, DEPTH = self.THETA[rows], self.FIELDC[rows], self.DEPTH
+
+        # A soil stops as soon as all its water is added, at the start of a layer.
+        active = DINF != 0.0
+        for i in range(LAYER_COUNT):
+            active = DINF != 0.0
+            if not active.any(): break
+            AMT = (FIELDC[:, i] - THETA[:, i]) * DEPTH[i]
+            AMT[AMT < 0.0] = 0.0
+            fits = AMT >= DINF
+            DINFL = np.where(fits, DINF, AMT)
+            DINF = np.where(fits, 0.0, DINF - AMT)
+            THETA[active, i] += DINFL[active] / DEPTH[i]
+
+        # If Any Water Is Left Then Add An Equal Amount To Every Layer
+        for k, ctx in enumerate(contexts):
+            if active[k]:
+                THETA[k] += DINF[k] / ctx.TOTDEP
+            ctx.DINF = 0.0
+
+        self.THETA[rows] = THETA
+
+    def ComputeWaterDepletion(self, rows: list):
+        """Compute Available Water Depletion for the soils specified."""
+        if not rows:
+            return
+        contexts = [self.Contexts[k] for k in rows]
+        rows = np.array(rows)
+        RZMGMT = np.array([ctx.RZMGMT for ctx in contexts])[:, None]
+        RZD = np.array([ctx.RZD for ctx in contexts])[:, None]
+        PERRZD, DEPTH, TOPDEP, BOTDEP = self.PERRZD[rows], self.DEPTH, self.TOPDEP, self.BOTDEP
+
+        # The layers above RZMGMT count as filled by roots, the layer holding RZMGMT only
+        # down to RZMGMT, unless the roots are above it. The layers below are left as they are.
+        above = BOTDEP <= RZMGMT
+        holding = (TOPDEP < RZMGMT) & (RZMGMT < BOTDEP)
+        FDEPTH = np.where(above | (RZD < RZMGMT), PERRZD, (RZMGMT - TOPDEP) / DEPTH)
+        DEPL = self.__depletion(rows) * FDEPTH
+
+        counted = above | holding
+        self.DEPL[rows] = np.where(counted, DEPL, self.DEPL[rows])
+        AWDPLN = self.__sum(np.where(counted, DEPL, 0.0))
+        for k, ctx in enumerate(contexts):
+            ctx.AWDPLN = float(AWDPLN[k])
+
+    def ComputeFinalSoilWaterDepletions(self, rows: list):
+        """Compute Final Soil Water Depletion for the soils specified."""
+        if not rows:
+            return
+        DPLN = self.__sum(self.__depletion(rows))
+        for k, row in enumerate(rows):
+            self.Contexts[row].DPLN = float(DPLN[k])
+
+        self.ComputeWaterDepletion(rows)
+
+    def ComputeAmountOfWaterStoredInSoilProfile(self, rows: list):
+        """Computes the amount of water stored in soil profile for the soils specified."""
+        if not rows:
+            return
+        if self.Fused:
+            TOTWAT = self.THETA[rows] @ self.DEPTH
+        else:
+            TOTWAT = sumLayers(self.THETA[rows] * self.DEPTH)
+        for k, row in enumerate(rows):
+            self.Contexts[row].TOTWAT = float(TOTWAT[k])
+
+    def SOILTEMP(self, rows: list):
+        """Estimates the temperature of every layer for the soils specified, like SOILTEMP."""
+        if not rows:
+            return
+        contexts = [self.Contexts[k] for k in rows]
+        rows = np.array(rows)
+        DD, SURFTEMP = (np.array(values)[:, None] for values in zip(*map(ComputeSurfaceTemperature, contexts)))
+        TANUAL = np.array([ctx.TANUAL for ctx in contexts])[:, None]
+
+        ZD = self.CENTER / DD
+        EXPONENT = -0.8669 - 2.0775 * ZD
+        if self.Fused:
+            EXPONENT = np.exp(EXPONENT)
+        else:
+            # NumPy's exp may differ from the C library one in the last bit.
+            EXPONENT = np.array([exp(x) for x in EXPONENT.ravel().tolist()]).reshape(EXPONENT.shape)
+        DF = ZD / (ZD + EXPONENT)
+        self.SOILT[rows] = TLAG * self.SOILT[rows] + (1.0 - TLAG) * (DF * (TANUAL - SURFTEMP) + SURFTEMP)
+
+    def TranspirationRoutine(self, rows: list):
+        """Computes the depletion of the layers and the transpiration for the soils specified,
+        once their potential transpiration is known, then removes the uptake from the layers."""
+        if not rows:
+            return
+        rows = np.array(rows)
+        THETA, PWP, PERRZD = self.THETA[rows], self.PWP[rows], self.PERRZD[rows]
+        DEPTH = self.DEPTH
+
+        DEPL = self.__depletion(rows, THETA) * PERRZD
+        DEPL[DEPL < 0.0] = 0.0
+
+        rooted = PERRZD > 0.0
+        PERDEP = np.divide(DEPL, self.PAWFT[rows] * PERRZD, out=np.zeros_like(DEPL), where=rooted)
+        PERDEP[PERDEP > 1.0] = 1.0
+
+        wet = rooted & (THETA > PWP)
+        WAVAIL = np.where(wet, (THETA - PWP) * DEPTH * PERRZD, 0.0)
+        TWEIGH = np.where(wet, self.RDF[rows] * (1.0 - PERDEP), 0.0)
+
+        self.DEPL[rows] = DEPL
+        self.PERDEP[rows] = PERDEP
+        DPLN, WAVAIL, TWEIGH = self.__sum(DEPL), self.__sum(WAVAIL), self.__sum(TWEIGH)
+
+        uptake = []
+        for k, row in enumerate(rows):
+            ctx, D = self.Contexts[row], self.Depletions[row]
+            ctx.DPLN, D.WAVAIL, D.TWEIGH = float(DPLN[k]), float(WAVAIL[k]), float(TWEIGH[k])
+            # @2241
+            # Compute the Stress Factor
+            AV: float = (1.0 - ctx.DPLN / ctx.PAW) * 100.0
+            if AV < 0.0: AV = 0.0
+            SR: float = 1.0 if AV > ctx.Sim.TBREAK else AV / ctx.Sim.TBREAK
+            D.T = D.TP * SR
+            if D.T > 0.0:
+                uptake.append(row)
+
+        self.PerformUptake(uptake)
+
+    def PerformUptake(self, rows: list) -> int:
+        """Uptake section for the soils specified.
+        Returns the number of passes over the layers made for the slowest soil."""
+        enough, short = [], []
+        for row in rows:
+            ctx, D = self.Contexts[row], self.Depletions[row]
+            D.TRANS = D.T
+            ctx.DPLN = 0.0
+            D.TUSE, D.TWAIT = 0.0, 0.0
+            (enough if D.WAVAIL > D.T else short).append(row)
+
+        if short:
+            # Transpiration demand > Water Available
+            short = np.array(short)
+            PERRZD = self.PERRZD[short]
+            self.THETA[short] = self.PWP[short] * PERRZD + self.THETA[short] * (1.0 - PERRZD)
+            self.PERDEP[short] = 1.0
+            for row in short:
+                ctx, D = self.Contexts[row], self.Depletions[row]
+                ctx.DPLN = ctx.PAW
+                D.TUSE = D.WAVAIL
+
+        ITRIES = 1
+        while enough:
+            done = self.__OnMoreThanEnoughWater(enough)
+            remaining = []
+            for row, result in zip(enough, done):
+                if result: continue
+                ctx, D = self.Contexts[row], self.Depletions[row]
+                D.TWEIGH = D.TWAIT
+                D.TRANS = D.T - D.TUSE
+                if abs(D.TRANS) < 0.001: continue
+                if ITRIES > MAX_UPTAKE_TRIES: raise TransLoopConvergenceError(ctx, D.TRANS)
+                D.TWAIT = 0.0
+                ctx.DPLN = 0.0
+                remaining.append(row)
+            ITRIES += 1
+            enough = remaining
+        return ITRIES - 1
+
+    def __OnMoreThanEnoughWater(self, rows: list) -> list:
+        """Lines 2272~2292, for the soils specified.
+        Returns whether every layer of the soil had enough water for the uptake."""
+        depletions = [self.Depletions[row] for row in rows]
+        rows = np.array(rows)
+        THETA, PWP, PERRZD, RDF = self.THETA[rows], self.PWP[rows], self.PERRZD[rows], self.RDF[rows]
+        DEPTH = self.DEPTH
+
+        TRANS = np.array([D.TRANS for D in depletions])[:, None]
+        TWEIGH = np.array([D.TWEIGH for D in depletions])[:, None]
+        UPTAKE = TRANS * (1.0 - self.PERDEP[rows]) * RDF / TWEIGH
+        UPTAKE[UPTAKE < 0.0] = 0.0
+        WAVAIL = (THETA - PWP) * DEPTH * PERRZD
+        WAVAIL[WAVAIL < 0.0] = 0.0
+
+        # Not Enough Layer Water For Needed Uptake
+        dry = UPTAKE > WAVAIL
+        TUSE = np.where(dry, WAVAIL, UPTAKE)
+        THETA = np.where(dry, PWP * PERRZD + THETA * (1.0 - PERRZD), THETA - UPTAKE / DEPTH)
+
+        DEPL = self.__depletion(rows, THETA)
+        PERDEP = DEPL / self.PAWFT[rows]
+        PERDEP[PERDEP > 1.0] = 1.0
+        self.THETA[rows] = THETA
+        self.PERDEP[rows] = PERDEP
+
+        # TUSE keeps adding up from the previous tries.
+        TUSE[:, 0] += [D.TUSE for D in depletions]
+        TUSE = np.add.accumulate(TUSE, axis=1)[:, -1]
+        DPLN = self.__sum(DEPL * PERRZD)
+        TWAIT = self.__sum(RDF * (1.0 - PERDEP))
+
+        last = LAYER_COUNT - 1
+        for k, D in enumerate(depletions):
+            D.TUSE, D.TWAIT = float(TUSE[k]), float(TWAIT[k])
+            D.UPTAKE, D.WAVAIL = float(UPTAKE[k, last]), float(WAVAIL[k, last])
+            self.Contexts[rows[k]].DPLN = float(DPLN[k])
+        return (~dry.any(axis=1)).tolist()
+
+    def RedistributionRoutine(self, rows: list):
+        """Redistribution Routine for the soils specified."""
+        for row in rows:
+            D = self.Depletions[row]
+            D.EXTRA, D.DISTD = 0.0, 0.0
+
+        # Nothing moves on the soils without a layer above field capacity.
+        rows = np.array(rows, dtype=int)
+        wet = self.THETA[rows] > self.FIELDC[rows]
+        rows = rows[wet.any(axis=1)]
+        if len(rows) == 0:
+            return
+        THETA, FIELDC, DEPTH = self.THETA[rows], self.FIELDC[rows], self.DEPTH
+
+        # Label 260
+        EXTRA, DISTD = np.zeros(len(rows)), np.zeros(len(rows))
+        for i in range(int(np.argmax(wet.any(axis=0))), LAYER_COUNT):
+            theta, fieldc = THETA[:, i], FIELDC[:, i]
+            wet = theta > fieldc
+            fill = ~wet & (EXTRA != 0.0)
+
+            AMT = (fieldc - theta) * DEPTH[i]
+            fits = AMT >= EXTRA
+            filled = np.where(fill, theta + np.where(fits, EXTRA, AMT) / DEPTH[i], theta)
+
+            EXTRA = np.where(wet, EXTRA + (theta - fieldc) * DEPTH[i],
+                             np.where(fill, np.where(fits, 0.0, EXTRA - AMT), EXTRA))
+            DISTD = np.where(wet | (fill & (filled >= fieldc)), DISTD + DEPTH[i], DISTD)
+            THETA[:, i] = np.where(wet, fieldc, filled)
+
+        self.THETA[rows] = THETA
+        for k, row in enumerate(rows):
+            D = self.Depletions[row]
+            D.EXTRA, D.DISTD = float(EXTRA[k]), float(DISTD[k])
+
+    def DrainageRoutine(self, rows: list):
+        """Computes the drainage for the soils specified."""
+        draining, DIST = [], []
+        for row in rows:
+            ctx, D = self.Contexts[row], self.Depletions[row]
+            D.DRAIN = 0.0
+            if D.EXTRA > 0.0:
+                D.DFRACT = (float((ctx.JDAY - D.JDYWET) + 1) / ctx.DRAIND) ** ctx.DCOEFF
+                if D.DFRACT > 1.0: D.DFRACT = 1.0
+                D.DRAIN = D.EXTRA * D.DFRACT
+                D.DIST = (1.0 - D.DFRACT) * D.EXTRA / D.DISTD
+                draining.append(row)
+                DIST.append(D.DIST)
+        if not draining:
+            return
+
+        rows = np.array(draining)
+        THETA, FIELDC = self.THETA[rows], self.FIELDC[rows]
+        THETA = np.where(THETA >= FIELDC, THETA + np.array(DIST)[:, None], THETA)
+        self.THETA[rows] = THETA
+
+        DPLN = self.__sum(self.__depletion(rows, THETA) * self.PERRZD[rows])
+        for k, row in enumerate(rows):
+            self.Contexts[row].DPLN = float(DPLN[k])
+
+
+class BatchDepletionData(DepletionData):
+    """Depletion data of a soil simulated in a batch, its infiltration is left to the batch."""
+    __slots__ = ("Batch", "Index")
+
+    def __init__(self, ctx: SimulationContext, batch: SoilBatch, index: int):
+        super().__init__(ctx)
+        self.Batch: SoilBatch = batch
+        self.Index: int = index
+        """The index of the soil in the batch."""
+
+    def Infiltrate(self):
+        """Leaves the infiltrated water (DINF) to be added by the batch."""
+        self.Batch.Pending.append(self.Index)
+
+
+def DEPLT_BATCH(batch: SoilBatch):
+    """DAILY SOIL WATER BALANCE-DEPLETION SUBROUTINE, for every soil of the batch.
+    The errors raised by the steps run per soil are raised as a SimulationError of that soil, so the
+    crop-year only fails for it. TONOTE: The layer kernels run for the whole batch, their errors are raised as they are."""
+    contexts = batch.Contexts
+    depletions = []
+    try:
+        for k, ctx in enumerate(contexts):
+            depletions.append(BatchDepletionData(ctx, batch, k))
+    except Exception as err:
+        raise SimulationError.fromError(contexts[k], err)
+    batch.load(depletions)
+
+    # Every soil of the batch shares the configuration, see DEPLT.
+    summaries: bool = contexts[0].Plan.Summaries
+    summarize = ComputeDailySummaries if summaries else ComputeYieldSummaries
+    printDaily: bool = contexts[0].PrintOut.INPRIN == 1
+    # SOILTEMP reads the water stored in the soil profile, updated on the days printed.
+    storeWater = [ctx.Plan.Daily or ctx.SoilTemperature for ctx in contexts]
+    try:
+        for k, ctx in enumerate(contexts):
+            ComputeAmountOfWaterStoredInSoilProfile(ctx)
+            PrintHeaders(ctx)
+    except Exception as err:
+        raise SimulationError.fromError(contexts[k], err)
+
+    soils = list(range(len(contexts)))
+    flows = [ContinueTo.Transpiration] * len(contexts)
+    JDYBG = min(ctx.JDYBG for ctx in contexts)
+    JDYEND = max(ctx.JDYEND for ctx in contexts)
+
+    # Start of Daily Loop @1971
+    for IJDAY in range(JDYBG - 1, JDYEND):
+        today = [k for k in soils if contexts[k].JDYBG - 1 <= IJDAY < contexts[k].JDYEND]
+
+        rooting = []
+        try:
+            for k in today:
+                ctx = contexts[k]
+                depletions[k].initLoop(IJDAY)
+                DetermineGrowthStage(ctx)
+                if ctx.RZD < ctx.RZMAX or ctx.AWATER <= 0.0: rooting.append(k)
+        except Exception as err:
+            raise SimulationError.fromError(contexts[k], err)
+        # Compute Root Depth for the Day
+        batch.ROOTZN(rooting)
+
+        try:
+            for k in today:
+                depletions[k].CalculateEffectiveRainfallAmount()
+        except Exception as err:
+            raise SimulationError.fromError(contexts[k], err)
+        batch.NTHET()
+
+        # Compute Available Water Depletion to see if irrigation is needed. @2032
+        batch.ComputeWaterDepletion(today)
+        try:
+            for k in today:
+                ctx = contexts[k]
+                ctx.DPLA = ctx.AWATER * ctx.Sim.Irrigation.PAD[ctx.KSTG - 1]
+                depletions[k].DetermineIrrigation()
+        except Exception as err:
+            raise SimulationError.fromError(contexts[k], err)
+        batch.NTHET()
+
+        try:
+            for k in today:
+                AdjustResidueCover(contexts[k])
+        except Exception as err:
+            raise SimulationError.fromError(contexts[k], err)
+        # Compute soil temperatures @2175
+        batch.SOILTEMP([k for k in today if contexts[k].SoilTemperature])
+
+        transpiring = []
+        try:
+            for k in today:
+                ctx, D = contexts[k], depletions[k]
+                flow = D.StartEvaporationRoutine()
+                if flow == ContinueTo.Transpiration:
+                    # DAILY EVAPORATION COMES LATER AT LABEL 248
+                    if D.ComputePotentialTranspiration():
+                        flow = ContinueTo.DailyEvaporation
+                        transpiring.append(k)
+                    else:
+                        flow = ContinueTo.Redistribution
+                flows[k] = flow
+        except Exception as err:
+            raise SimulationError.fromError(contexts[k], err)
+        batch.TranspirationRoutine(transpiring)
+
+        try:
+            for k in today:
+                if flows[k] <= ContinueTo.DailyEvaporation:
+                    depletions[k].AddDailyETToSeasonalTotals()
+                if flows[k] <= ContinueTo.ComputeET:
+                    depletions[k].ComputeET()
+        except Exception as err:
+            raise SimulationError.fromError(contexts[k], err)
+
+        batch.RedistributionRoutine(today)
+        batch.DrainageRoutine(today)
+
+        # @2431
+        # Update The Daily Values
+        try:
+            for k in today:
+                depletions[k].ComputeTotalsForBeforeMayAndAfterSept()
+        except Exception as err:
+            raise SimulationError.fromError(contexts[k], err)
+        batch.ComputeFinalSoilWaterDepletions(today)
+
+        storing = []
+        try:
+            for k in today:
+                D = depletions[k]
+                if summarize(contexts[k], D) or printDaily or D.SetupPrinting():
+                    if storeWater[k]: storing.append(k)
+                else:
+                    soils.remove(k)
+        except Exception as err:
+            raise SimulationError.fromError(contexts[k], err)
+
+        # Label 310 @ 2591
+        batch.ComputeAmountOfWaterStoredInSoilProfile(storing)
+        try:
+            for k in storing:
+                if contexts[k].Plan.Daily: PrintSummary(contexts[k], depletions[k])
+        except Exception as err:
+            raise SimulationError.fromError(contexts[k], err)
+        if not soils:
+            break
+    # End of Daily Loop @2622
+
+    batch.unload()
+
+
+
+def PrintBatchReports(batch: SoilBatch, k: int):
+    """Writes the daily rows and the summaries of the soil k of the batch, once the daily loop is done.
+    Called per soil with the rest of its crop-year, so a failure there is the failure of that soil alone."""
+    ctx = batch.Contexts[k]
+    PrintDailyReport(ctx)
+    if ctx.Plan.Summaries:
+        SummarizeDailyFluxes(ctx)
+        PrintMonthlySummary(ctx, batch.Depletions[k])
+        PrintWeeklySummary(ctx)
+
+
+def sumLayers(values: np.ndarray) -> np.ndarray:
+    """Returns the sums over the layers of every row, added from the top layer down like the scalar code."""
+    # Adding 0.0 turns a -0.0 sum into 0.0, as when starting the sum from 0.0.
+    return np.add.accumulate(values, axis=1)[:, -1] + 0.0
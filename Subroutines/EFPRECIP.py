@@ -35,85 +35,114 @@
 # =================================================================
 
 
-import sys
 from math import exp
 from math import log
 from math import sqrt
 
-import SIM
+from SimulationContext import SimulationContext
+from Errors.CustomError import EffectivePrecipitationError
 
 
-def EFPRECIP():
+def EFPRECIP(ctx: SimulationContext):
     """Implements the EFPRECIP subroutine."""
     # TONOTE: Fully revised method.
     # Calculate The Runoff Fraction From The Antecedent Moisture @1642
-    S: float = CalculateRunOffFraction(GetCurveNumber())
+    S: float = CalculateRunOffFraction(ctx, GetCurveNumber(ctx))
     # S /= 25.4
 
     # Calculate The Effective Precip.
-    CalculateEffectivePrecipitation(S)
-
-
-def CalculateRunOffFraction(CNUMB: float) -> float:
+    CalculateEffectivePrecipitation(ctx, S)
+
+
+class RunoffConstants:
+    """The runoff constants of the soil for a crop-year, built by CROPSIM once the PWP of its layers is
+    adjusted to the root zone of the crop: the layers within the runoff depth (12 inches) with their
+    depth in it, and their water contents at saturation (SAT) and at field capacity (FC).
+    The retention constants of every curve number are computed on first use, only SW changes from day to day."""
+
+    __slots__ = ("Layers", "SAT", "FC", "Curves")
+
+    def __init__(self, ctx: SimulationContext):
+        self.Layers: list = []
+        """The (index, PWP, depth within the runoff depth) of the layers."""
+        self.SAT: float = 0.0
+        self.FC: float = 0.0
+        self.Curves: dict = {}
+        """The (SMAX, W1, W2) by curve number."""
+
+        TOTRDP, RUNDEP = 0.0, 12.0
+        for i in range(ctx.Sim.LAYERS):
+            pwp = ctx.PWP[i]
+            depth = ctx.BLOC.DEPTH[i]
+            TOTRDP += depth
+            tempDepth = depth if TOTRDP < RUNDEP else RUNDEP - (TOTRDP - depth)
+            self.SAT += (ctx.SATWC - pwp) * 25.4 * tempDepth
+            self.FC += (ctx.Soil.FIELDC[i] - pwp) * 25.4 * tempDepth
+            self.Layers.append((i, pwp, tempDepth))
+            if TOTRDP >= RUNDEP:
+                break
+
+    def getCurve(self, CNUMB: float) -> tuple:
+        """Returns the maximum retention (SMAX) and the shape coefficients (W1, W2) for the curve number."""
+        curve = self.Curves.get(CNUMB)
+        if curve is None:
+            SAT, FC = self.SAT, self.FC
+            S3 = 25.4 * (1000.0 / (23.0 * CNUMB / (10.0 + 0.13 * CNUMB)) - 10.0)
+            SMAX = 25.4 * (1000.0 / (4.2 * CNUMB / (10.0 - 0.058 * CNUMB)) - 10.0)
+            temp: float = log(FC / (1.0 - S3 / SMAX) - FC)
+            W2: float = (temp - log(SAT / (1.0 - 2.54 / SMAX) - SAT)) / (SAT - FC)
+            W1: float = temp + W2 * FC
+            curve = self.Curves[CNUMB] = (SMAX, W1, W2)
+        return curve
+
+
+def CalculateRunOffFraction(ctx: SimulationContext, CNUMB: float) -> float:
     """Calculate The Runoff Fraction From The Antecedent Moisture"""
-    # TONOTE: Fully revised method.
+    # TONOTE: REVISED, only SW is computed every time, see RunoffConstants.
+    runoff: RunoffConstants = ctx.Runoff
+    SMAX, W1, W2 = runoff.getCurve(CNUMB)
+
+    # TONOTE: Summed layer by layer as in the Fortran loop, a dot product would change the last digits.
+    SW = 0.0
+    THETA = ctx.THETA
+    for i, pwp, tempDepth in runoff.Layers:
+        SW += (THETA[i] - pwp) * 25.4 * tempDepth
 
-    S3 = 25.4 * (1000.0 / (23.0 * CNUMB / (10.0 + 0.13 * CNUMB)) - 10.0)
-    SMAX = 25.4 * (1000.0 / (4.2 * CNUMB / (10.0 - 0.058 * CNUMB)) - 10.0)
-
-    tempDepth = 0.0
-    pwp, depth = 0.0, 0.0
-    TOTRDP, RUNDEP = 0.0, 12.0
-    SW, SAT, FC = 0.0, 0.0, 0.0
-    for i in range(SIM.Sim.LAYERS):
-        pwp = SIM.PWP[i]
-        depth = SIM.BLOC.DEPTH[i]
-        TOTRDP += depth
-        tempDepth = depth if TOTRDP < RUNDEP else RUNDEP - (TOTRDP - depth)
-        SAT += (SIM.SATWC - pwp) * 25.4 * tempDepth
-        SW += (SIM.THETA[i] - pwp) * 25.4 * tempDepth
-        FC += (SIM.Soil.FIELDC[i] - pwp) * 25.4 * tempDepth
-        if TOTRDP >= RUNDEP:
-            break
-
-    temp: float = log(FC / (1.0 - S3 / SMAX) - FC)
-    W2: float = (temp - log(SAT / (1.0 - 2.54 / SMAX) - SAT)) / (SAT - FC)
-    W1: float = temp + W2 * FC
     S: float = max(2.54, SMAX * (1.0 - SW / (SW + exp(W1 - W2 * SW))))
-    SIM.CURVNO = 25400.0 / (S + 254.0)
+    ctx.CURVNO = 25400.0 / (S + 254.0)
     return S
 
 
-def GetCurveNumber() -> float:
+def GetCurveNumber(ctx: SimulationContext) -> float:
     """Return the Curve Number for the current crop."""
     # TONOTE: Fully revised method
-    CN = SIM.BLOC.CN
+    CN = ctx.BLOC.CN
     # TONOTE: In Fortran => IHYGRP = SOIL/10 - 10*(SOIL/100)
-    # IHYGRP:int = int(SIM.SOIL/10.0 - 10.0*(SIM.SOIL/100.0))
-    IHYGRP: int = SIM.Soil.HydrologicGroup - 1
-    CNUMB: float = CN[SIM.Sim.CROP][IHYGRP]
-    if SIM.Sim.CROP < 10:
+    # IHYGRP:int = int(ctx.SOIL/10.0 - 10.0*(ctx.SOIL/100.0))
+    IHYGRP: int = ctx.Soil.HydrologicGroup - 1
+    CNUMB: float = CN[ctx.Sim.CROP][IHYGRP]
+    if ctx.Sim.CROP < 10:
         # Adjust Curve Number For Residue Cover for small grain and row crops.
         # TONOTE: I guess we are using OLDCRP instead of 
         #           CROP because is about the residue cover, right?
         INVCNFACT: float = 1.0 - max(GetCurveAdjustmentFactor(
-            SIM.RESIDUE, SIM.BLOC.RESTYP[SIM.OLDCRP - 1]), 0.0)
+            ctx.RESIDUE, ctx.BLOC.RESTYP[ctx.OLDCRP - 1]), 0.0)
 
-        CNFALLOW: float = SIM.BLOC.CNFALLOW[IHYGRP]
+        CNFALLOW: float = ctx.BLOC.CNFALLOW[IHYGRP]
         CNFALO: float = CNFALLOW * INVCNFACT
 
-        GDD = SIM.Sim.GDD
-        if SIM.GDD <= GDD.VEG:
+        GDD = ctx.Sim.GDD
+        if ctx.GDD <= GDD.VEG:
             CNUMB = CNFALO
         else:
             CNAVG: float = CNUMB * INVCNFACT
-            if SIM.GDD <= GDD.EFC:
-                CNUMB = CNFALO + (CNAVG - CNFALO) * (SIM.GDD - GDD.VEG) / (GDD.EFC - GDD.VEG)
+            if ctx.GDD <= GDD.EFC:
+                CNUMB = CNFALO + (CNAVG - CNFALO) * (ctx.GDD - GDD.VEG) / (GDD.EFC - GDD.VEG)
             else:
                 CNPEAK: float = (2.0 * CNUMB - CNFALLOW) * INVCNFACT
-                CNUMB = CNAVG + (CNPEAK - CNAVG) * (SIM.GDD - GDD.EFC) / (GDD.MAT - GDD.EFC)
+                CNUMB = CNAVG + (CNPEAK - CNAVG) * (ctx.GDD - GDD.EFC) / (GDD.MAT - GDD.EFC)
 
-        if SIM.GDD > GDD.MAT:
+        if ctx.GDD > GDD.MAT:
             CNUMB = CNFALO * INVCNFACT
 
     return CNUMB
@@ -136,38 +165,36 @@ def RunOffFractionToCurveNumber(runOffFraction: float) -> float:
     return 25400.0 / (runOffFraction + 254.0)
 
 
-def CalculateEffectivePrecipitation(S: float):
+def CalculateEffectivePrecipitation(ctx: SimulationContext, S: float):
     """Calculate The Effective Precipitation."""
     # TONOTE: Fully revised method.
     # Compute The Relative Runoff -- Fraction Of Precipitation
-    RRUNOF: float = ComputeRelativeRunoff(S / 25.4, SIM.RAIN)
+    RRUNOF: float = ComputeRelativeRunoff(S / 25.4, ctx.RAIN)
 
     # alculate The Effective Precipitation.
     # Increase the depth in the channel portion of conservation terraces.
-    if SIM.Sim.ITERRC == 0:
+    if ctx.Sim.ITERRC == 0:
         # If not a terrace channel
-        SIM.EPRECIP = SIM.RAIN * (1.0 - RRUNOF)
-        SIM.RUNON = 0.0
-        SIM.RUNOFF = SIM.RAIN - SIM.EPRECIP
+        ctx.EPRECIP = ctx.RAIN * (1.0 - RRUNOF)
+        ctx.RUNON = 0.0
+        ctx.RUNOFF = ctx.RAIN - ctx.EPRECIP
     else:
-        SIM.RUNON = SIM.RAIN * RRUNOF * (SIM.Sim.TINTRV - SIM.Sim.CHANW) / SIM.Sim.CHANW
-        DPOND: float = (SIM.RAIN * RRUNOF + SIM.RUNON) / 12.0
+        ctx.RUNON = ctx.RAIN * RRUNOF * (ctx.Sim.TINTRV - ctx.Sim.CHANW) / ctx.Sim.CHANW
+        DPOND: float = (ctx.RAIN * RRUNOF + ctx.RUNON) / 12.0
         # Depth of ponded water in the channel (in feet).
-        if DPOND <= SIM.Sim.CHAND:
-            SIM.RUNOFF = 0.0
-            SIM.EPRECIP = SIM.RUNON + SIM.RAIN
+        if DPOND <= ctx.Sim.CHAND:
+            ctx.RUNOFF = 0.0
+            ctx.EPRECIP = ctx.RUNON + ctx.RAIN
         else:
-            SIM.RUNOFF = (DPOND - SIM.Sim.CHAND) * 12.0
-            SIM.EPRECIP = SIM.RAIN * (1.0 - RRUNOF) + SIM.Sim.CHAND * 12.0
+            ctx.RUNOFF = (DPOND - ctx.Sim.CHAND) * 12.0
+            ctx.EPRECIP = ctx.RAIN * (1.0 - RRUNOF) + ctx.Sim.CHAND * 12.0
 
-    if SIM.RUNOFF < 0.0 or (SIM.EPRECIP > SIM.RAIN and SIM.Sim.ITERRC == 0):
-        # TOASK: Here the Fortran code exists after printing some variable values to the console
+    if ctx.RUNOFF < 0.0 or (ctx.EPRECIP > ctx.RAIN and ctx.Sim.ITERRC == 0):
+        # TOASK: Here the Fortran code exits after printing some variable values to the console
         # It seems that the simulation has found some kind of error condition,
         # however, it does not display any error message.
-        # By now, I'm replicating the Fortran code behaviour.
-        print(" @ 1487:", SIM.JDAY, SIM.Sim.CROP, SIM.SOIL, SIM.RAIN, S * 25.4, RRUNOF,
-              SIM.EPRECIP, SIM.RAIN, SIM.RUNOFF, SIM.Sim.ITERRC, SIM.CurrentCrop.SIMFILE)
-        sys.exit()
+        # The crop-year fails instead, see the ERROR_POLICY setting.
+        raise EffectivePrecipitationError(ctx, 1487)
 
 
 def ComputeRelativeRunoff(S: float, P: float) -> float:
@@ -32,15 +32,15 @@
 # DINF
 # IRIGNO
 # 
-# SIM.Sim.Irrigation.JFIRST
+# ctx.Sim.Irrigation.JFIRST
 # ================================================================
 
-import SIM
+from SimulationContext import SimulationContext
 
 from Data.Irrigation import IrrigationData, IrrigationTypes
 
 
-def IRRIGA():
+def IRRIGA(ctx: SimulationContext):
     """Irrigation scheduling routine."""
 
     # Don't Allow Irrigation If Before The First Delivery Date
@@ -50,25 +50,25 @@ def IRRIGA():
     # For Stress Irrigation of Alfalfa And Grass There Is Also a Period
     # Between JSTOPI And JGOI When Irrigation Is Not Allowed
 
-    SIM.NETIRR, SIM.GROIRR = 0.0, 0.0
+    ctx.NETIRR, ctx.GROIRR = 0.0, 0.0
 
-    ISTAGE: int = SIM.ICUT if SIM.KSTG == 0 else SIM.KSTG
+    ISTAGE: int = ctx.ICUT if ctx.KSTG == 0 else ctx.KSTG
 
     # Adjusting ISTAGE to a 0-based index
     ISTAGE -= 1
 
-    IRR = SIM.Sim.Irrigation
-    RAINSTOR: float = IRR.RAINAL[ISTAGE] * SIM.DPLA
+    IRR = ctx.Sim.Irrigation
+    RAINSTOR: float = IRR.RAINAL[ISTAGE] * ctx.DPLA
 
     if IRR.IRRSCH < 3:
-        ComputeForAllowableDepletion(IRR, ISTAGE, RAINSTOR)
+        ComputeForAllowableDepletion(ctx, IRR, ISTAGE, RAINSTOR)
     elif IRR.IRRSCH == 3:
-        ComputeForRotationSystems(IRR, ISTAGE, RAINSTOR)
+        ComputeForRotationSystems(ctx, IRR, ISTAGE, RAINSTOR)
     elif IRR.IRRSCH in (4, 5):
-        ComputeForKnownFutureRainfall(IRR, ISTAGE, RAINSTOR, IRR.IRRSCH == 5)
+        ComputeForKnownFutureRainfall(ctx, IRR, ISTAGE, RAINSTOR, IRR.IRRSCH == 5)
 
 
-def ComputeForAllowableDepletion(IRR: IrrigationData, ISTAGE: int, RAINSTOR: float):
+def ComputeForAllowableDepletion(ctx: SimulationContext, IRR: IrrigationData, ISTAGE: int, RAINSTOR: float):
     """Computes the irrigation for the allowable depletion scheduling method."""
     # -------------------------------------------------------------------------
     #   Irrigation Scheduled By Allowable Depletion
@@ -79,94 +79,92 @@ def ComputeForAllowableDepletion(IRR: IrrigationData, ISTAGE: int, RAINSTOR: flo
     #   The Smallest Allowable Irrigation Is The Minimum Amount That Would Be
     #   Practical With The Irrigation System Regardless Of Crop Needs.
     # -------------------------------------------------------------------------
-    if SIM.AWDPLN < SIM.DPLA or SIM.TODAY + 1.0 < SIM.JNEXTI or \
-            SIM.GDD < IRR.GSTART or SIM.GDD >= IRR.GSTOP:
+    if ctx.AWDPLN < ctx.DPLA or ctx.TODAY + 1.0 < ctx.JNEXTI or \
+            ctx.GDD < IRR.GSTART or ctx.GDD >= IRR.GSTOP:
         return
 
-    SIM.NETIRR = SIM.DPLN - RAINSTOR
-    SIM.GROIRR = SIM.NETIRR / SIM.Sim.EAPP[ISTAGE]
+    ctx.NETIRR = ctx.DPLN - RAINSTOR
+    ctx.GROIRR = ctx.NETIRR / ctx.Sim.EAPP[ISTAGE]
 
-    if __adjustIfLessThan(IRR, ISTAGE):
+    if __adjustIfLessThan(ctx, IRR, ISTAGE):
         # For Surface Irrigation Systems Runoff And Reuse Losses Are Considered
-        __considerIrrigationLoss(IRR, ISTAGE)
+        __considerIrrigationLoss(ctx, IRR, ISTAGE)
 
 
-def ComputeForRotationSystems(IRR: IrrigationData, ISTAGE: int, RAINSTOR: float):
+def ComputeForRotationSystems(ctx: SimulationContext, IRR: IrrigationData, ISTAGE: int, RAINSTOR: float):
     """Computes the irrigation for a rotation system."""
     # Fixed Delivery Schedule For Rotation Systems
     # Check If Water Is Needed.  Irrigate If The Depletion Minus The
     # Rainfall Allowance Exceeds The Smallest Allowable Irrigation.
-    SOILMD: float = SIM.AWDPLN - RAINSTOR
-    if SOILMD <= SIM.Sim.EAPP[ISTAGE] * IRR.SMALLI[ISTAGE]:
-        SIM.NETIRR, SIM.GROIRR, SIM.DINF = 0.0, 0.0, 0.0
+    SOILMD: float = ctx.AWDPLN - RAINSTOR
+    if SOILMD <= ctx.Sim.EAPP[ISTAGE] * IRR.SMALLI[ISTAGE]:
+        ctx.NETIRR, ctx.GROIRR, ctx.DINF = 0.0, 0.0, 0.0
     else:
-        SIM.GROIRR = SIM.Sim.DDEPTH
-        SIM.NETIRR = SIM.Sim.DDEPTH * SIM.Sim.EAPP[ISTAGE]
-        SIM.DINF = SIM.NETIRR if IRR.IRRTYP <= 3 else \
-            SIM.GROIRR * (1.0 - (1.0 - SIM.Sim.EREUSE[ISTAGE]) * SIM.Sim.PRUNOF[ISTAGE])
+        ctx.GROIRR = ctx.Sim.DDEPTH
+        ctx.NETIRR = ctx.Sim.DDEPTH * ctx.Sim.EAPP[ISTAGE]
+        ctx.DINF = ctx.NETIRR if IRR.IRRTYP <= 3 else \
+            ctx.GROIRR * (1.0 - (1.0 - ctx.Sim.EREUSE[ISTAGE]) * ctx.Sim.PRUNOF[ISTAGE])
 
-        __addIrigNo()
+        __addIrigNo(ctx)
 
 
-def ComputeForKnownFutureRainfall(IRR: IrrigationData, ISTAGE: int, RAINSTOR: float, considerET: bool):
+def ComputeForKnownFutureRainfall(ctx: SimulationContext, IRR: IrrigationData, ISTAGE: int, RAINSTOR: float, considerET: bool):
     """Scheduling with known future rainfall"""
-    NFDAY: int = SIM.BLOC.NFDAY
-    if SIM.JDAY < SIM.JNEXTI or SIM.GDD < IRR.GSTART or SIM.GDD >= IRR.GSTOP:
+    NFDAY: int = ctx.BLOC.NFDAY
+    if ctx.JDAY < ctx.JNEXTI or ctx.GDD < IRR.GSTART or ctx.GDD >= IRR.GSTOP:
         return
     # Compute rain and crop ET for the forecast period
     # FORCRAIN: Rain during future forecast period.
-    # SIM.NETIRR = 0.0 # Redundant rest of NETIRR
-    FORCET, FORCRAIN = 0.0, 0.0
+    # ctx.NETIRR = 0.0 # Redundant rest of NETIRR
+    # TONOTE: Looked up from the sums of the crop-year, see ForecastWindows.
+    FORCRAIN: float = ctx.Forecast.getRain(ctx.JDAY, NFDAY)
     if considerET:
-        for i in range(SIM.JDAY, SIM.JDAY + NFDAY):
-            FORCRAIN += SIM.PRECIP[i]
-            FORCET += SIM.ETR[i] * SIM.CROPKC[i]
+        # TONOTE: The crop ET of the forecast period (FORCET) was summed but never used, as in the
+        # Fortran code, it is left out. See ForecastWindows.getCropET.
         # Can delay irrigation if the forecast rain will meet needs
-        if SIM.AWDPLN >= SIM.DPLA and FORCRAIN <= 1.0:
-            SIM.NETIRR = max(0.0, SIM.DPLN - RAINSTOR)
+        if ctx.AWDPLN >= ctx.DPLA and FORCRAIN <= 1.0:
+            ctx.NETIRR = max(0.0, ctx.DPLN - RAINSTOR)
     else:
-        for i in range(SIM.JDAY, SIM.JDAY + NFDAY):
-            FORCRAIN += SIM.PRECIP[i]
         # Can delay irrigation if the forecast rain will meet needs
-        if SIM.AWDPLN - FORCRAIN >= SIM.DPLA:
-            SIM.NETIRR = max(0.0, SIM.DPLN - RAINSTOR)
+        if ctx.AWDPLN - FORCRAIN >= ctx.DPLA:
+            ctx.NETIRR = max(0.0, ctx.DPLN - RAINSTOR)
 
-    SIM.GROIRR = SIM.NETIRR / SIM.Sim.EAPP[ISTAGE]
+    ctx.GROIRR = ctx.NETIRR / ctx.Sim.EAPP[ISTAGE]
 
-    __adjustIfLessThan(IRR, ISTAGE)
+    __adjustIfLessThan(ctx, IRR, ISTAGE)
 
     # For Surface Irrigation Systems Runoff And Reuse Losses Are Considered
-    __considerIrrigationLoss(IRR, ISTAGE)
+    __considerIrrigationLoss(ctx, IRR, ISTAGE)
 
 
-def __adjustIfLessThan(IRR: IrrigationData, ISTAGE: int) -> bool:
+def __adjustIfLessThan(ctx: SimulationContext, IRR: IrrigationData, ISTAGE: int) -> bool:
     """Returns False when GROIRR was < SMALLI, so irrigation loss 
     should not be considered for Allowable Depletion schedule."""
 
-    if SIM.GROIRR < IRR.SMALLI[ISTAGE]:
-        SIM.NETIRR, SIM.GROIRR, SIM.DINF = 0.0, 0.0, 0.0
+    if ctx.GROIRR < IRR.SMALLI[ISTAGE]:
+        ctx.NETIRR, ctx.GROIRR, ctx.DINF = 0.0, 0.0, 0.0
         return False
 
-    if SIM.GROIRR < IRR.APMIN[ISTAGE]: SIM.GROIRR = IRR.APMIN[ISTAGE]
-    if SIM.GROIRR > IRR.APMAX[ISTAGE]: SIM.GROIRR = IRR.APMAX[ISTAGE]
-    SIM.NETIRR = SIM.GROIRR * SIM.Sim.EAPP[ISTAGE]
+    if ctx.GROIRR < IRR.APMIN[ISTAGE]: ctx.GROIRR = IRR.APMIN[ISTAGE]
+    if ctx.GROIRR > IRR.APMAX[ISTAGE]: ctx.GROIRR = IRR.APMAX[ISTAGE]
+    ctx.NETIRR = ctx.GROIRR * ctx.Sim.EAPP[ISTAGE]
     return True
 
 
-def __considerIrrigationLoss(IRR: IrrigationData, ISTAGE: int):
+def __considerIrrigationLoss(ctx: SimulationContext, IRR: IrrigationData, ISTAGE: int):
     # For Surface Irrigation Systems Runoff And Reuse Losses Are Considered
 
-    SIM.DINF = SIM.NETIRR if IRR.IRRTYP != IrrigationTypes.Furrow else \
-        SIM.GROIRR * (1.0 - (1.0 - SIM.Sim.EREUSE[ISTAGE]) * SIM.Sim.PRUNOF[ISTAGE])
+    ctx.DINF = ctx.NETIRR if IRR.IRRTYP != IrrigationTypes.Furrow else \
+        ctx.GROIRR * (1.0 - (1.0 - ctx.Sim.EREUSE[ISTAGE]) * ctx.Sim.PRUNOF[ISTAGE])
 
-    CYCLET: float = SIM.GROIRR / (IRR.SYSCAP * IRR.IPER[ISTAGE])
-    SIM.JNEXTI = max(SIM.TODAY, SIM.JNEXTI) + CYCLET
+    CYCLET: float = ctx.GROIRR / (IRR.SYSCAP * IRR.IPER[ISTAGE])
+    ctx.JNEXTI = max(ctx.TODAY, ctx.JNEXTI) + CYCLET
 
-    __addIrigNo()
+    __addIrigNo(ctx)
 
 
-def __addIrigNo():
+def __addIrigNo(ctx: SimulationContext):
     """Advances the IRIGNO global variable."""
-    SIM.IRIGNO += 1
-    if SIM.IRIGNO == 1:
-        SIM.Sim.Irrigation.JFIRST = SIM.JDAY
+    ctx.IRIGNO += 1
+    if ctx.IRIGNO == 1:
+        ctx.Sim.Irrigation.JFIRST = ctx.JDAY
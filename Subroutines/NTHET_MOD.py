@@ -2,10 +2,10 @@
 
 # 100% REVISED.
 
-import SIM
+from SimulationContext import SimulationContext
 
 
-def NTHET():
+def NTHET(ctx: SimulationContext):
     """Calculate The Amount Of Water That Can Be Added To Each Layer"""
 
     DINFL: float = 0.0
@@ -13,24 +13,24 @@ def NTHET():
     AMT: float = 0.0
     # The amount of water that can be added to a layer
 
-    for i in range(SIM.Sim.LAYERS):
-        if SIM.DINF == 0.0: return
-        AMT = (SIM.Soil.FIELDC[i] - SIM.THETA[i]) * SIM.BLOC.DEPTH[i]
+    for i in range(ctx.Sim.LAYERS):
+        if ctx.DINF == 0.0: return
+        AMT = (ctx.Soil.FIELDC[i] - ctx.THETA[i]) * ctx.BLOC.DEPTH[i]
         if AMT < 0.0: AMT = 0.0
 
-        if AMT >= SIM.DINF:
-            DINFL = SIM.DINF
-            SIM.DINF = 0.0
+        if AMT >= ctx.DINF:
+            DINFL = ctx.DINF
+            ctx.DINF = 0.0
         else:
             DINFL = AMT
-            SIM.DINF -= AMT
+            ctx.DINF -= AMT
 
         # Add Water To The Layer
-        SIM.THETA[i] += DINFL / SIM.BLOC.DEPTH[i]
+        ctx.THETA[i] += DINFL / ctx.BLOC.DEPTH[i]
 
     # If Any Water Is Left Then Add An Equal Amount To Every Layer
-    THETUP: float = SIM.DINF / SIM.TOTDEP
-    for i in range(SIM.Sim.LAYERS):
-        SIM.THETA[i] += THETUP
+    THETUP: float = ctx.DINF / ctx.TOTDEP
+    for i in range(ctx.Sim.LAYERS):
+        ctx.THETA[i] += THETUP
 
-    SIM.DINF = 0.0
+    ctx.DINF = 0.0
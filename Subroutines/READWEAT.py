@@ -5,202 +5,201 @@
 from math import cos
 from math import exp
 
-import SIM
+from SimulationContext import SimulationContext
 
 from Subroutines.DAYS import DAYOFYR
-from Subroutines.CROPCO import CROPCO
+from Subroutines.CROPCO import ComputeSeasonCoefficients, GetSeasonKey, GetSeasonState
 
 from Files.WeaFile import WeaFile
-from Data.WeatherDailyData import WeatherDailyData
+from Files.WeatherStore import WeatherStore
+from Data.WeatherStation import WeatherStation
+from Data.WeatherData import WeatherData, WeatherCache, GrowingDegreeDays, ForecastWindows
 
 
-def READWEAT(site: str, year: int):
+def READWEAT(ctx: SimulationContext, site: str, year: int):
     """Read and Process Weather Data"""
 
-    wea = WeaFile(SIM.Config.getSiteFilename(site, year))
+    # The cleaned weather doesn't depend on the crop or the soil, only the crop
+    # related data (GDD, development dates and crop coefficients) is computed every time.
+    cache: WeatherCache = ctx.WeatherCache
+    weather: WeatherData = cache.get(site, year) if cache is not None else None
+    if weather is None:
+        weather = LoadWeatherData(ctx, site, year)
+        if cache is not None:
+            cache.put(site, year, weather)
+    # The solar radiation is only needed by SOILTEMP, computed once a chain needs it.
+    if ctx.SoilTemperature and weather.SOLAR is None:
+        ComputeSolarRadiation(weather)
+
+    ctx.Station = weather.Station
+    ctx.JDYSTR = weather.JDYSTR
+    # TONOTE: The daily weather arrays are shared with the cache, they are never modified.
+    ctx.ETR = weather.ETR
+    ctx.TMIN = weather.TMIN
+    ctx.TMAX = weather.TMAX
+    ctx.PRECIP = weather.PRECIP
+    ctx.SOLAR = weather.SOLAR
+    ctx.TANUAL = weather.TANUAL
+
+    degrees = CalculateGrowingDegreeDays(ctx, weather)
+
+    CalculateCropData(ctx, degrees)
+
+    ComputeDailyCropCoefficients(ctx, degrees)
+    # The growing degree days and seasons are cached with the weather, and count toward the cache cap.
+    if cache is not None:
+        cache.resize(site, year, weather)
+
+    # The forecast periods are only summed when IRRIGA schedules with known future weather.
+    ctx.Forecast = ForecastWindows(ctx.PRECIP, ctx.ETR, ctx.CROPKC) if ctx.Sim.Irrigation.IRRSCH >= 4 else None
+
+
+def LoadWeatherData(ctx: SimulationContext, site: str, year: int) -> WeatherData:
+    """Reads the .WEA file for the site and year, replacing the missing or out of range values.
+    From the weather store, the daily columns are read from its views, without a WeatherDailyData per day."""
+    store: WeatherStore = ctx.WeatherStore
+    if store is not None and (site, year) in store:
+        TMAX, TMIN, PRECIP, ETR = store.getValues(site, year, ("TMAX", "TMIN", "PRECIP", "ETR")).tolist()
+        return CleanWeatherColumns(store.getStation(site, year), TMAX, TMIN, PRECIP, ETR, ctx.BLOC.ETRFACT)
+
+    return CleanWeatherData(WeaFile(ctx.Config.getSiteFilename(site, year)), ctx.BLOC.ETRFACT)
+
+
+def CleanWeatherData(wea, ETRFACT: float) -> WeatherData:
+    """Reads the daily data from a WeaFile or any reader with its interface, replacing the missing
+    or out of range values and reducing the reference ET, then closes the reader."""
+    station = wea.StationData
+    days = [wea.ReadNextDayData() for _ in range(station.NDAYS)]
+    wea.close()
+    return CleanWeatherColumns(station, [data.TMAX for data in days], [data.TMIN for data in days],
+                               [data.PRECIP for data in days], [data.ETR for data in days], ETRFACT)
+
 
-    SIM.Station = wea.StationData
-    SIM.JDYSTR = DAYOFYR(SIM.Station.IMSTR, SIM.Station.IDSTR)
+def CleanWeatherColumns(station: WeatherStation, TMAXS: list, TMINS: list, PRECIPS: list, ETRS: list,
+                        ETRFACT: float) -> WeatherData:
+    """Replaces the missing or out of range values of the daily columns read, a value per day of the
+    station data, and reduces the reference ET."""
+    weather = WeatherData(station, DAYOFYR(station.IMSTR, station.IDSTR))
+    ETR, TMIN, TMAX, PRECIP = weather.ETR, weather.TMIN, weather.TMAX, weather.PRECIP
+    JDYSTR = weather.JDYSTR
 
-    # This counter should yield the same as SIM.Station.NDAYS
+    # This counter should yield the same as station.NDAYS
     NDAYS = 0
 
     # Set Defaults For First Days Of Simulation For Weather
     TMINA, TMAXA = 30.0, 55.0
     ETRA, PRECIPA = 0.10, 0.0
 
-    temp = [0.0] * 366
-    SIM.ETR = temp[:]
-    SIM.TMIN = temp[:]
-    SIM.TMAX = temp[:]
-    SIM.GDDS = temp[:]
-    SIM.SOLAR = temp[:]
-    SIM.PRECIP = temp[:]
-    SIM.CROPKC = temp[:]
-
-    startIndex = SIM.JDYSTR - 1
-    endIndex = startIndex + SIM.Station.NDAYS
-    for i in range(startIndex, endIndex):
-        data: WeatherDailyData = wea.ReadNextDayData()
-
-        SIM.ETR[i] = ETRA if data.ETR < 0.0 or data.ETR > 0.6 else data.ETR
-        SIM.TMIN[i] = TMINA if data.TMIN < -50.0 or data.TMIN > 100.0 else data.TMIN
-        SIM.TMAX[i] = TMAXA if data.TMAX < -50.0 or data.TMAX > 125.0 else data.TMAX
-        SIM.PRECIP[i] = PRECIPA if data.PRECIP < 0.0 or data.PRECIP > 10.0 else data.PRECIP
+    startIndex = JDYSTR - 1
+    for day in range(station.NDAYS):
+        i = startIndex + day
+        ETR[i] = ETRA if ETRS[day] < 0.0 or ETRS[day] > 0.6 else ETRS[day]
+        TMIN[i] = TMINA if TMINS[day] < -50.0 or TMINS[day] > 100.0 else TMINS[day]
+        TMAX[i] = TMAXA if TMAXS[day] < -50.0 or TMAXS[day] > 125.0 else TMAXS[day]
+        PRECIP[i] = PRECIPA if PRECIPS[day] < 0.0 or PRECIPS[day] > 10.0 else PRECIPS[day]
 
         # Adjusted for 0-based indexing.
-        if i - SIM.JDYSTR >= 2:
-            ETRA = (SIM.ETR[i] + SIM.ETR[i - 1] + SIM.ETR[i - 2]) / 3.0
-            TMINA = (SIM.TMIN[i] + SIM.TMIN[i - 1] + SIM.TMIN[i - 2]) / 3.0
-            TMAXA = (SIM.TMAX[i] + SIM.TMAX[i - 1] + SIM.TMAX[i - 2]) / 3.0
-            PRECIPA = (SIM.PRECIP[i] + SIM.PRECIP[i - 1] + SIM.PRECIP[i - 2]) / 3.0
+        if i - JDYSTR >= 2:
+            ETRA = (ETR[i] + ETR[i - 1] + ETR[i - 2]) / 3.0
+            TMINA = (TMIN[i] + TMIN[i - 1] + TMIN[i - 2]) / 3.0
+            TMAXA = (TMAX[i] + TMAX[i - 1] + TMAX[i - 2]) / 3.0
+            PRECIPA = (PRECIP[i] + PRECIP[i - 1] + PRECIP[i - 2]) / 3.0
 
         # Reduce Reference Crop ET for Field Values and High Values from HPCC
-        SIM.ETR[i] *= SIM.BLOC.ETRFACT
+        ETR[i] *= ETRFACT
         NDAYS += 1
 
-    wea.close()
-
-    assert NDAYS == SIM.Station.NDAYS
+    assert NDAYS == station.NDAYS
 
     # JDYSTP is used only locally so removed from global SIM data.
-    # SIM.JDYSTP = SIM.JDYSTR + NDAYS - 1
-
-    CalculateGrowingDegreeDays()
-
-    CalculateCropData()
-
-    ComputeDailyCropCoefficients()
-
-
-def CalculateGrowingDegreeDays():
-    """Calculate The Growing Degree Days"""
-    # TONOTE: REVISED
-    SIM.JDYFRZ = 0
-
-    ICROP = SIM.Sim.CROP - 1
-    CEIL = SIM.BLOC.TCEIL[ICROP]
-    BASE = SIM.BLOC.TBASE[ICROP]
-    for i in range(SIM.JDYPLT - 1, SIM.JDYEND):
-        i1: int = i + 1
-        T1 = SIM.TMAX[i]
-
-        if T1 >= CEIL:
-            T1 = CEIL
-
-        if T1 < BASE:
-            T1 = BASE
+    # ctx.JDYSTP = ctx.JDYSTR + NDAYS - 1
 
-        T2 = SIM.TMIN[i]
+    return weather
 
-        if T2 <= BASE:
-            T2 = BASE
 
-        if T2 > CEIL:
-            T2 = CEIL
+def CalculateGrowingDegreeDays(ctx: SimulationContext, weather: WeatherData) -> GrowingDegreeDays:
+    """Calculate The Growing Degree Days
+    They are computed once per weather data, crop base and ceiling temperatures, planting and end days."""
+    # TONOTE: REVISED, see GrowingDegreeDays.
+    ICROP = ctx.Sim.CROP - 1
+    key = (ctx.BLOC.TBASE[ICROP], ctx.BLOC.TCEIL[ICROP], ctx.JDYPLT, ctx.JDYEND)
+    degrees: GrowingDegreeDays = weather.Degrees.get(key)
+    if degrees is None:
+        degrees = weather.Degrees[key] = GrowingDegreeDays(weather, *key)
 
-        SIM.GDD = (T1 + T2) / 2.0 - BASE
-        if SIM.GDD < 0.0:
-            SIM.GDD = 0.0
-        SIM.GDDS[i] = SIM.GDDS[i - 1] + SIM.GDD
+    ctx.GDDS = degrees.GDDS
+    # The GDD of the last day is left over for the first CROPCO call.
+    if degrees.GDD is not None:
+        ctx.GDD = degrees.GDD
+    ctx.JDYFRZ = degrees.JDYFRZ
 
-        # Determine First Killing Freeze Date
-        if i1 < 200 or SIM.TMIN[i] >= 26.0:
-            continue
-        if SIM.JDYFRZ < 1:
-            SIM.JDYFRZ = i1
+    if ctx.JDYSTR > ctx.JDYBG:
+        ctx.JDYBG = ctx.JDYSTR
+    return degrees
 
-    if SIM.JDYFRZ < 1:
-        SIM.JDYFRZ = SIM.JDYEND
 
-    if SIM.JDYSTR > SIM.JDYBG:
-        SIM.JDYBG = SIM.JDYSTR
-
-
-def CalculateCropData():
+def CalculateCropData(ctx: SimulationContext, degrees: GrowingDegreeDays):
     """Calculate Development, Maturity And Cover Dates Based On Gdd
     Skip Calculation Of Development Dates For Non Row Crops"""
 
     # @3637~3680
     # TONOTE: Full revised
 
-    if SIM.Sim.CROP >= 10:
-        SIM.JDYMAT = SIM.JDYFRZ
-        SIM.JDYEFC = __FindGddIndexGreaterOrEqualTo(SIM.Sim.GDD.EFC)
+    GDD = ctx.Sim.GDD
+    if ctx.Sim.CROP >= 10:
+        ctx.JDYMAT = ctx.JDYFRZ
+        ctx.JDYEFC, = degrees.findDays((GDD.EFC,))
     else:
-        GDD = SIM.Sim.GDD
-        SIM.JDYVEG, SIM.JDYEFC, SIM.JDYFLO, SIM.JDYRIPE, SIM.JDYMAT = \
-            __FindGddIndices([GDD.VEG, GDD.EFC, GDD.FLO, GDD.RIPE, GDD.MAT])
-        if SIM.JDYMAT > SIM.JDYFRZ: SIM.JDYMAT = SIM.JDYFRZ
-
-
-def __FindGddIndexGreaterOrEqualTo(value: float) -> int:
-    """Finds the GDD 1-based index for the specified value."""
-    # TONOTE: Full revised
-    # This must return the 1-based index.
-    for i in range(SIM.JDYPLT - 1, SIM.JDYEND):
-        if SIM.GDDS[i] >= value: return i + 1
-    return SIM.JDYEND + 1
-
+        ctx.JDYVEG, ctx.JDYEFC, ctx.JDYFLO, ctx.JDYRIPE, ctx.JDYMAT = \
+            degrees.findDays((GDD.VEG, GDD.EFC, GDD.FLO, GDD.RIPE, GDD.MAT))
+        if ctx.JDYMAT > ctx.JDYFRZ: ctx.JDYMAT = ctx.JDYFRZ
 
-def __FindGddIndicesOld():
-    SIM.JDYEFC = __FindGddIndexGreaterOrEqualTo(SIM.Sim.GDD.EFC)
-    SIM.JDYMAT = __FindGddIndexGreaterOrEqualTo(SIM.Sim.GDD.MAT)
-    SIM.JDYFLO = __FindGddIndexGreaterOrEqualTo(SIM.Sim.GDD.FLO)
-    SIM.JDYRIPE = __FindGddIndexGreaterOrEqualTo(SIM.Sim.GDD.RIPE)
-    SIM.JDYVEG = __FindGddIndexGreaterOrEqualTo(SIM.Sim.GDD.VEG)
 
+def ComputeDailyCropCoefficients(ctx: SimulationContext, degrees: GrowingDegreeDays):
+    """Compute daily value of crop coefficients
+    They are computed once per GDDS array and crop data, see GetSeasonKey."""
 
-def __FindGddIndices(values: list) -> list:
-    """Finds the GDD 1-based index for the specified value."""
-    # This method saves many loops.
-    n: int = len(values)
-    remain = [*range(n)]
-    ret: list = [SIM.JDYEND + 1] * n
-
-    # TONOTE: Full revised
-    # This must return the 1-based index.
-    for i in range(SIM.JDYPLT - 1, SIM.JDYEND):
-        for j in remain:
-            if SIM.GDDS[i] >= values[j]:
-                ret[j] = i + 1
-                remain.remove(j)
-                if not remain: return ret
-    return ret
+    # @ 3683
+    # TONOTE: REVISED, the whole season at once, see ComputeSeasonCoefficients.
+    JDYSTP: int = ctx.JDYSTR + ctx.Station.NDAYS - 1
+    key = GetSeasonKey(ctx, JDYSTP)
+    state = GetSeasonState(ctx.Sim.CROP)
+    season = degrees.Coefficients.get(key)
+    if season is None:
+        ctx.CROPKC = ComputeSeasonCoefficients(ctx, ctx.JDYSTR, JDYSTP)
+        degrees.Coefficients[key] = (ctx.CROPKC, tuple(getattr(ctx, name) for name in state))
+    else:
+        # TONOTE: The CROPKC array is shared, it is never modified.
+        ctx.CROPKC, values = season
+        for name, value in zip(state, values):
+            setattr(ctx, name, value)
 
 
-def ComputeDailyCropCoefficients():
-    """Compute daily value of crop coefficients"""
+def ComputeSolarRadiation(weather: WeatherData):
+    """Estimates the daily solar radiation and the mean annual air temperature."""
 
-    # @ 3683
-    # TONOTE: Fully revised
-    JDYSTP: int = SIM.JDYSTR + SIM.Station.NDAYS - 1
-    for i in range(SIM.JDYSTR - 1, JDYSTP):
-        SIM.JDAY = i + 1
-        CROPCO()
-        SIM.GDD = SIM.GDDS[i]
-        SIM.CROPKC[i] = SIM.KC
-
-    SIM.TANUAL = 0.0
+    weather.SOLAR = [0.0] * 366
+    weather.TANUAL = 0.0
     # USELESS see 1.3 on FortranCodeAnalysis.txt
     # TAMP, AIRMIN, AIRMAX = 0.0, 0.0, 0.0
-    LAT, ELEV = SIM.Station.LAT, SIM.Station.ELEV
+    LAT, ELEV = weather.Station.LAT, weather.Station.ELEV
+    JDYSTP: int = weather.JDYSTR + weather.Station.NDAYS - 1
     for i in range(JDYSTP):
         DAY = i + 1
-        TMAX = SIM.TMAX[i]
-        TMIN = SIM.TMIN[i]
-        SIM.TAVG = 0.5 * (TMAX + TMIN)
+        TMAX = weather.TMAX[i]
+        TMIN = weather.TMIN[i]
+        TAVG = 0.5 * (TMAX + TMIN)
         RSOA = 753.6 - 6.53 * LAT + 0.0057 * ELEV
         RSOB = -7.1 + 6.4 * LAT + 0.0030 * ELEV
         RSO = RSOA + RSOB * cos(2 * 3.14159 * (DAY - 170) / 365)
         DELTAT = TMAX - TMIN
 
-        if SIM.PRECIP[i] > 0.2:
-            SIM.SOLAR[i] = RSO * exp(0.0146 * SIM.TAVG) / (1.0 + exp(-DELTAT / 36.301)) ** 3.6795
+        if weather.PRECIP[i] > 0.2:
+            weather.SOLAR[i] = RSO * exp(0.0146 * TAVG) / (1.0 + exp(-DELTAT / 36.301)) ** 3.6795
         else:
-            SIM.SOLAR[i] = RSO * exp(7.82E-4 * SIM.TAVG) / (1.0 + exp(-DELTAT / 9.4619)) ** 3.6142
+            weather.SOLAR[i] = RSO * exp(7.82E-4 * TAVG) / (1.0 + exp(-DELTAT / 9.4619)) ** 3.6142
 
-        SIM.TANUAL += SIM.TAVG
+        weather.TANUAL += TAVG
         # NOTE: These lines are actually useless too
         # if TMAX > AIRMAX: AIRMAX = TMAX
         # if TMIN < AIRMIN: AIRMIN = TMIN
@@ -208,4 +207,4 @@ def ComputeDailyCropCoefficients():
     # TONOTE: Also useless
     # TAMP = AIRMAX - AIRMIN
 
-    SIM.TANUAL /= float(SIM.Station.NDAYS)
+    weather.TANUAL /= float(weather.Station.NDAYS)
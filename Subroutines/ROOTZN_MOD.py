@@ -28,7 +28,7 @@
 # =================================================================
 
 
-import SIM
+from SimulationContext import SimulationContext
 
 
 # TONOTE: Very weird that the arguments to RDIST were named like that instead of Z1,Z2
@@ -41,16 +41,16 @@ def RDIST(Z2: float, Z1: float) -> float:
     return 2.0633 * (Z2 - Z1) - 1.622 * (Z2 * Z2 - Z1 * Z1) + 0.5587 * (Z2 * Z2 * Z2 - Z1 * Z1 * Z1)
 
 
-def ROOTZN():
+def ROOTZN(ctx: SimulationContext):
     """Implements the ROOTZN subroutine."""
     # TONOTE: In the original Fortran code, there were 3 DO loops
     # This Python code does the same in a single loop.
     # 1. Loop: <- DEPTH, -> REMAIN, PERRZD, == DEPTH
     # 2. Loop: 
 
-    GDDROOT: float = SIM.Sim.GDDROOT
-    RZMIN, RZMAX = SIM.Sim.RZMIN, SIM.RZMAX
-    RZD: float = (RZMAX - RZMIN) * (SIM.GDD - GDDROOT) / (SIM.Sim.GDD.FLO - GDDROOT) + RZMIN
+    GDDROOT: float = ctx.Sim.GDDROOT
+    RZMIN, RZMAX = ctx.Sim.RZMIN, ctx.RZMAX
+    RZD: float = (RZMAX - RZMIN) * (ctx.GDD - GDDROOT) / (ctx.Sim.GDD.FLO - GDDROOT) + RZMIN
 
     if RZD > RZMAX:
         RZD = RZMAX
@@ -64,18 +64,18 @@ def ROOTZN():
     ZU, ZL = 0.0, 0.0
     FDEPTH: float = 0.0
     REMAIN: float = RZD
-    RZMGMT: float = SIM.RZMGMT
-    SIM.PAW, SIM.AWATER = 0.0, 0.0
+    RZMGMT: float = ctx.RZMGMT
+    ctx.PAW, ctx.AWATER = 0.0, 0.0
     TOPDEP: float = 0.0  # Top depth of a soil layer.
     BOTDEP: float = 0.0  # Bottom depth of a soil layer.
 
-    for i in range(SIM.Sim.LAYERS):
-        depth = SIM.BLOC.DEPTH[i]
+    for i in range(ctx.Sim.LAYERS):
+        depth = ctx.BLOC.DEPTH[i]
         # Calculate The Percent Of Each Layer Filled With Roots
         REMAIN -= depth
-        if REMAIN >= 0.0: SIM.PERRZD[i] = 1.0
+        if REMAIN >= 0.0: ctx.PERRZD[i] = 1.0
         if -depth < REMAIN < 0.0:
-            SIM.PERRZD[i] = (depth + REMAIN) / depth
+            ctx.PERRZD[i] = (depth + REMAIN) / depth
         if REMAIN < 0.0: REMAIN = 0.0
         # Compute the available water in the irrigation management zone
         # that extends through the RZMGMT depth and the plant available
@@ -86,19 +86,19 @@ def ROOTZN():
         # roots are below RZMGMT, or PERRZD if the roots are above RZMGMT.
         TOPDEP = BOTDEP
         BOTDEP += depth
-        if BOTDEP <= RZMGMT: SIM.AWATER += SIM.AVMFT[i] * SIM.PERRZD[i]
+        if BOTDEP <= RZMGMT: ctx.AWATER += ctx.AVMFT[i] * ctx.PERRZD[i]
         # TONOTE: Removed a redundat condition
         if TOPDEP < RZMGMT < BOTDEP:
-            FDEPTH = SIM.PERRZD[i] if RZD < RZMGMT else (RZMGMT - TOPDEP) / depth
-            SIM.AWATER += SIM.AVMFT[i] * FDEPTH
-        SIM.PAW += SIM.PAWFT[i] * SIM.PERRZD[i]
+            FDEPTH = ctx.PERRZD[i] if RZD < RZMGMT else (RZMGMT - TOPDEP) / depth
+            ctx.AWATER += ctx.AVMFT[i] * FDEPTH
+        ctx.PAW += ctx.PAWFT[i] * ctx.PERRZD[i]
 
         ZU = ZL
         ZL += depth / RZD
         if ZL > 1.0:
             ZL = 1.0
 
-        SIM.RDF[i] = RDIST(ZL, ZU)
+        ctx.RDF[i] = RDIST(ZL, ZU)
 
     # Update Globals
-    SIM.RZD = RZD
+    ctx.RZD = RZD
@@ -32,7 +32,7 @@
 from math import sin
 from math import exp
 
-import SIM
+from SimulationContext import SimulationContext
 
 # TONOTE: Weird thing about SMTMP, is declared and read in SNOWMELT, but never assigned
 
@@ -40,7 +40,7 @@ SMTMP = 0.0
 """Snow melt base temperature (in °F)."""
 
 
-def SNOWMELT(JDAY: int):
+def SNOWMELT(ctx: SimulationContext, JDAY: int):
     """This subroutine predicts daily snom melt."""
 
     # (LINE 3976)
@@ -48,33 +48,33 @@ def SNOWMELT(JDAY: int):
     # TONOTE: SNOTMP comes from the initial data file and previous simulation results,
     # the same as SNOH2O, SNOTMP only read and modified here,
     # SNOH2O also read at SOILTEMP
-    SIM.SNOTMP = SIM.SNOTMP * (1.0 - SIM.BLOC.TIMP) + SIM.TAVG * SIM.BLOC.TIMP
+    ctx.SNOTMP = ctx.SNOTMP * (1.0 - ctx.BLOC.TIMP) + ctx.TAVG * ctx.BLOC.TIMP
     # Calculate snow fall
-    if SIM.TAVG <= SIM.BLOC.SFTMP:
-        SIM.SNOH2O += SIM.RAIN
+    if ctx.TAVG <= ctx.BLOC.SFTMP:
+        ctx.SNOH2O += ctx.RAIN
         # TONOTE: SNOFALL is not actually used, only assigned in one statement, never used.
-        # SIM.SNOFALL = SIM.RAIN
-        SIM.RAIN = 0.0
+        # ctx.SNOFALL = ctx.RAIN
+        ctx.RAIN = 0.0
 
     # Adjust melt factor for time of year
     IJDAY: int = JDAY - 1
-    if SIM.SNOH2O > 0.0 and SIM.TMAX[IJDAY] > SMTMP:
-        SMFMX: float = SIM.BLOC.SMFMX
-        SMFMN: float = SIM.BLOC.SMFMN
+    if ctx.SNOH2O > 0.0 and ctx.TMAX[IJDAY] > SMTMP:
+        SMFMX: float = ctx.BLOC.SMFMX
+        SMFMN: float = ctx.BLOC.SMFMN
         SMFAC: float = (SMFMX + SMFMN) / 2.0 + sin((JDAY - 81) / 58.09) * (SMFMX - SMFMN) / 2.0
-        SNOMLT: float = SMFAC * (((SIM.SNOTMP + SIM.TMAX[IJDAY]) / 2.0) - SMTMP)
+        SNOMLT: float = SMFAC * (((ctx.SNOTMP + ctx.TMAX[IJDAY]) / 2.0) - SMTMP)
         # SNOMLT: Amount of water in snow melt (in H₂O).
         # Adjust for areal extent of snow cover
-        if SIM.SNOH2O < SIM.BLOC.SNOCOVMX:
+        if ctx.SNOH2O < ctx.BLOC.SNOCOVMX:
             # XX is the ratio of amount of current day's snow water
-            XX: float = SIM.SNOH2O / SIM.BLOC.SNOCOVMX
-            SNOMLT *= XX / (XX + exp(SIM.BLOC.SNOCOV1 - SIM.BLOC.SNOCOV2 * XX))
+            XX: float = ctx.SNOH2O / ctx.BLOC.SNOCOVMX
+            SNOMLT *= XX / (XX + exp(ctx.BLOC.SNOCOV1 - ctx.BLOC.SNOCOV2 * XX))
 
         if SNOMLT < 0:
             SNOMLT = 0.0
 
-        if SNOMLT > SIM.SNOH2O:
-            SNOMLT = SIM.SNOH2O
+        if SNOMLT > ctx.SNOH2O:
+            SNOMLT = ctx.SNOH2O
 
-        SIM.SNOH2O -= SNOMLT
-        SIM.RAIN += SNOMLT
+        ctx.SNOH2O -= SNOMLT
+        ctx.RAIN += SNOMLT
@@ -40,24 +40,68 @@
 from math import log
 from math import exp
 
-import SIM
+from SimulationContext import SimulationContext
 
 TLAG: float = 0.8
 """Lag coefficient for soil temperature."""
 
+AUTO: str = "auto"
+ON: str = "on"
+OFF: str = "off"
+SOIL_TEMP_MODES = (AUTO, ON, OFF)
+"""The SOIL_TEMP settings, see IsSoilTemperatureUsed."""
 
-def SOILTEMP():
+
+def SOILTEMP(ctx: SimulationContext):
     """This method estimates daily average temperature at the bottom of each soil layer."""
 
-    ROM = SIM.BLOC
-    BULKD: float = SIM.Soil.BULKD
+    DD, SURFTEMP = ComputeSurfaceTemperature(ctx)
+
+    # calculate temperature for each layer on current day
+    # ZD: ratio of depth at center of layer to damping depth
+    # TLAG is the lag coefficient for soil temperature.
+    for k in range(ctx.Sim.LAYERS):
+        # calculate depth at center of layer (SWAT manual equation 2.3.5)
+        ZD = ctx.CENTER[k] / DD
+        # SWAT manual equation 2.3.4
+        DF = ZD / (ZD + exp(-0.8669 - 2.0775 * ZD))
+        # SWAT manual equation 2.3.3
+        ctx.SOILT[k] = TLAG * ctx.SOILT[k] + (1.0 - TLAG) * (DF * (ctx.TANUAL - SURFTEMP) + SURFTEMP)
+
+
+def IsSoilTemperatureUsed(ctx: SimulationContext) -> bool:
+    """Returns True when the soil temperatures of the chain are to be computed, as set by SOIL_TEMP:
+    always with on, never with off (--no-soil-temp), and with auto only when written to PROFILE.TXT.
+
+    TONOTE: SOILT only feeds SOILTEMP itself and the PROFILE.TXT rows, TAVG is also set at the start
+    of the day by DEPLT. When skipped, SOILT keeps its initial values and the solar radiation and
+    TANUAL are not computed by READWEAT, the rest of the results are the same."""
+    mode = ctx.Config.SOIL_TEMP
+    if mode != AUTO:
+        return mode == ON
+    pout = ctx.PrintOut
+    # PROFILE.TXT is not written by the YIELD_ONLY runs.
+    if pout.IPFLAG <= 1 or ctx.Config.YIELD_ONLY:
+        return False
+    # The LEGACY runs carry SOILT from one soil to the next, any soil printed needs them all.
+    if ctx.Config.LEGACY:
+        return True
+    return pout.isSitePrinted(ctx.Config, ctx.Site.NWSITE, ctx.SOIL)
+
+
+def ComputeSurfaceTemperature(ctx: SimulationContext) -> tuple:
+    """Computes the average temperature of the day (TAVG).
+    Returns the damping depth (DD) and the temperature of the soil surface (SURFTEMP) for the day."""
+
+    ROM = ctx.BLOC
+    BULKD: float = ctx.Soil.BULKD
 
     # DP: Maximum damping depth, in inches.
     # SWAT manual equation 2.3.6
     DP: float = 39.4 + 98.4 * (BULKD / (BULKD + 686.0 * exp(-5.63 * BULKD)))
     # WC: scaling factor for soil water impact on daily damping depth
     # SWAT manual equation 2.3.7
-    WC: float = SIM.TOTWAT / ((0.356 - (0.144 * BULKD)) * SIM.TOTDEP)
+    WC: float = ctx.TOTWAT / ((0.356 - (0.144 * BULKD)) * ctx.TOTDEP)
     # DD: damping depth for day, in mm.
     # SWAT manual equation 2.3.8
     # DD: float = DP * exp(log(19.7 / DP) * ((1.0 - WC) / (1.0 + WC))**2.0)
@@ -66,56 +110,47 @@ def SOILTEMP():
 
     # Compute the amount of soil cover from above ground biomass (AGBIO) and crop residue (RESIDUE).
     AGBIO: float = 0.0
-    if SIM.JDYPLT <= SIM.JDAY < SIM.JDYMAT and SIM.ETMAX > 0.0:
-        ICROP = SIM.Sim.CROP - 1
-        AGBIO = SIM.Sim.YMAX * ROM.YDENS[ICROP] * ROM.RESRAT[ICROP]
-        AGBIO *= (SIM.KC - ROM.KCL[ICROP]) / (ROM.KCU[ICROP] - ROM.KCL[ICROP])
+    if ctx.JDYPLT <= ctx.JDAY < ctx.JDYMAT and ctx.ETMAX > 0.0:
+        ICROP = ctx.Sim.CROP - 1
+        AGBIO = ctx.Sim.YMAX * ROM.YDENS[ICROP] * ROM.RESRAT[ICROP]
+        AGBIO *= (ctx.KC - ROM.KCL[ICROP]) / (ROM.KCU[ICROP] - ROM.KCL[ICROP])
 
     # Calculate lag factor for soil cover impact on soil surface temperature.
     # SWAT manual equation 2.3.11
-    CV: float = SIM.RESIDUE + AGBIO
+    CV: float = ctx.RESIDUE + AGBIO
     # BCV: lagging factor for cover
     BCV: float = 1.123 * CV / (1.123 * CV + exp(7.563 - 1.4566E-4 * CV))
 
-    if SIM.SNOH2O >= 0.0:
+    if ctx.SNOH2O >= 0.0:
         XX: float = 1.0
-        if SIM.SNOH2O <= 4.724:
-            XX = SIM.SNOH2O / (SIM.SNOH2O + exp(6.055 - 7.625 * SIM.SNOH2O))
+        if ctx.SNOH2O <= 4.724:
+            XX = ctx.SNOH2O / (ctx.SNOH2O + exp(6.055 - 7.625 * ctx.SNOH2O))
         # TONOTE: Maybe this max(1.0, BCV) should be done anyway? Also when SNOH20 < 0.0
         BCV = max(XX, BCV)
 
     # Calculate temperature at soil surface
     ALBEDO: float = 0.8
-    if SIM.SNOH2O <= 0.02:
+    if ctx.SNOH2O <= 0.02:
         COV: float = exp(-5.0E-5 * 1.123 * CV)
-        ALBSOIL: float = 0.30 - 0.10 * (SIM.Soil.AvailableWaterHoldingCapacity - 4.0) / 5.0
-        # ALBSOIL: float = 0.30 - 0.10 * (SIM.SOIL/100.0 - 4.0) / 5.0
+        ALBSOIL: float = 0.30 - 0.10 * (ctx.Soil.AvailableWaterHoldingCapacity - 4.0) / 5.0
+        # ALBSOIL: float = 0.30 - 0.10 * (ctx.SOIL/100.0 - 4.0) / 5.0
         ALBEDO = 0.23 * (1.0 - COV) + COV * ALBSOIL
 
-    IJDAY: int = SIM.JDAY - 1
+    IJDAY: int = ctx.JDAY - 1
     # SWAT manual equation 2.3.10
     # STO: Radiation hitting soil surface on day, in MJ/m²
-    STO: float = (4.1855E-02 * SIM.SOLAR[IJDAY] * (1.0 - ALBEDO) - 14.0) / 20.0
+    STO: float = (4.1855E-02 * ctx.SOLAR[IJDAY] * (1.0 - ALBEDO) - 14.0) / 20.0
     # SWAT manual equation 2.3.9
-    SIM.TAVG = (SIM.TMAX[IJDAY] + SIM.TMIN[IJDAY]) / 2.0
+    ctx.TAVG = (ctx.TMAX[IJDAY] + ctx.TMIN[IJDAY]) / 2.0
     # TBARE: Temperature of bare soil surface, in °C.
-    TBARE: float = SIM.TAVG + 0.5 * (SIM.TMAX[IJDAY] - SIM.TMIN[IJDAY]) * STO
+    TBARE: float = ctx.TAVG + 0.5 * (ctx.TMAX[IJDAY] - ctx.TMIN[IJDAY]) * STO
 
     # SURFTEMP: Temperature of soil surface, in °C.
     SURFTEMP: float = TBARE
-    if SIM.RESIDUE > 0.01 or SIM.SNOH2O > 0.01:
+    if ctx.RESIDUE > 0.01 or ctx.SNOH2O > 0.01:
         # SWAT manual equation 2.3.12
         # TCOV: temperature of soil surface corrected for cover, in °C.
-        TCOV: float = BCV * SIM.SOILT[1] + (1.0 - BCV) * TBARE
+        TCOV: float = BCV * ctx.SOILT[1] + (1.0 - BCV) * TBARE
         SURFTEMP = min(TBARE, TCOV)
 
-    # calculate temperature for each layer on current day
-    # ZD: ratio of depth at center of layer to damping depth
-    # TLAG is the lag coefficient for soil temperature.
-    for k in range(SIM.Sim.LAYERS):
-        # calculate depth at center of layer (SWAT manual equation 2.3.5)
-        ZD = SIM.CENTER[k] / DD
-        # SWAT manual equation 2.3.4
-        DF = ZD / (ZD + exp(-0.8669 - 2.0775 * ZD))
-        # SWAT manual equation 2.3.3
-        SIM.SOILT[k] = TLAG * SIM.SOILT[k] + (1.0 - TLAG) * (DF * (SIM.TANUAL - SURFTEMP) + SURFTEMP)
+    return DD, SURFTEMP
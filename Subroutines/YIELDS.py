@@ -23,7 +23,7 @@
 # =================================================================
 
 
-import SIM
+from SimulationContext import SimulationContext
 
 # Coefficients to adjust maximum yields over time for grains, tuber and forage crops
 AC = (-22.963, -13.156, -18.249, 1.000, 1.000,
@@ -38,7 +38,7 @@ _BC = (1.19899996e-2, 7.07999989e-3, 9.63000022e-3, 0.0, 0.0,
        6.01000013e-3, 1.19899996e-2, 1.27999997e-2, 9.08999983e-3, 6.77999994e-3, 1.06699998e-2)
 
 
-def YIELDS():
+def YIELDS(ctx: SimulationContext):
     """Implementation of the YIELDS subroutine."""
 
     # TOASK: About YADJ, the Fortran code says:
@@ -47,27 +47,27 @@ def YIELDS():
     # year versus what the yield would have been in 2001
     # ===================================================
 
-    YMAX: float = SIM.Sim.YMAX
-    ICROP: int = SIM.Sim.CROP - 1
-    YCOEFF: float = SIM.Sim.YCOEFF
+    YMAX: float = ctx.Sim.YMAX
+    ICROP: int = ctx.Sim.CROP - 1
+    YCOEFF: float = ctx.Sim.YCOEFF
     # YADJ: fraction of the yield for the specified year VS what the yield would have been in 2001
-    YADJ: float = 1.0 if SIM.BLOC.YTREND != 1 else max(0.0, AC[ICROP] + BC[ICROP] * SIM.IYEAR)
-    if SIM.Sim.CROP.requiresYieldAdjustment():
+    YADJ: float = 1.0 if ctx.BLOC.YTREND != 1 else max(0.0, AC[ICROP] + BC[ICROP] * ctx.IYEAR)
+    if ctx.Sim.CROP.requiresYieldAdjustment():
         # This code is only required to execute when YADJ is > 0
-        if SIM.Sim.IYIELD == 1:
+        if ctx.Sim.IYIELD == 1:
             TR, TA = 0.0, 0.0
             for i in range(5):
-                TA += SIM.TPS[i]
-                TR += SIM.TDEF[i]
-            SIM.YIELD = YADJ * YMAX * (1.0 - YCOEFF * TR / TA)
+                TA += ctx.TPS[i]
+                TR += ctx.TDEF[i]
+            ctx.YIELD = YADJ * YMAX * (1.0 - YCOEFF * TR / TA)
         else:
-            SIM.YIELD = YADJ * YMAX * ((1.0 - YCOEFF) + YCOEFF * SIM.ETYLD / SIM.ETMAX)
+            ctx.YIELD = YADJ * YMAX * ((1.0 - YCOEFF) + YCOEFF * ctx.ETYLD / ctx.ETMAX)
     else:
-        SIM.YIELD = YMAX
+        ctx.YIELD = YMAX
 
-    if SIM.YIELD < 0.0:
-        SIM.YIELD = 0.0
+    if ctx.YIELD < 0.0:
+        ctx.YIELD = 0.0
 
     # BVALUE and YLDRATIO required for YR output to RepRiver format.
-    SIM.BVALUE = float("inf") if SIM.ETMAX == 0.0 else YADJ * YMAX * YCOEFF / SIM.ETMAX
-    SIM.YLDRATIO = SIM.YIELD / (YADJ * YMAX)
+    ctx.BVALUE = float("inf") if ctx.ETMAX == 0.0 else YADJ * YMAX * YCOEFF / ctx.ETMAX
+    ctx.YLDRATIO = ctx.YIELD / (YADJ * YMAX)
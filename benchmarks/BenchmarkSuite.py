@@ -0,0 +1,234 @@
+"""Benchmark suite timing the main stages of a simulation on a synthetic dataset.
+
+Scenarios:
+    parse       reading the configuration, the global input files, the crop files and the .SIM files
+    readweat    the READWEAT calls of a full run, reading and processing the weather
+    deplt       the DEPLT calls of a full run, the daily soil water balance
+    run         the whole simulation, writing the outputs
+
+Every scenario is repeated and the times of every repeat are written to a JSON report,
+so the results of two commits can be compared with --compare. The settings given with
+--setting are added to the configuration of the dataset, e.g. --setting LOCKSTEP=1.
+The simulation always runs on a single process, so the subroutines can be timed.
+
+Usage: python -m benchmarks.BenchmarkSuite [--sites N] [--years M] [--soils S] [--repeats R]
+           [--setting KEY=VALUE]... [--output report.json] [--compare baseline.json]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+
+import PyCropSim
+import SIM
+from Configuration import Configuration
+from Files.SimFile import SimFile
+from Subroutines import CROPSIM
+
+from benchmarks.SyntheticData import SyntheticDataset
+
+SCENARIOS = ("parse", "readweat", "deplt", "run")
+"""The scenarios timed, in the order reported."""
+
+REPORT_VERSION = 1
+
+
+class ScenarioTimes:
+    """The times (in seconds) of every repeat of a scenario."""
+
+    __slots__ = ("Times", "Calls")
+
+    def __init__(self):
+        self.Times: list = []
+        self.Calls: int = 0
+        """Number of calls timed on every repeat, for the subroutines."""
+
+    def toDict(self) -> dict:
+        """Returns the times as plain data for the report."""
+        return {"best": min(self.Times), "median": statistics.median(self.Times),
+                "times": self.Times, "calls": self.Calls}
+
+
+@contextlib.contextmanager
+def commandLine(*args: str):
+    """Runs the block with the specified command-line arguments, as read by the Configuration."""
+    argv, sys.argv = sys.argv, [sys.argv[0], *args]
+    try:
+        yield
+    finally:
+        sys.argv = argv
+
+
+@contextlib.contextmanager
+def timing(module, name: str, times: list):
+    """Appends the time of every call to the module function into the times list."""
+    function = getattr(module, name)
+
+    def timed(*args):
+        start = time.perf_counter()
+        try:
+            return function(*args)
+        finally:
+            times.append(time.perf_counter() - start)
+
+    setattr(module, name, timed)
+    try:
+        yield
+    finally:
+        setattr(module, name, function)
+
+
+def resetProcessData():
+    """Drops the data kept by this process from a previous run, so every repeat starts cold."""
+    SIM.SimFiles = {}
+    SIM.Context = None
+
+
+def parseInputs(cfg: str, outDir: str) -> int:
+    """Reads the configuration, the global input files, the crop files and the .SIM files.
+    Returns the number of .SIM files read."""
+    resetProcessData()
+    with commandLine("--cfg", cfg, "-o", outDir), contextlib.redirect_stdout(io.StringIO()):
+        config = SIM.Config = Configuration()
+        count = 0
+        for zone in config.ZONES:
+            names = {crop.SIMFILE for crop in config.openCropFile(zone).Rows}
+            for name in sorted(names):
+                SimFile(os.path.join(config.getZonePath(zone), f"{name}.SIM"))
+                count += 1
+    return count
+
+
+def runSimulation(cfg: str, outDir: str) -> dict:
+    """Runs the whole simulation, timing its READWEAT and DEPLT calls.
+    Returns the times of the run and the lists of times of the subroutines."""
+    resetProcessData()
+    readweat, deplt = [], []
+    output = io.StringIO()
+    with commandLine("--cfg", cfg, "-o", outDir, "--workers", "1"), contextlib.redirect_stdout(output), \
+            timing(CROPSIM, "READWEAT", readweat), timing(CROPSIM, "DEPLT", deplt), \
+            timing(CROPSIM, "DEPLT_BATCH", deplt):
+        start = time.perf_counter()
+        try:
+            PyCropSim.main()
+        except SystemExit:
+            raise RuntimeError("The simulation failed:\n" + "\n".join(output.getvalue().splitlines()[-10:]))
+        elapsed = time.perf_counter() - start
+    return {"run": elapsed, "readweat": readweat, "deplt": deplt}
+
+
+def runScenarios(cfg: str, outDir: str, repeats: int) -> dict:
+    """Runs every scenario the specified number of times, returns their times by name."""
+    scenarios = {name: ScenarioTimes() for name in SCENARIOS}
+    for repeat in range(repeats):
+        start = time.perf_counter()
+        scenarios["parse"].Calls = parseInputs(cfg, os.path.join(outDir, f"parse{repeat}"))
+        scenarios["parse"].Times.append(time.perf_counter() - start)
+
+        results = runSimulation(cfg, os.path.join(outDir, f"run{repeat}"))
+        scenarios["run"].Times.append(results["run"])
+        scenarios["run"].Calls = 1
+        for name in ("readweat", "deplt"):
+            scenarios[name].Times.append(sum(results[name]))
+            scenarios[name].Calls = len(results[name])
+        print(f"Repeat {repeat + 1}/{repeats}: {results['run']:.2f} s")
+    return scenarios
+
+
+def getCommit() -> dict:
+    """Returns the current git commit of the repository, when available."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=root, check=True,
+                                capture_output=True, text=True).stdout.strip()
+        status = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=root,
+                                check=True, capture_output=True, text=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return {"commit": None, "dirty": None}
+    return {"commit": commit, "dirty": bool(status.strip())}
+
+
+def writeSettings(cfg: str, settings: list) -> str:
+    """Writes a copy of the configuration file with the settings added, returns its path."""
+    if not settings:
+        return cfg
+    filename = os.path.splitext(cfg)[0] + ".benchmark.cfg"
+    with open(cfg, "rt") as source, open(filename, "wt") as file:
+        file.write(source.read())
+        for setting in settings:
+            file.write(setting + "\n")
+    return filename
+
+
+def printReport(report: dict, baseline: dict = None):
+    """Prints the scenario times of the report, compared to those of the baseline report if given."""
+    print(f"Commit {report['commit']}{' (modified)' if report['dirty'] else ''}, "
+          f"dataset {report['dataset']}, settings {report['settings']}")
+    header = f"{'Scenario':<10}{'Best':>10}{'Median':>10}{'Calls':>8}"
+    if baseline:
+        print(f"Baseline commit {baseline['commit']}, dataset {baseline['dataset']}, "
+              f"settings {baseline['settings']}")
+        header += f"{'Baseline':>10}{'Speedup':>9}"
+    print(header)
+    for name in SCENARIOS:
+        times = report["scenarios"][name]
+        line = f"{name:<10}{times['best']:>9.3f}s{times['median']:>9.3f}s{times['calls']:>8}"
+        if baseline and name in baseline["scenarios"]:
+            best = baseline["scenarios"][name]["best"]
+            line += f"{best:>9.3f}s{best / times['best']:>8.2f}x"
+        print(line)
+
+
+def main():
+    """Runs the benchmark suite and writes its report."""
+    parser = argparse.ArgumentParser(description="Times the main stages of a simulation on a synthetic dataset.")
+    parser.add_argument("--sites", type=int, default=2, help="number of weather sites")
+    parser.add_argument("--years", type=int, default=2, help="number of years simulated")
+    parser.add_argument("--soils", type=int, default=8, help="number of soils simulated per site (up to 28)")
+    parser.add_argument("--zones", type=int, default=1, help="number of climatic zones")
+    parser.add_argument("--seed", type=int, default=1, help="seed of the synthetic weather")
+    parser.add_argument("--repeats", type=int, default=3, help="times every scenario is run")
+    parser.add_argument("--setting", action="append", default=[], metavar="KEY=VALUE",
+                        help="configuration setting added to the dataset configuration, may be repeated")
+    parser.add_argument("--output", default="benchmark.json", help="the JSON report written")
+    parser.add_argument("--compare", metavar="REPORT", help="a previous JSON report to compare with")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, "rt") as file:
+            baseline = json.load(file)
+
+    dataset = {"sites": args.sites, "years": args.years, "soils": args.soils, "zones": args.zones,
+               "seed": args.seed}
+    with tempfile.TemporaryDirectory() as path:
+        print(f"Writing the synthetic dataset: {dataset}")
+        cfg = SyntheticDataset(path, sites=args.sites, years=args.years, zones=args.zones, seed=args.seed,
+                               soilsPerSite=args.soils).write()
+        cfg = writeSettings(cfg, args.setting)
+        scenarios = runScenarios(cfg, os.path.join(path, "Results"), args.repeats)
+
+    report = {"version": REPORT_VERSION, **getCommit(), "date": datetime.now().isoformat(timespec="seconds"),
+              "python": platform.python_version(), "numpy": np.__version__, "platform": platform.platform(),
+              "dataset": dataset, "settings": args.setting, "repeats": args.repeats,
+              "scenarios": {name: times.toDict() for name, times in scenarios.items()}}
+    with open(args.output, "wt") as file:
+        json.dump(report, file, indent=2)
+
+    printReport(report, baseline)
+    print(f"Report written to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
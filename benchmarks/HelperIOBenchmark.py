@@ -0,0 +1,91 @@
+"""Micro-benchmark of the HelperIO readers.
+
+Parses the BLOCK.DAT and .SIM files of a synthetic dataset with the character readers
+(a plain text file) and with a TextBuffer, checking both yield the same data. The short .SIM files
+are parsed about as fast either way, their time is spent on the calls rather than the characters.
+
+Usage: python -m benchmarks.HelperIOBenchmark [repeats]
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+from Files import BlocFile as BlocFileModule
+from Files import SimFile as SimFileModule
+from Files.BlocFile import BlocFile
+from Files.SimFile import SimFile
+from HelperIO import OpenTextFile
+
+from benchmarks.SyntheticData import SyntheticDataset
+
+
+def openCharacterFile(filename: str):
+    """Opens the file as the readers did before the TextBuffer, read one character at a time."""
+    return open(filename, "r")
+
+
+@contextlib.contextmanager
+def characterReaders():
+    """Makes the file readers use plain text files, to time the character readers."""
+    modules = (BlocFileModule, SimFileModule)
+    for module in modules:
+        module.OpenTextFile = openCharacterFile
+    try:
+        yield
+    finally:
+        for module in modules:
+            module.OpenTextFile = OpenTextFile
+
+
+def toData(value):
+    """Returns the value as plain data, to compare the parsed files."""
+    if hasattr(value, "__slots__"):
+        return {name: toData(getattr(value, name, None)) for name in value.__slots__}
+    if isinstance(value, (list, tuple)):
+        return [toData(item) for item in value]
+    if isinstance(value, dict):
+        return {key: toData(item) for key, item in value.items()}
+    return value
+
+
+def timeParse(parse, filename: str, repeats: int) -> float:
+    """Returns the best time (in seconds) to parse the file, out of 5 rounds of repeats."""
+    best = float("inf")
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(5):
+            start = time.perf_counter()
+            for _ in range(repeats):
+                parse(filename)
+            best = min(best, (time.perf_counter() - start) / repeats)
+    return best
+
+
+def main(repeats: int = 200):
+    """Runs the benchmark and prints the results."""
+    with tempfile.TemporaryDirectory() as path:
+        SyntheticDataset(path, sites=1, years=1).write()
+        model = os.path.join(path, "CSModel")
+        fixtures = [(BlocFile, os.path.join(model, "BLOCK.DAT"))]
+        simPath = os.path.join(model, "SIM", "Zone1")
+        fixtures += [(SimFile, os.path.join(simPath, name)) for name in sorted(os.listdir(simPath))
+                     if name.endswith(".SIM")]
+
+        print(f"{'File':<14}{'Characters':>14}{'TextBuffer':>14}{'Speedup':>10}")
+        for parse, filename in fixtures:
+            with contextlib.redirect_stdout(io.StringIO()), characterReaders():
+                expected = toData(parse(filename))
+            with contextlib.redirect_stdout(io.StringIO()):
+                assert toData(parse(filename)) == expected, f"Different data parsed from {filename}"
+
+            with characterReaders():
+                old = timeParse(parse, filename, repeats)
+            new = timeParse(parse, filename, repeats)
+            print(f"{os.path.basename(filename):<14}{old * 1e6:>11.1f} us{new * 1e6:>11.1f} us{old / new:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
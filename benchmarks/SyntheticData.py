@@ -0,0 +1,226 @@
+"""Writes a self-consistent synthetic CropSim input dataset.
+
+Usage: python -m benchmarks.SyntheticData <folder> [sites] [years] [soils per site]
+"""
+
+import math
+import os
+import random
+import sys
+
+from Files.SoilPropFile import SOILTYP, DDAYSOILDIC
+
+LAYER_DEPTHS = (2.0, 2.0, 5.0, 6.0, 6.0, 9.0, 12.0, 12.0, 12.0, 12.0)
+"""Layer depths (in inches) written to the BLOCK.DAT file."""
+
+SIM_FILES = {
+    # name: (crop, irrigation type)
+    "CORNDRCT": (8, 1),
+    "CORNIRCT": (8, 3),
+    "SOYBDRCT": (3, 1),
+    "WHEADRCT": (7, 1),
+    "ALFAIRCT": (10, 3),
+    "NATVPAST": (13, 1),
+}
+"""The .SIM files written for every zone."""
+
+
+class SyntheticDataset:
+    """Writes a synthetic dataset for N sites by M years into the specified folder."""
+
+    __slots__ = ("Path", "Sites", "Years", "Zones", "FirstYear", "Seed", "SoilsPerSite")
+
+    def __init__(self, path: str, sites: int = 2, years: int = 3, zones: int = 1,
+                 firstYear: int = 2001, seed: int = 1, soilsPerSite: int = 28):
+        self.Path = path
+        """The root folder for the dataset, used as INPUTDIR."""
+        self.Sites = [f"S{i:03}" for i in range(sites)]
+        """The 4 letter codes of the weather sites."""
+        self.Years = list(range(firstYear, firstYear + years))
+        """The simulated years."""
+        self.Zones = zones
+        """The number of climatic zones."""
+        self.FirstYear = firstYear
+        self.Seed = seed
+        """Seed for the random generator, the same seed writes the same dataset."""
+        self.SoilsPerSite = min(28, soilsPerSite)
+        """The number of soils simulated for each site."""
+
+    def write(self) -> str:
+        """Writes the whole dataset and returns the path to its configuration file."""
+        model = os.path.join(self.Path, "CSModel")
+        for folder in ("Soil", "Wea", "SIM"):
+            os.makedirs(os.path.join(model, folder), exist_ok=True)
+
+        self.writeBlocFile(os.path.join(model, "BLOCK.DAT"))
+        self.writeTillageFile(os.path.join(model, "tillage.dat"))
+        self.writePrintOutFile(os.path.join(model, "PRFILE"))
+        self.writeControlFile(os.path.join(model, "WSiteInfo.txt"))
+        self.writeSoilFile(os.path.join(model, "Soil", "allsoil.csv"))
+        self.writeSoilPropFile(os.path.join(model, "Soil", "NESoils.dat"))
+        for zone in range(1, self.Zones + 1):
+            zonePath = os.path.join(model, "SIM", f"Zone{zone}")
+            os.makedirs(zonePath, exist_ok=True)
+            self.writeCropFile(os.path.join(zonePath, "Cropping.csv"))
+            for name, (crop, irrtyp) in SIM_FILES.items():
+                self.writeSimFile(os.path.join(zonePath, f"{name}.SIM"), crop, irrtyp)
+        for site in self.Sites:
+            for year in self.Years:
+                self.writeWeaFile(os.path.join(model, "Wea", f"{site}{year}.WEA"), site, year)
+
+        return self.writeConfigFile(os.path.join(self.Path, "synthetic.cfg"))
+
+    def writeConfigFile(self, filename: str) -> str:
+        """Writes the configuration file pointing to the dataset."""
+        with open(filename, "wt") as file:
+            file.write((
+                f"INPUTDIR={self.Path}\n"
+                "BLOCFILE=CSModel/BLOCK.DAT\nTILFILE=CSModel/tillage.dat\nPRTFILE=CSModel/PRFILE\n"
+                "CNTRFILE=CSModel/WSiteInfo.txt\nCROPFILE=Cropping.csv\n"
+                "SOILFILE=CSModel/Soil/allsoil.csv\nSOILPROP=CSModel/Soil/NESoils.dat\n"
+                "WEA_DIR=CSModel/Wea\nZONES_DIR=CSModel/SIM/Zone\n"
+                f"ZONES={','.join(str(z) for z in range(1, self.Zones + 1))}\n"
+                f"OUTPUT_FORMAT=1\nOUTDIR={os.path.join(self.Path, 'Results')}\n"
+                "LEGACY=0\nSINGLE_RUN=0\nPRINT_ALL_SOILS=1\n"))
+        return filename
+
+    @staticmethod
+    def writeBlocFile(filename: str):
+        """Writes the BLOCK.DAT file."""
+
+        def row(values, label, fmt="{:.3f}"):
+            return " ".join(fmt.format(v) for v in values) + f" {label}\n"
+
+        kcl = [0.15] * 22
+        kcu = [1.05] * 22
+        with open(filename, "wt") as file:
+            file.write("0.95 5 0 ETRFACT NFDAY YTREND\n")
+            file.write(row(LAYER_DEPTHS, "DEPTH", "{:.1f}"))
+            file.write(row([56.0] * 22, "YDENS", "{:.1f}"))
+            file.write(row([1.0] * 22, "RESRAT"))
+            file.write(row([0.3] * 22, "SPGRAV"))
+            file.write(row([1 + i % 2 for i in range(22)], "FRAGIL", "{}"))
+            file.write(row([1 + i % 2 for i in range(22)], "RESTYP", "{}"))
+            for crop in range(7):
+                before = [0.2 + 0.08 * i + 0.01 * crop for i in range(10)]
+                after = [1.0 - 0.06 * i for i in range(10)]
+                file.write(row(before, f"KC CROP {crop + 1}"))
+                file.write(row(after, "").rstrip() + "\n")
+            file.write(row([0.3 + 0.07 * i for i in range(10)], "KC ALFALFA"))
+            file.write(row([0.4 + 0.06 * i for i in range(10)], "").rstrip() + "\n")
+            file.write(row([0.4 + 0.05 * i for i in range(10)], "").rstrip() + "\n")
+            file.write(row(kcl, "KCL"))
+            file.write(row(kcu, "KCU"))
+            file.write(row([50.0 if i != 6 else 32.0 for i in range(22)], "TBASE", "{:.1f}"))
+            file.write(row([86.0] * 22, "TCEIL", "{:.1f}"))
+            file.write("33.0 0.18 0.05 0.5 4.0 8.0 0.5 SNOW PARAMETERS\n")
+            file.write("77 86 91 94 CNFALLOW\n")
+            for crop in range(22):
+                file.write(row([67 + crop % 5, 76 + crop % 5, 83 + crop % 5, 86 + crop % 5],
+                               f"CN CROP {crop + 1}", "{}"))
+
+    @staticmethod
+    def writeTillageFile(filename: str):
+        """Writes the tillage.dat file."""
+        with open(filename, "wt") as file:
+            file.write("TILLAGE OPERATIONS\nCODE NONFRAGILE FRAGILE DESCRIPTION\n")
+            file.write("1 50 30 Moldboard plow\n2 80 60 Chisel\n3 90 80 Disk\n4 95 90 Planter\n")
+
+    def writePrintOutFile(self, filename: str):
+        """Writes the PRFILE file, enabling daily printouts for the first site."""
+        with open(filename, "wt") as file:
+            file.write(f"3 1 {SOILTYP[0]} {self.Years[0]} {self.Years[-1]} 1 IPFLAG INPRIN IPSOIL\n")
+            file.write(f"{self.Sites[0]}\n")
+
+    def writeControlFile(self, filename: str):
+        """Writes the WSiteInfo file."""
+        with open(filename, "wt") as file:
+            for i, site in enumerate(self.Sites):
+                file.write(f"{site}\t{1 + i % self.Zones}\t1\t{self.FirstYear}\n")
+
+    def writeSoilFile(self, filename: str):
+        """Writes the file listing the soils simulated for each site."""
+        with open(filename, "wt") as file:
+            file.write("SITE,COUNT," + ",".join(str(s) for s in SOILTYP) + "\n")
+            for i, site in enumerate(self.Sites):
+                sims = [1 if (j + i) % 28 < self.SoilsPerSite else 0 for j in range(28)]
+                file.write(f"{site},{sum(sims)}," + ",".join(str(s) for s in sims) + "\n")
+
+    @staticmethod
+    def writeSoilPropFile(filename: str):
+        """Writes the soil properties file for the 28 supported soils."""
+        with open(filename, "wt") as file:
+            file.write("CODE BULKD ORGM FIELDC(10) PWP(10) AIRDRY(3) DRNCOE DRNDAY\n")
+            for code in SOILTYP:
+                awc = int(str(code)[0])
+                fieldc = [0.12 + 0.025 * awc + 0.002 * i for i in range(10)]
+                pwp = [0.05 + 0.01 * awc + 0.001 * i for i in range(10)]
+                airdry = [p * 0.5 for p in pwp[:3]]
+                values = [1.30 + 0.02 * awc, 1.5] + fieldc + pwp + airdry + [0.5, DDAYSOILDIC[code]]
+                file.write(f"{code} " + " ".join(f"{v:.3f}" for v in values) + "\n")
+
+    def writeCropFile(self, filename: str):
+        """Writes the CROPFILE with every .SIM file simulated for every year."""
+        with open(filename, "wt") as file:
+            for name in SIM_FILES:
+                for year in self.Years:
+                    file.write(f"{name},{year}\n")
+
+    @staticmethod
+    def writeSimFile(filename: str, crop: int, irrtyp: int):
+        """Writes a .SIM file for the crop and irrigation type specified."""
+        with open(filename, "wt") as file:
+            file.write(f"{crop} 10 CROP LAYERS\n")
+            if crop == 7:
+                file.write("9 15 1 1 12 31 PLANTING BEGIN END\n")
+                file.write("150 1000 1400 2000 600 2600 GDD\n")
+            elif crop in (10, 11):
+                file.write("4 1 1 1 12 31 PLANTING BEGIN END\n")
+                file.write("5 160 195 225 255 285 CUTTINGS\n")
+            elif crop < 10:
+                file.write("5 5 1 1 12 31 PLANTING BEGIN END\n")
+                file.write("200 1400 1700 2300 1200 2700 GDD\n")
+            else:
+                file.write("4 15 1 1 12 31 PLANTING BEGIN END\n")
+                file.write("800 2400 GDD\n")
+            file.write(f"{6 if crop < 12 else 24} 48 50 100 36 ROOTS\n")
+            file.write(f"2 {200 if crop != 10 else 6} 1.0 YIELD\n")
+            file.write("0 0 0 0 TERRACE\n")
+            file.write("2 1 TILLAGE\n1 10 2\n3 5 3\n")
+            file.write(f"{irrtyp} 0.5 0.5 0.5 0.5 0.5 PAD\n")
+            file.write("0.5 0.5 0.5 0.5 0.5 0.8 RAINAL SYSCAP\n")
+            file.write("1 1 1 1 1 IPER\n0.5 0.5 0.5 0.5 0.5 APMIN\n")
+            file.write("1.5 1.5 1.5 1.5 1.5 APMAX\n0.3 0.3 0.3 0.3 0.3 SMALLI\n")
+            file.write("100 2500 1 150 GSTART GSTOP IRRSCH JFIRST\n")
+            file.write("0.85 0.85 0.85 0.85 0.85 EAPP\n0.5 0.5 0.5 0.5 0.5 EREUSE\n")
+            file.write("0.2 0.2 0.2 0.2 0.2 PRUNOF\n")
+
+    def writeWeaFile(self, filename: str, site: str, year: int):
+        """Writes a .WEA file for the site and year specified."""
+        rnd = random.Random(f"{self.Seed}{site}{year}")
+        ndays = 366 if year % 4 == 0 else 365
+        with open(filename, "wt") as file:
+            file.write(f"SYNTHETIC STATION {site}\n")
+            file.write(f"1 1 {ndays} LAT {40.0 + rnd.random():.2f} LONG {-100.0 - rnd.random():.2f} "
+                       f"ELEV {2000.0 + 1000.0 * rnd.random():.0f}\n")
+            file.write("DOY,TMAX,TMIN,PRECIP,EVAP,ETR\n")
+            for day in range(1, ndays + 1):
+                season = math.sin(2.0 * math.pi * (day - 105) / 365.0)
+                tmax = 60.0 + 30.0 * season + rnd.gauss(0.0, 6.0)
+                tmin = tmax - 18.0 - 6.0 * rnd.random()
+                precip = rnd.expovariate(4.0) if rnd.random() < 0.25 else 0.0
+                etr = max(0.01, 0.18 + 0.14 * season + rnd.gauss(0.0, 0.03))
+                file.write(f"{day},{tmax:.1f},{tmin:.1f},{precip:.2f},-99.00,{etr:.3f}\n")
+
+
+def main(path: str, sites: int = 2, years: int = 3, soilsPerSite: int = 28):
+    """Writes the dataset into the folder and prints the path to its configuration file."""
+    cfg = SyntheticDataset(os.path.abspath(path), sites=sites, years=years, soilsPerSite=soilsPerSite).write()
+    print(f"Synthetic dataset written, run it with: python PyCropSim.py --cfg {cfg}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print(__doc__.strip().splitlines()[-1])
+        sys.exit()
+    main(sys.argv[1], *(int(arg) for arg in sys.argv[2:5]))
@@ -0,0 +1,86 @@
+"""Benchmark of the uptake loop (PerformUptake) over the seasons of a synthetic dataset.
+
+Runs the whole simulation of the dataset, counting the passes the uptake loop makes over the
+layers on every transpiring day and timing it, to see how much of the run it takes.
+
+Usage: python -m benchmarks.UptakeBenchmark [sites] [years]
+"""
+
+import collections
+import contextlib
+import io
+import sys
+import tempfile
+import time
+
+import PyCropSim
+from Subroutines import CROPSIM
+from Subroutines import DEPLT as DEPLTModule
+from Subroutines.DEPLT import MAX_UPTAKE_TRIES
+
+from benchmarks.SyntheticData import SyntheticDataset
+
+
+class UptakeStatistics:
+    """Counts the seasons, the passes of the uptake loop and the time spent in it."""
+
+    __slots__ = ("Seasons", "Passes", "Time")
+
+    def __init__(self):
+        self.Seasons: int = 0
+        """Number of DEPLT runs, one per crop-year and soil."""
+        self.Passes = collections.Counter()
+        """Transpiring days by the number of passes over the layers, 0 when short of water."""
+        self.Time: float = 0.0
+        """Time (in seconds) spent in PerformUptake."""
+
+    @contextlib.contextmanager
+    def recording(self):
+        """Makes the simulation record its uptake loops into these statistics."""
+        performUptake, deplt = DEPLTModule.PerformUptake, CROPSIM.DEPLT
+
+        def timedUptake(ctx, D) -> int:
+            start = time.perf_counter()
+            passes = performUptake(ctx, D)
+            self.Time += time.perf_counter() - start
+            self.Passes[passes] += 1
+            return passes
+
+        def countedDEPLT(ctx):
+            self.Seasons += 1
+            deplt(ctx)
+
+        DEPLTModule.PerformUptake, CROPSIM.DEPLT = timedUptake, countedDEPLT
+        try:
+            yield self
+        finally:
+            DEPLTModule.PerformUptake, CROPSIM.DEPLT = performUptake, deplt
+
+
+def main(sites: int = 1, years: int = 3):
+    """Runs the benchmark and prints the results."""
+    with tempfile.TemporaryDirectory() as path:
+        cfg = SyntheticDataset(path, sites=sites, years=years).write()
+        stats = UptakeStatistics()
+        argv, sys.argv = sys.argv, [sys.argv[0], "--cfg", cfg]
+        try:
+            with contextlib.redirect_stdout(io.StringIO()), stats.recording():
+                start = time.perf_counter()
+                PyCropSim.main()
+                total = time.perf_counter() - start
+        finally:
+            sys.argv = argv
+
+    days = sum(stats.Passes.values())
+    print(f"{stats.Seasons} seasons, {days} transpiring days, run time {total:.2f} s")
+    print(f"{'Passes':>8}{'Days':>10}{'Share':>9}")
+    for passes, count in sorted(stats.Passes.items()):
+        print(f"{passes:>8}{count:>10}{count / max(days, 1):>9.1%}")
+    print(f"Passes allowed before a convergence error: {MAX_UPTAKE_TRIES + 1}")
+    print(f"Uptake loop: {stats.Time:.3f} s ({stats.Time / total:.1%} of the run), "
+          f"{stats.Time / max(days, 1) * 1e6:.1f} us per day, "
+          f"{stats.Time / max(stats.Seasons, 1) * 1e3:.2f} ms per season")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
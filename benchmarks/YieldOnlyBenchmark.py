@@ -0,0 +1,58 @@
+"""Benchmark of the YIELD_ONLY runs against the full runs, per crop-year simulated.
+
+Runs the whole simulation of a synthetic dataset with every output written, then with only the YR
+files (YIELD_ONLY=1), and prints the time per crop-year of both and the speedup. The YR files of
+both runs are compared, they must be identical.
+
+Usage: python -m benchmarks.YieldOnlyBenchmark [sites] [years] [soils] [repeats] [KEY=VALUE]...
+e.g. python -m benchmarks.YieldOnlyBenchmark 2 3 8 3 LOCKSTEP=1
+"""
+
+import glob
+import os
+import sys
+import tempfile
+
+from benchmarks.BenchmarkSuite import runSimulation, writeSettings
+from benchmarks.SyntheticData import SyntheticDataset
+
+
+def readYearFiles(outDir: str) -> dict:
+    """Returns the content of the YR files written to the output folder, by filename."""
+    files = {}
+    for filename in sorted(glob.glob(os.path.join(outDir, "*", "YR", "*"))):
+        with open(filename, "rt") as file:
+            files[os.path.basename(filename)] = file.read()
+    return files
+
+
+def timeRuns(cfg: str, outDir: str, repeats: int) -> tuple:
+    """Runs the simulation the specified number of times.
+    Returns the best run time, the number of crop-years simulated and the YR files written."""
+    times = []
+    for repeat in range(repeats):
+        times.append(runSimulation(cfg, os.path.join(outDir, f"run{repeat}"))["run"])
+    files = readYearFiles(os.path.join(outDir, "run0"))
+    cropYears = sum(text.count("\n") for text in files.values())
+    return min(times), cropYears, files
+
+
+def main(sites: int = 2, years: int = 3, soils: int = 8, repeats: int = 3, settings: list = ()):
+    """Runs the benchmark and prints the results."""
+    with tempfile.TemporaryDirectory() as path:
+        cfg = SyntheticDataset(path, sites=sites, years=years, soilsPerSite=soils).write()
+        cfg = writeSettings(cfg, list(settings))
+        full, cropYears, fullFiles = timeRuns(cfg, os.path.join(path, "full"), repeats)
+        cfg = writeSettings(cfg, ["YIELD_ONLY=1"])
+        yieldOnly, _, yieldFiles = timeRuns(cfg, os.path.join(path, "yield"), repeats)
+
+    print(f"{sites} sites, {years} years, {soils} soils, settings {list(settings)}: {cropYears} crop-years, "
+          f"best of {repeats}")
+    print(f"{'Run':<12}{'Total':>10}{'Per crop-year':>16}")
+    for name, elapsed in (("full", full), ("yield-only", yieldOnly)):
+        print(f"{name:<12}{elapsed:>9.3f}s{elapsed / max(cropYears, 1) * 1000.0:>14.2f}ms")
+    print(f"Speedup: {full / yieldOnly:.2f}x, YR files identical: {fullFiles == yieldFiles}")
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:5]], settings=sys.argv[5:])